@@ -0,0 +1,45 @@
+# this script serves churn predictions over HTTP (src/mlops/serving.py)
+
+import sys
+import argparse
+
+from src.core.exception import BankChurnException
+
+from src.core.constants.model import (MODEL_SERVING_HOST, MODEL_SERVING_PORT,
+                                      MODEL_SERVING_MAX_BATCH_SIZE, MODEL_SERVING_MAX_WAIT_US)
+
+
+# run the scoring server
+if __name__ == "__main__":
+
+    try:
+        parser = argparse.ArgumentParser(description="Serve bank churn predictions over HTTP.")
+        parser.add_argument("--host", default=MODEL_SERVING_HOST, help="interface to listen on")
+        parser.add_argument("--port", type=int, default=MODEL_SERVING_PORT, help="port to listen on")
+        parser.add_argument("--max-batch-size", type=int, default=MODEL_SERVING_MAX_BATCH_SIZE,
+                            help="requests scored together at most")
+        parser.add_argument("--max-wait-us", type=int, default=MODEL_SERVING_MAX_WAIT_US,
+                            help="microseconds a request waits for its batch to fill")
+        parser.add_argument("--preprocessor", default=None, help="preprocessor object (default: pipeline artifact)")
+        parser.add_argument("--model", default=None, help="model object (default: pipeline artifact)")
+        parser.add_argument("--feature-cache", action="store_true",
+                            help="serve known customers by CustomerId from a feature cache warmed from the raw artifact")
+        args = parser.parse_args()
+
+        from src.model.predictor import ChurnPredictor
+        from src.mlops.serving import ScoringServer
+
+        predictor = ChurnPredictor(preprocessor_object_file_path=args.preprocessor, model_object_file_path=args.model)
+
+        feature_cache = None
+        if args.feature_cache:
+            from src.mlops.feature_cache import CustomerFeatureCache
+            feature_cache = CustomerFeatureCache(predictor.preprocessor)
+            feature_cache.warm()
+
+        ScoringServer(predictor, host=args.host, port=args.port, max_batch_size=args.max_batch_size,
+                      max_wait_us=args.max_wait_us, feature_cache=feature_cache).run()
+
+    except BankChurnException as e:
+        print(f"Error occured while running the scoring server from app.py: {str(e)}")
+        raise BankChurnException(f"Error occured while running the scoring server from app.py: {str(e)}",sys) from e
@@ -0,0 +1,105 @@
+# Import-time benchmark for the pipeline entry points
+#
+# Every entry module is imported in a fresh interpreter with `python -X importtime`. The benchmark fails
+# when an import takes longer than the budget or when it loads one of the heavy dependencies, which must
+# only be imported by the stage that uses them.
+#
+#   python benchmarks/import_time.py                  # default entry points, 500 ms budget
+#   python benchmarks/import_time.py --budget-ms 300 --repeat 5 src.pipelines.data
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from statistics import median
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_MODULES = ["main",
+                 "src.pipelines.run",
+                 "src.pipelines.data",
+                 "src.core.logger",
+                 "src.core.utils.helpers",
+                 "src.core.entities.config_entity"]
+
+HEAVY_MODULES = ["pandas", "numpy", "sklearn", "scipy", "sqlalchemy", "pymysql",
+                 "pyarrow", "streamlit", "evidently", "dill"]
+
+
+def _log_files() -> set:
+    logs_dir = os.path.join(ROOT_DIR, "logs")
+    return set(os.listdir(logs_dir)) if os.path.isdir(logs_dir) else set()
+
+
+def measure_import(module_name: str) -> dict:
+    """
+    Import `module_name` in a fresh interpreter.
+
+    Returns:
+    dict: seconds (wall time of the import), heavy_modules (heavy dependencies it loaded),
+          log_files (log files it created) and slowest (the slowest individual imports, from -X importtime).
+    """
+    code = ("import sys, json, time, importlib; start = time.perf_counter(); importlib.import_module(%r); "
+            "seconds = time.perf_counter() - start; "
+            "print(json.dumps({'seconds': seconds, 'modules': sorted(sys.modules)}))" % module_name)
+
+    logs_before = _log_files()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT_DIR, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": ROOT_DIR})
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module_name} failed:\n{result.stderr}")
+
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    timings = []
+    for line in result.stderr.splitlines():
+        parts = line[len("import time:"):].split("|")
+        if line.startswith("import time:") and len(parts) == 3 and parts[0].strip().isdigit():
+            timings.append((int(parts[0]), parts[2].strip()))
+
+    return {"seconds": output["seconds"],
+            "heavy_modules": sorted({name for name in output["modules"] if name in HEAVY_MODULES}),
+            "log_files": sorted(_log_files() - logs_before),
+            "slowest": sorted(timings, reverse=True)[:5]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the pipeline entry points.")
+    parser.add_argument("modules", nargs="*", default=ENTRY_MODULES, help="Modules to import.")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Maximum import time per module (median).")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of fresh interpreters per module.")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<40} {'median ms':>10} {'min ms':>10}  heavy modules")
+
+    for module_name in args.modules:
+        results = [measure_import(module_name) for _ in range(args.repeat)]
+        timings = [result["seconds"] * 1000 for result in results]
+        heavy_modules = sorted({name for result in results for name in result["heavy_modules"]})
+        new_logs = sorted({name for result in results for name in result["log_files"]})
+
+        print(f"{module_name:<40} {median(timings):>10.1f} {min(timings):>10.1f}  {', '.join(heavy_modules) or '-'}")
+
+        if median(timings) > args.budget_ms:
+            slowest = ", ".join(f"{name} ({self_us / 1000:.1f} ms)" for self_us, name in results[-1]["slowest"])
+            failures.append(f"{module_name}: {median(timings):.1f} ms exceeds the {args.budget_ms:.0f} ms budget "
+                            f"(slowest imports: {slowest})")
+        if heavy_modules:
+            failures.append(f"{module_name}: loads {', '.join(heavy_modules)} at import time")
+        if new_logs:
+            failures.append(f"{module_name}: creates log files at import time ({', '.join(new_logs)})")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# Load generator for the scoring server (app.py / src/mlops/serving.py)
+#
+# Opens `--concurrency` keep-alive connections, each sending single-customer POST /predict requests back to back
+# (closed loop) for `--duration` seconds, and reports throughput and latency percentiles. Run it at increasing
+# concurrency to check that throughput grows with the load while p99 latency stays flat; the server's /metrics
+# shows the batch sizes it formed.
+#
+#   python app.py &                                                   # serve the pipeline artifacts
+#   python benchmarks/serving_load.py --concurrency 1 8 64 256 --duration 5
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+from statistics import mean
+
+
+def make_records(n_records: int, seed: int = 42) -> list:
+    """
+    Random customer records with the input columns of the bank churn dataset.
+    """
+    rng = random.Random(seed)
+    return [{"CreditScore": rng.randint(350, 850),
+             "Geography": rng.choice(["France", "Germany", "Spain"]),
+             "Gender": rng.choice(["Female", "Male"]),
+             "Age": rng.randint(18, 92),
+             "Tenure": rng.randint(0, 10),
+             "Balance": round(rng.uniform(0, 250_000), 2),
+             "NumOfProducts": rng.randint(1, 4),
+             "HasCrCard": rng.random() < 0.7,
+             "IsActiveMember": rng.random() < 0.5,
+             "EstimatedSalary": round(rng.uniform(10, 200_000), 2)} for _ in range(n_records)]
+
+
+def build_request(host: str, port: int, path: str, body: bytes = b"", method: str = "POST") -> bytes:
+    return (f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    return status, await reader.readexactly(length)
+
+
+async def client(host: str, port: int, requests: list, deadline: float, latencies: list, errors: list) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            status, _ = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def get_json(host: str, port: int, path: str) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(build_request(host, port, path, method="GET"))
+        await writer.drain()
+        _, body = await read_response(reader)
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, concurrency: int, duration: float, requests: list) -> dict:
+    latencies, errors = [], []
+    metrics_before = await get_json(host, port, "/metrics")
+
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    # Every client starts at a different record
+    await asyncio.gather(*(client(host, port, requests[i:] + requests[:i], deadline, latencies, errors)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    metrics_after = await get_json(host, port, "/metrics")
+    batches = metrics_after["batches"] - metrics_before["batches"]
+    batched_requests = metrics_after["requests"] - metrics_before["requests"]
+
+    latencies.sort()
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+    return {"concurrency": concurrency,
+            "requests": len(latencies),
+            "errors": len(errors),
+            "throughput": len(latencies) / elapsed,
+            "mean_ms": mean(latencies) * 1000 if latencies else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "mean_batch_size": batched_requests / batches if batches else 0.0}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load generator for the churn scoring server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Scoring server host.")
+    parser.add_argument("--port", type=int, default=8000, help="Scoring server port.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64, 256],
+                        help="Concurrent connections, one run per value.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run.")
+    parser.add_argument("--records", type=int, default=1000, help="Distinct customer records sent.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON lines.")
+    args = parser.parse_args()
+
+    requests = [build_request(args.host, args.port, "/predict", json.dumps(record).encode())
+                for record in make_records(args.records)]
+
+    if not args.json:
+        print(f"{'concurrency':>11} {'requests':>9} {'errors':>6} {'req/s':>9} {'mean ms':>8} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'batch':>6}")
+
+    failed = False
+    for concurrency in args.concurrency:
+        result = asyncio.run(run_load(args.host, args.port, concurrency, args.duration, requests))
+        failed = failed or result["errors"] > 0
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(f"{result['concurrency']:>11} {result['requests']:>9} {result['errors']:>6} "
+                  f"{result['throughput']:>9.0f} {result['mean_ms']:>8.2f} {result['p50_ms']:>8.2f} "
+                  f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['mean_batch_size']:>6.1f}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
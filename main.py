@@ -1,6 +1,7 @@
 # this script is used to run the pipelines from src/pipeline/*
 
 import sys
+import argparse
 
 from src.core.exception import BankChurnException
 
@@ -11,8 +12,11 @@ from src.pipelines.run import run
 if __name__ == "__main__":
 
     try:
-        
-        run()
+        parser = argparse.ArgumentParser(description="Run the bank churn pipelines.")
+        parser.add_argument("--force", action="store_true", help="rerun every stage, even when its inputs did not change")
+        args = parser.parse_args()
+
+        run(force=args.force)
 
     except BankChurnException as e:
         print(f"Error occured while running pipeline from main.py: {str(e)}")
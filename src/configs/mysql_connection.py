@@ -1,27 +1,98 @@
 # MySQL database connection script
 
 import sys
+import time
+import random
+import threading
 
 import pandas as pd
-from typing import Optional
-from sqlalchemy import create_engine
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import bindparam, create_engine, event, text
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
 
+from src.core.logger import logging
 from src.core.exception import BankChurnException
 
 from src.core.constants.common import (MYSQL_ENGINE_URL,
-                                       DATABASE_NAME)
+                                       DATABASE_NAME,
+                                       MYSQL_EXPORT_CHUNK_SIZE,
+                                       MYSQL_EXPORT_PARTITIONS,
+                                       MYSQL_EXPORT_MAX_WORKERS,
+                                       MYSQL_POOL_SIZE,
+                                       MYSQL_POOL_MAX_OVERFLOW,
+                                       MYSQL_POOL_PRE_PING,
+                                       MYSQL_POOL_RECYCLE,
+                                       MYSQL_POOL_TIMEOUT,
+                                       MYSQL_CONNECT_RETRIES,
+                                       MYSQL_CONNECT_BACKOFF)
+
+
+# Errors worth retrying: lost/stale connections, server restarts and pool checkout timeouts
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, DisconnectionError, PoolTimeoutError)
+
+
+
+@dataclass
+class ConnectionPoolStats:
+    """
+    Class Name :   ConnectionPoolStats
+    Description :   Thread-safe counters of the connection pool, updated by SQLAlchemy pool events
+                    and by MySQLConnect.connect.
+    """
+    connects: int = 0
+    failed_connects: int = 0
+    retries: int = 0
+    disconnects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "failed_connects": self.failed_connects,
+                "retries": self.retries,
+                "disconnects": self.disconnects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "total_wait_seconds": round(self.total_wait_seconds, 6),
+                "max_wait_seconds": round(self.max_wait_seconds, 6),
+                "avg_wait_seconds": round(self.total_wait_seconds / self.checkouts, 6) if self.checkouts else 0.0,
+            }
 
 
 
 class MySQLConnect:
     """
     Class Name :   MySQLConnect
-    Description :   This class establishes a connection to the MySQL database using SQLAlchemy.
+    Description :   This class establishes a pooled connection to the MySQL database using SQLAlchemy.
+                    The engine and its pool are shared by all instances. Pool size, overflow, pre-ping,
+                    recycle time and checkout timeout come from the MYSQL_POOL_* constants, transient
+                    connection errors are retried with exponential backoff and pool statistics are
+                    available through get_pool_stats.
 
     Output      :   Connection to the MySQL database
     On Failure  :   Raises an exception
     """
     engine = None
+    pool_stats = None
+    _engine_lock = threading.Lock()
 
     def __init__(self) -> None:
         try:
@@ -31,16 +102,88 @@ class MySQLConnect:
             if not mysql_engine_url:
                 raise Exception("Environment variable 'MYSQL_ENGINE_URL' is not set.")
             
-            if MySQLConnect.engine is None:
-                # Initialize the SQLAlchemy engine
-                MySQLConnect.engine = create_engine(mysql_engine_url)
+            with MySQLConnect._engine_lock:
+                if MySQLConnect.engine is None:
+                    # Initialize the SQLAlchemy engine with a configured connection pool
+                    MySQLConnect.engine = create_engine(mysql_engine_url,
+                                                        pool_size=MYSQL_POOL_SIZE,
+                                                        max_overflow=MYSQL_POOL_MAX_OVERFLOW,
+                                                        pool_pre_ping=MYSQL_POOL_PRE_PING,
+                                                        pool_recycle=MYSQL_POOL_RECYCLE,
+                                                        pool_timeout=MYSQL_POOL_TIMEOUT)
+
+                if MySQLConnect.pool_stats is None:
+                    MySQLConnect.pool_stats = ConnectionPoolStats()
+                    self._register_pool_events(MySQLConnect.engine, MySQLConnect.pool_stats)
             
             self.engine = MySQLConnect.engine
         
-        except BankChurnException as e:
+        except Exception as e:
             raise BankChurnException(f"MySQL connection error: {e}", sys)
 
 
+    @staticmethod
+    def _register_pool_events(engine, pool_stats: ConnectionPoolStats) -> None:
+        """
+        Counts new DBAPI connections, checkouts, checkins and disconnects through SQLAlchemy events.
+        """
+        event.listen(engine, "connect", lambda *args: pool_stats.increment("connects"))
+        event.listen(engine, "checkout", lambda *args: pool_stats.increment("checkouts"))
+        event.listen(engine, "checkin", lambda *args: pool_stats.increment("checkins"))
+
+        def on_error(context) -> None:
+            if context.is_disconnect:
+                pool_stats.increment("disconnects")
+
+        event.listen(engine, "handle_error", on_error)
+
+
+    @contextmanager
+    def connect(self, retries: int = MYSQL_CONNECT_RETRIES, backoff: float = MYSQL_CONNECT_BACKOFF):
+        """
+        Checks out a connection from the pool, retrying transient errors with exponential backoff and jitter.
+        
+        :param retries: Number of retries after the first failed attempt.
+        :param backoff: Base delay in seconds, doubled after every failed attempt.
+        :return: Context manager yielding a SQLAlchemy connection.
+        """
+        for attempt in range(retries + 1):
+            start = time.perf_counter()
+            try:
+                connection = self.engine.connect()
+                break
+            except TRANSIENT_ERRORS as e:
+                MySQLConnect.pool_stats.increment("failed_connects")
+                if attempt == retries:
+                    raise
+
+                delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+                MySQLConnect.pool_stats.increment("retries")
+                logging.warning(f"Transient MySQL connection error (attempt {attempt + 1}/{retries + 1}), "
+                                f"retrying in {delay:.2f}s: {e}")
+                time.sleep(delay)
+            finally:
+                MySQLConnect.pool_stats.record_wait(time.perf_counter() - start)
+
+        with connection:
+            yield connection
+
+
+    def get_pool_stats(self) -> dict:
+        """
+        Returns the connection pool counters along with the current pool status
+        (size, checked in/out connections and overflow, when the pool implements them).
+        """
+        stats = MySQLConnect.pool_stats.as_dict()
+        pool = self.engine.pool
+
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                stats[f"pool_{name}"] = getattr(pool, name)()
+
+        return stats
+
+
 
 class HotelBookingData:
     """
@@ -60,24 +203,78 @@ class HotelBookingData:
         except Exception as e:
             raise BankChurnException(e, sys)
 
-    def export_data_as_dataframe(self, dataset_name: str, database_name: Optional[str] = None) -> pd.DataFrame:
+    @staticmethod
+    def build_export_query(dataset_name: str, database_name: Optional[str] = None,
+                           watermark_column: Optional[str] = None, watermark_value: Any = None,
+                           partition_column: Optional[str] = None, partition_range: Optional[Tuple[Any, Any, bool]] = None,
+                           columns: str = "*", key_column: Optional[str] = None,
+                           key_values: Optional[List[Any]] = None) -> Tuple[Any, dict]:
+        """
+        Builds the export query, restricted to rows above the high-water mark and to a key range when given.
+        
+        :param dataset_name: Name of the dataset to export.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Monotonic column used for incremental exports (optional).
+        :param watermark_value: Last exported value of `watermark_column`; only greater values are fetched.
+        :param partition_column: Key column used for partitioned exports (optional).
+        :param partition_range: Tuple of (lower, upper, include_upper) bounds on `partition_column` (optional).
+        :param columns: Select list, defaults to all columns. Rows are only ordered when all columns are selected.
+        :param key_column: Column of the keys to look up (optional).
+        :param key_values: Only rows whose `key_column` is one of these values are fetched, in one IN (...) list.
+        :return: Tuple of (SQL query, bound parameters).
+        """
+        # Use the default database if none is provided
+        database_name = database_name or DATABASE_NAME
+        
+        # Construct the SQL query
+        query = f"SELECT {columns} FROM {database_name}.{dataset_name}"
+        conditions, params = [], {}
+
+        if watermark_column and watermark_value is not None:
+            conditions.append(f"{watermark_column} > :watermark_value")
+            params["watermark_value"] = watermark_value
+
+        if partition_column and partition_range is not None:
+            lower, upper, include_upper = partition_range
+            conditions.append(f"{partition_column} >= :partition_lower")
+            conditions.append(f"{partition_column} {'<=' if include_upper else '<'} :partition_upper")
+            params.update(partition_lower=lower, partition_upper=upper)
+
+        if key_column and key_values is not None:
+            conditions.append(f"{key_column} IN :key_values")
+            params["key_values"] = list(key_values)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        if watermark_column and columns == "*":
+            query += f" ORDER BY {watermark_column}"
+
+        query = text(query)
+        if "key_values" in params:
+            # Expanding parameter: one placeholder per key
+            query = query.bindparams(bindparam("key_values", expanding=True))
+
+        return query, params
+
+
+    def export_data_as_dataframe(self, dataset_name: str, database_name: Optional[str] = None,
+                                 watermark_column: Optional[str] = None, watermark_value: Any = None) -> pd.DataFrame:
         """
-        Exports the entire table as a pandas DataFrame.
+        Exports the entire table (or only the rows above the high-water mark) as a pandas DataFrame.
         
         :param dataset_name: Name of the dataset to export.
         :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Monotonic column used for incremental exports (optional).
+        :param watermark_value: Last exported value of `watermark_column` (optional).
         :return: pd.DataFrame containing table data.
         """
         try:
-            # Use the default database if none is provided
-            database_name = database_name or DATABASE_NAME
-            
-            # Construct the SQL query
-            query = f"SELECT * FROM {database_name}.{dataset_name}"
+            query, params = self.build_export_query(dataset_name, database_name, watermark_column, watermark_value)
 
             # Fetch data using SQLAlchemy
-            with self.mysql_connect.engine.connect() as connection:
-                df = pd.read_sql(query, connection)
+            with self.mysql_connect.connect() as connection:
+                df = pd.read_sql(query, connection, params=params)
 
             # Replace placeholder values (e.g., "na") with NaN
             df.replace({"na": pd.NA}, inplace=True)
@@ -85,3 +282,219 @@ class HotelBookingData:
             return df
         except Exception as e:
             raise BankChurnException(e, sys)
+
+
+    def export_data_as_chunks(self, dataset_name: str, database_name: Optional[str] = None,
+                              chunk_size: int = MYSQL_EXPORT_CHUNK_SIZE,
+                              watermark_column: Optional[str] = None, watermark_value: Any = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams the table as pandas DataFrame chunks using a server-side cursor,
+        so only `chunk_size` rows are held in memory at a time.
+        
+        :param dataset_name: Name of the dataset to export.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param chunk_size: Number of rows per yielded DataFrame.
+        :param watermark_column: Monotonic column used for incremental exports (optional).
+        :param watermark_value: Last exported value of `watermark_column` (optional).
+        :return: Generator of pd.DataFrame chunks containing table data.
+        """
+        try:
+            query, params = self.build_export_query(dataset_name, database_name, watermark_column, watermark_value)
+
+            # stream_results makes the driver use an unbuffered (server-side) cursor
+            with self.mysql_connect.connect() as connection:
+                connection = connection.execution_options(stream_results=True, max_row_buffer=chunk_size)
+
+                for chunk in pd.read_sql(query, connection, params=params, chunksize=chunk_size):
+                    # Replace placeholder values (e.g., "na") with NaN
+                    chunk.replace({"na": pd.NA}, inplace=True)
+                    
+                    yield chunk
+        except Exception as e:
+            raise BankChurnException(e, sys)
+
+
+    def export_rows_by_key(self, dataset_name: str, key_column: str, key_values: List[Any],
+                           database_name: Optional[str] = None,
+                           watermark_column: Optional[str] = None) -> pd.DataFrame:
+        """
+        Fetches the rows of the given keys with a single `WHERE key_column IN (...)` query.
+
+        :param dataset_name: Name of the dataset.
+        :param key_column: Column of the keys (e.g. CustomerId).
+        :param key_values: Keys to fetch.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Monotonic column, rows are ordered by it so the latest row of a key comes last (optional).
+        :return: pd.DataFrame with the rows found, keys without rows are absent.
+        """
+        try:
+            query, params = self.build_export_query(dataset_name, database_name, watermark_column=watermark_column,
+                                                    key_column=key_column, key_values=key_values)
+
+            with self.mysql_connect.connect() as connection:
+                df = pd.read_sql(query, connection, params=params)
+
+            # Replace placeholder values (e.g., "na") with NaN
+            df.replace({"na": pd.NA}, inplace=True)
+
+            return df
+        except Exception as e:
+            raise BankChurnException(e, sys)
+
+
+    def get_partition_ranges(self, dataset_name: str, partition_column: str, n_partitions: int,
+                             database_name: Optional[str] = None,
+                             watermark_column: Optional[str] = None, watermark_value: Any = None,
+                             chunk_size: Optional[int] = None) -> List[Tuple[Any, Any, bool]]:
+        """
+        Splits the numeric key range of `partition_column` into `n_partitions` contiguous ranges.
+        
+        :param dataset_name: Name of the dataset to export.
+        :param partition_column: Numeric key column to split on (e.g. RowNumber or CustomerId).
+        :param n_partitions: Number of key ranges.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Monotonic column used for incremental exports (optional).
+        :param watermark_value: Last exported value of `watermark_column` (optional).
+        :param chunk_size: Maximum average number of rows per range, raises the number of ranges when
+                           the matching rows do not fit into `n_partitions` ranges (optional).
+        :return: List of (lower, upper, include_upper) tuples in key order, empty when no rows match.
+        """
+        try:
+            query, params = self.build_export_query(dataset_name, database_name, watermark_column, watermark_value,
+                                                    columns=f"MIN({partition_column}), MAX({partition_column}), COUNT(*)")
+
+            with self.mysql_connect.connect() as connection:
+                key_min, key_max, row_count = connection.execute(query, params).one()
+
+            if key_min is None:
+                return []
+
+            if chunk_size:
+                n_partitions = max(n_partitions, -(-row_count // chunk_size))
+
+            # Integer keys are split on integer bounds, others on evenly spaced float bounds
+            span = key_max - key_min
+            if isinstance(key_min, int) and isinstance(key_max, int):
+                bounds = [key_min + span * i // n_partitions for i in range(n_partitions + 1)]
+            else:
+                bounds = [key_min + span * i / n_partitions for i in range(n_partitions + 1)]
+
+            return [(bounds[i], bounds[i + 1], i == n_partitions - 1) for i in range(n_partitions)]
+        except Exception as e:
+            raise BankChurnException(e, sys)
+
+
+    def get_table_snapshot(self, dataset_name: str, database_name: Optional[str] = None,
+                           watermark_column: Optional[str] = None) -> dict:
+        """
+        Summarises the current state of the table with a single aggregate query (row count and the
+        maximum of the watermark column), without exporting any rows. Like the incremental export,
+        it tracks appended and deleted rows, not rows updated in place.
+
+        :param dataset_name: Name of the dataset.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Monotonic column used for incremental exports (optional).
+        :return: Dict with database, table, row_count and max_watermark.
+        """
+        try:
+            columns = f"COUNT(*), MAX({watermark_column})" if watermark_column else "COUNT(*), NULL"
+            query, params = self.build_export_query(dataset_name, database_name, columns=columns)
+
+            with self.mysql_connect.connect() as connection:
+                row_count, max_watermark = connection.execute(query, params).one()
+
+            # Convert dates / decimals into JSON serializable values
+            if hasattr(max_watermark, "isoformat"):
+                max_watermark = max_watermark.isoformat()
+            elif max_watermark is not None and not isinstance(max_watermark, (int, float, str)):
+                max_watermark = str(max_watermark)
+
+            return {"database": database_name or DATABASE_NAME,
+                    "table": dataset_name,
+                    "row_count": int(row_count),
+                    "max_watermark": max_watermark}
+        except Exception as e:
+            raise BankChurnException(e, sys)
+
+
+    def export_partition(self, dataset_name: str, partition_column: str, partition_range: Tuple[Any, Any, bool],
+                         database_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Exports the rows of one key range of the table (see `get_partition_ranges`) over a pooled connection.
+
+        :param dataset_name: Name of the dataset to export.
+        :param partition_column: Numeric key column the range applies to.
+        :param partition_range: (lower, upper, include_upper) bounds of the key range.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :return: pd.DataFrame containing the rows of the range.
+        """
+        try:
+            query, params = self.build_export_query(dataset_name, database_name, partition_column=partition_column,
+                                                    partition_range=partition_range)
+            return self._read_partition(query, params)
+        except Exception as e:
+            raise BankChurnException(e, sys)
+
+
+    def export_data_in_partitions(self, dataset_name: str, partition_column: str,
+                                  n_partitions: int = MYSQL_EXPORT_PARTITIONS,
+                                  max_workers: int = MYSQL_EXPORT_MAX_WORKERS,
+                                  chunk_size: int = MYSQL_EXPORT_CHUNK_SIZE,
+                                  database_name: Optional[str] = None,
+                                  watermark_column: Optional[str] = None, watermark_value: Any = None) -> Iterator[pd.DataFrame]:
+        """
+        Exports the table as key-range partitions fetched concurrently over a thread pool. Every worker
+        checks out its own connection from the shared `MySQLConnect.engine` pool. Partitions are yielded
+        in key order and at most `max_workers` partitions are held in memory at a time. Every partition is
+        read in one query, so the key range is split into at least row count / `chunk_size` partitions
+        (evenly spaced keys such as RowNumber give partitions of at most about `chunk_size` rows).
+        
+        :param dataset_name: Name of the dataset to export.
+        :param partition_column: Numeric key column to split on (e.g. RowNumber or CustomerId).
+        :param n_partitions: Number of key ranges.
+        :param max_workers: Number of concurrent queries (should not exceed the connection pool size).
+        :param chunk_size: Maximum average number of rows per partition (0 keeps `n_partitions`).
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Monotonic column used for incremental exports (optional).
+        :param watermark_value: Last exported value of `watermark_column` (optional).
+        :return: Generator of pd.DataFrame partitions containing table data.
+        """
+        try:
+            partition_ranges = self.get_partition_ranges(dataset_name, partition_column, n_partitions,
+                                                         database_name, watermark_column, watermark_value,
+                                                         chunk_size=chunk_size)
+
+            pool_capacity = MYSQL_POOL_SIZE + MYSQL_POOL_MAX_OVERFLOW
+            if max_workers > pool_capacity:
+                logging.warning(f"{max_workers} export workers exceed the connection pool capacity ({pool_capacity}), "
+                                f"workers will wait for connections")
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mysql-export") as executor:
+                pending = deque()
+
+                for partition_range in partition_ranges:
+                    query, params = self.build_export_query(dataset_name, database_name, watermark_column, watermark_value,
+                                                            partition_column=partition_column, partition_range=partition_range)
+                    pending.append(executor.submit(self._read_partition, query, params))
+
+                    # Keep at most max_workers partitions in flight, yield the oldest one first
+                    if len(pending) >= max_workers:
+                        yield pending.popleft().result()
+
+                while pending:
+                    yield pending.popleft().result()
+        except Exception as e:
+            raise BankChurnException(e, sys)
+
+
+    def _read_partition(self, query: Any, params: dict) -> pd.DataFrame:
+        """
+        Reads one partition over its own pooled connection (runs on a worker thread).
+        """
+        with self.mysql_connect.connect() as connection:
+            df = pd.read_sql(query, connection, params=params)
+
+        # Replace placeholder values (e.g., "na") with NaN
+        df.replace({"na": pd.NA}, inplace=True)
+
+        return df
@@ -10,10 +10,31 @@ load_dotenv()  # Load environment variables from.env file
 TARGET_COLUMN: str = 'Exited'
 TARGET_MAPPING: dict = {'No': 0, 'Yes': 1}
 VALIDATION_REPORT_SPLIT_RATIO: float = 0.3
+CACHE_MAX_BYTES: int = int(os.getenv('CACHE_MAX_BYTES', 512 * 1024 ** 2))  # memoized helper results (bytes)
 SCHEMA_FILE_PATH = os.path.join("settings", "schema.yaml")
+MODEL_FILE_PATH = os.path.join("settings", "model.yaml")  # candidate models and search spaces of the trainer
+SCHEMA_TYPE_MAPPING: dict = {'integer': 'Int64', 'float': 'float64', 'string': 'string', 'boolean': 'boolean'}
+SCHEMA_COMPACT_TYPE_MAPPING: dict = {'integer': 'int32', 'float': 'float32', 'string': 'object', 'boolean': 'bool'}
+
+
+# Pipeline constants
+PIPELINE_MAX_WORKERS: int = int(os.getenv('PIPELINE_MAX_WORKERS', 4))  # stages run concurrently by the DAG scheduler
+PIPELINE_RUN_REPORT_FILE: str = 'pipeline_report.json'  # per-stage timings and critical path of the last run
 
 
 # MySQL constants
 MYSQL_ENGINE_URL = os.getenv('MYSQL_ENGINE_URL')
 DATABASE_NAME: str = 'projects_db'
-DATASET_NAME: str = 'bank_churn'
\ No newline at end of file
+DATASET_NAME: str = 'bank_churn'
+MYSQL_EXPORT_CHUNK_SIZE: int = 10_000  # rows fetched per server-side cursor batch (0 disables streaming)
+MYSQL_EXPORT_PARTITIONS: int = 1  # key ranges fetched concurrently (1 disables partitioned export)
+MYSQL_EXPORT_MAX_WORKERS: int = 4  # concurrent partition queries, keep below the connection pool size
+
+# MySQL connection pool constants (overridable through environment variables)
+MYSQL_POOL_SIZE: int = int(os.getenv('MYSQL_POOL_SIZE', 5))
+MYSQL_POOL_MAX_OVERFLOW: int = int(os.getenv('MYSQL_POOL_MAX_OVERFLOW', 10))
+MYSQL_POOL_PRE_PING: bool = os.getenv('MYSQL_POOL_PRE_PING', 'true').lower() == 'true'  # test connections before use
+MYSQL_POOL_RECYCLE: int = int(os.getenv('MYSQL_POOL_RECYCLE', 3600))  # seconds, below MySQL's wait_timeout
+MYSQL_POOL_TIMEOUT: int = int(os.getenv('MYSQL_POOL_TIMEOUT', 30))  # seconds to wait for a free connection
+MYSQL_CONNECT_RETRIES: int = int(os.getenv('MYSQL_CONNECT_RETRIES', 3))
+MYSQL_CONNECT_BACKOFF: float = float(os.getenv('MYSQL_CONNECT_BACKOFF', 0.5))  # seconds, doubled per retry
\ No newline at end of file
@@ -1,16 +1,41 @@
 # src/constants/data_constant.py is used to store data scripts related constant values 
 
+# Data Artifact format ('parquet', 'feather' or 'csv'), used for artifacts without a known extension
+DATA_ARTIFACT_FORMAT: str = 'parquet'
+
 # Data Ingestion constants
-DATA_INGESTION_RAW_FILE: str = 'raw.csv'
-DATA_INGESTION_DATA_FILE: str = 'data.csv'
+DATA_INGESTION_RAW_FILE: str = f'raw.{DATA_ARTIFACT_FORMAT}'
+DATA_INGESTION_DATA_FILE: str = f'data.{DATA_ARTIFACT_FORMAT}'
+DATA_INGESTION_WATERMARK_FILE: str = 'watermark.json'
+DATA_INGESTION_FINGERPRINT_FILE: str = 'ingestion_fingerprint.json'
 
 # Data Validation constants
 DATA_VALIDATION_REPORT: str = 'drift_report.yaml'
+DATA_VALIDATION_SCHEMA_REPORT: str = 'schema_report.yaml'
+DATA_VALIDATION_REFERENCE_PROFILE: str = 'reference_profile.json'
+DATA_VALIDATION_FINGERPRINT_FILE: str = 'validation_fingerprint.json'
+DATA_VALIDATION_DRIFT_BINS: int = 100  # quantile bins per numerical feature
+DATA_VALIDATION_DRIFT_P_VALUE: float = 0.05  # feature drifts below this p-value
+DATA_VALIDATION_DRIFT_SHARE: float = 0.5  # dataset drifts when this share of features drifts
 
-# Data Preprocessing constants
-DATA_PREPROCESSING_DATA_FILE: str = 'processed.csv'
+# Data Preprocessing constants (float32 feature matrix and int8 target as .npy files)
+DATA_PREPROCESSING_FEATURES_FILE: str = 'X.npy'
+DATA_PREPROCESSING_TARGET_FILE: str = 'y.npy'
+DATA_PREPROCESSING_MANIFEST_FILE: str = 'manifest.json'  # feature store manifest (columns, shape, fingerprint)
 DATA_PREPROCESSING_OBJECT_FILE: str = 'preprocessor.pkl'
+DATA_PREPROCESSING_FINGERPRINT_FILE: str = 'preprocessing_fingerprint.json'
+DATA_PREPROCESSING_BLOCK_ROWS: int = 4_096  # rows transformed per block (keeps the output block in cache)
+DATA_PREPROCESSING_CHUNK_ROWS: int = 250_000  # rows per chunk of the two-pass streaming mode (0 loads the whole artifact)
+DATA_PREPROCESSING_DRIFT_THRESHOLD: float = 0.25  # max drift of appended rows (mean shift in std, share of unknown categories)
 
-# Data Split constants
-DATA_SPLIT_TRAIN_FILE: str = "train.csv"
-DATA_SPLIT_TEST_FILE: str = "test.csv"
\ No newline at end of file
+# Data Split constants (row indices into the feature store, stored per dataset fingerprint)
+DATA_SPLIT_TRAIN_FILE: str = 'train_indices.npy'
+DATA_SPLIT_TEST_FILE: str = 'test_indices.npy'
+DATA_SPLIT_TUNE_FILE: str = 'tune_indices.npy'
+DATA_SPLIT_FOLDS_FILE: str = 'folds.npy'  # k-fold id of every training row (aligned with train_indices.npy)
+DATA_SPLIT_MANIFEST_FILE: str = 'split.json'
+DATA_SPLIT_FINGERPRINT_FILE: str = 'split_fingerprint.json'
+DATA_SPLIT_TEST_SIZE: float = 0.2  # share of all rows held out for testing
+DATA_SPLIT_TUNE_SIZE: float = 0.25  # share of the training rows used for hyperparameter tuning
+DATA_SPLIT_N_FOLDS: int = 5
+DATA_SPLIT_RANDOM_STATE: int = 42
@@ -17,6 +17,7 @@ VALIDATION_REPORT_DIR: str = 'validation'
 BEST_MODEL_PARAMS_DIR: str = 'params'
 BEST_MODEL_METRICS_DIR: str = 'metrics'
 EVALUATION_REPORT_DIR: str = 'evaluation'
+SCORING_REPORT_DIR: str = 'scoring'
 
 # Sub-Objects Directory constants
 PREPROCESSED_OBJECT_DIR: str = 'preprocessor'
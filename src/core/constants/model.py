@@ -1,9 +1,49 @@
+import os
+
 # Model Training related constants
 MODEL_TRAINER_MODEL_OBJECT_NAME: str = "model.pkl"
 MODEL_TRAINER_BEST_MODEL_PARAMS_NAME: str = "params.json"
 MODEL_TRAINER_BEST_MODEL_METRICS_NAME: str = "metrics.json"
+MODEL_TRAINER_FINGERPRINT_NAME: str = "trainer_fingerprint.json"
+MODEL_TRAINER_TIME_BUDGET: float = float(os.getenv('MODEL_TRAINER_TIME_BUDGET', 300))  # seconds of wall clock for the hyperparameter search
+MODEL_TRAINER_MAX_WORKERS: int = int(os.getenv('MODEL_TRAINER_MAX_WORKERS', os.cpu_count() or 1))  # search processes
+MODEL_TRAINER_WARM_START_SHARE: float = 0.1  # trees/iterations added by a warm start, as a share of the current ensemble
 
 # Model Evaluation related constants
 MODEL_EVALUATION_REPORT_FILE_NAME: str = "report.json"
+MODEL_EVALUATION_CURVES_FILE_NAME: str = "curves.npz"
+MODEL_EVALUATION_FINGERPRINT_NAME: str = "evaluation_fingerprint.json"
+MODEL_EVALUATION_THRESHOLD: float = 0.5  # churn probability of the label based metrics (same as serving)
+MODEL_EVALUATION_BOOTSTRAP_REPLICATES: int = int(os.getenv('MODEL_EVALUATION_BOOTSTRAP_REPLICATES', 1000))
+MODEL_EVALUATION_CONFIDENCE_LEVEL: float = 0.95
+MODEL_EVALUATION_BOOTSTRAP_CHUNK_ELEMENTS: int = 2 ** 20  # bootstrap weights (replicates x rows) drawn at once
+MODEL_EVALUATION_MAX_WORKERS: int = int(os.getenv('MODEL_EVALUATION_MAX_WORKERS', os.cpu_count() or 1))  # bootstrap threads
+MODEL_EVALUATION_CALIBRATION_BINS: int = 10
+MODEL_EVALUATION_LIFT_BINS: int = 10  # deciles of customers ranked by churn probability
+MODEL_EVALUATION_RANDOM_STATE: int = 42
 
 # Model Validation related constants
+
+
+# Model Serving related constants
+MODEL_SERVING_HOST: str = os.getenv('MODEL_SERVING_HOST', '127.0.0.1')
+MODEL_SERVING_PORT: int = int(os.getenv('MODEL_SERVING_PORT', 8000))
+MODEL_SERVING_MAX_BATCH_SIZE: int = int(os.getenv('MODEL_SERVING_MAX_BATCH_SIZE', 256))  # requests scored together
+MODEL_SERVING_MAX_WAIT_US: int = int(os.getenv('MODEL_SERVING_MAX_WAIT_US', 500))  # microseconds a request waits for its batch to fill
+MODEL_SERVING_THRESHOLD: float = 0.5  # churn probability from which a customer is labeled as churning
+
+# Online feature cache constants (preprocessed features of known customers)
+FEATURE_CACHE_KEY_COLUMN: str = 'CustomerId'
+FEATURE_CACHE_CAPACITY: int = int(os.getenv('FEATURE_CACHE_CAPACITY', 1_000_000))  # customers held in memory
+FEATURE_CACHE_TTL: float = float(os.getenv('FEATURE_CACHE_TTL', 3600))  # seconds before a cached customer is fetched again
+FEATURE_CACHE_MAX_KEYS_PER_QUERY: int = 1_000  # keys of one IN (...) list
+
+# Bulk Scoring related constants
+BULK_SCORING_PREDICTIONS_TABLE: str = 'bank_churn_predictions'
+BULK_SCORING_REPORT_FILE_NAME: str = 'scoring_report.json'
+BULK_SCORING_FINGERPRINT_NAME: str = 'scoring_fingerprint.json'
+BULK_SCORING_CHUNK_ROWS: int = int(os.getenv('BULK_SCORING_CHUNK_ROWS', 50_000))  # customers read, scored and written per task
+BULK_SCORING_MAX_WORKERS: int = int(os.getenv('BULK_SCORING_MAX_WORKERS', os.cpu_count() or 1))  # scoring processes
+BULK_SCORING_WRITE_METHOD: str = os.getenv('BULK_SCORING_WRITE_METHOD', 'insert')  # insert (multi-row INSERT) or load_data (LOAD DATA LOCAL INFILE)
+BULK_SCORING_INSERT_BATCH_ROWS: int = 5_000  # rows per multi-row INSERT statement
+BULK_SCORING_KEEP_RUNS: int = int(os.getenv('BULK_SCORING_KEEP_RUNS', 1))  # scoring runs kept in the predictions table
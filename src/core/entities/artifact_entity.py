@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 
@@ -6,6 +7,7 @@ from dataclasses import dataclass
 @dataclass
 class DataIngestionArtifact:
     data_file_path: str
+    new_rows: Optional[int] = None  # rows appended by the last run (at the end of the artifact), None if unknown
 
 
 # Data Validation Artifact
@@ -13,4 +15,49 @@ class DataIngestionArtifact:
 class DataValidationArtifact:
     validation_status: bool
     message: str
-    validation_report_file_path: str
\ No newline at end of file
+    validation_report_file_path: str
+    schema_report_file_path: str
+    reference_profile_file_path: str
+
+
+# Data Preprocessing Artifact
+@dataclass
+class DataPreprocessingArtifact:
+    features_file_path: str
+    target_file_path: str
+    manifest_file_path: str
+    preprocessor_object_file_path: str
+
+
+# Data Split Artifact
+@dataclass
+class DataSplitArtifact:
+    split_id: str
+    train_indices_file_path: str
+    test_indices_file_path: str
+    tune_indices_file_path: str
+    folds_file_path: str
+    manifest_file_path: str
+
+
+# Model Trainer Artifact
+@dataclass
+class ModelTrainerArtifact:
+    model_object_file_path: str
+    best_model_params_file_path: str
+    best_model_metrics_file_path: str
+
+
+# Model Evaluation Artifact
+@dataclass
+class ModelEvaluationArtifact:
+    report_file_path: str
+    curves_file_path: str
+
+
+# Bulk Scoring Artifact
+@dataclass
+class BulkScoringArtifact:
+    run_id: str
+    predictions_table: str
+    report_file_path: str
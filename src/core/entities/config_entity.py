@@ -9,6 +9,14 @@ from src.core.constants.data import *
 from src.core.constants.model import *
 
 
+# Pipeline Configuration
+@dataclass
+class PipelineConfig:
+    reports_dir = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR)
+    run_report_file_path: str = os.path.join(reports_dir, PIPELINE_RUN_REPORT_FILE)
+    max_workers: int = PIPELINE_MAX_WORKERS
+
+
 # Data Ingestion Configuration
 @dataclass
 class DataIngestionConfig:
@@ -16,10 +24,94 @@ class DataIngestionConfig:
     interim_data_dir = os.path.join(from_root(),ARTIFACTS_DIR, DATA_DIR, INTERIM_DATA_DIR)
     raw_file_path: str = os.path.join(raw_data_dir, DATA_INGESTION_RAW_FILE) 
     data_file_path: str = os.path.join(interim_data_dir, DATA_INGESTION_DATA_FILE)
+    watermark_file_path: str = os.path.join(raw_data_dir, DATA_INGESTION_WATERMARK_FILE)
+    fingerprint_file_path: str = os.path.join(interim_data_dir, DATA_INGESTION_FINGERPRINT_FILE)
+    chunk_size: int = MYSQL_EXPORT_CHUNK_SIZE
+    n_partitions: int = MYSQL_EXPORT_PARTITIONS
+    max_workers: int = MYSQL_EXPORT_MAX_WORKERS
+    incremental: bool = True
 
 
 # Data Validation Configuration
 @dataclass
 class DataValidationConfig:
     validation_report_dir = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR, VALIDATION_REPORT_DIR)
-    validation_report_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_REPORT)
\ No newline at end of file
+    validation_report_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_REPORT)
+    schema_report_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_SCHEMA_REPORT)
+    reference_profile_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_REFERENCE_PROFILE)
+    fingerprint_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_FINGERPRINT_FILE)
+    refresh_reference_profile: bool = False
+
+
+# Data Preprocessing Configuration
+@dataclass
+class DataPreprocessingConfig:
+    processed_data_dir = os.path.join(from_root(), ARTIFACTS_DIR, DATA_DIR, PROCESSED_DATA_DIR)
+    preprocessor_object_dir = os.path.join(from_root(), ARTIFACTS_DIR, OBJECTS_DIR, PREPROCESSED_OBJECT_DIR)
+    features_file_path: str = os.path.join(processed_data_dir, DATA_PREPROCESSING_FEATURES_FILE)
+    target_file_path: str = os.path.join(processed_data_dir, DATA_PREPROCESSING_TARGET_FILE)
+    manifest_file_path: str = os.path.join(processed_data_dir, DATA_PREPROCESSING_MANIFEST_FILE)
+    preprocessor_object_file_path: str = os.path.join(preprocessor_object_dir, DATA_PREPROCESSING_OBJECT_FILE)
+    fingerprint_file_path: str = os.path.join(processed_data_dir, DATA_PREPROCESSING_FINGERPRINT_FILE)
+    block_rows: int = DATA_PREPROCESSING_BLOCK_ROWS
+    chunk_rows: int = DATA_PREPROCESSING_CHUNK_ROWS
+    incremental: bool = True  # append new ingested rows with the frozen preprocessor
+    drift_threshold: float = DATA_PREPROCESSING_DRIFT_THRESHOLD
+
+
+# Data Split Configuration
+@dataclass
+class DataSplitConfig:
+    splitted_data_dir = os.path.join(from_root(), ARTIFACTS_DIR, DATA_DIR, SPLITTED_DATA_DIR)
+    fingerprint_file_path: str = os.path.join(splitted_data_dir, DATA_SPLIT_FINGERPRINT_FILE)
+    test_size: float = DATA_SPLIT_TEST_SIZE
+    tune_size: float = DATA_SPLIT_TUNE_SIZE
+    n_folds: int = DATA_SPLIT_N_FOLDS
+    random_state: int = DATA_SPLIT_RANDOM_STATE
+
+
+# Model Trainer Configuration
+@dataclass
+class ModelTrainerConfig:
+    model_object_dir = os.path.join(from_root(), ARTIFACTS_DIR, OBJECTS_DIR, MODEL_OBJECT_DIR)
+    best_model_params_dir = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR, BEST_MODEL_PARAMS_DIR)
+    best_model_metrics_dir = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR, BEST_MODEL_METRICS_DIR)
+    model_object_file_path: str = os.path.join(model_object_dir, MODEL_TRAINER_MODEL_OBJECT_NAME)
+    best_model_params_file_path: str = os.path.join(best_model_params_dir, MODEL_TRAINER_BEST_MODEL_PARAMS_NAME)
+    best_model_metrics_file_path: str = os.path.join(best_model_metrics_dir, MODEL_TRAINER_BEST_MODEL_METRICS_NAME)
+    fingerprint_file_path: str = os.path.join(model_object_dir, MODEL_TRAINER_FINGERPRINT_NAME)
+    time_budget: float = MODEL_TRAINER_TIME_BUDGET
+    max_workers: int = MODEL_TRAINER_MAX_WORKERS
+    incremental: bool = True  # update the previous model with the appended rows when possible
+    warm_start_share: float = MODEL_TRAINER_WARM_START_SHARE
+
+
+# Model Evaluation Configuration
+@dataclass
+class ModelEvaluationConfig:
+    evaluation_report_dir = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR, EVALUATION_REPORT_DIR)
+    report_file_path: str = os.path.join(evaluation_report_dir, MODEL_EVALUATION_REPORT_FILE_NAME)
+    curves_file_path: str = os.path.join(evaluation_report_dir, MODEL_EVALUATION_CURVES_FILE_NAME)
+    fingerprint_file_path: str = os.path.join(evaluation_report_dir, MODEL_EVALUATION_FINGERPRINT_NAME)
+    threshold: float = MODEL_EVALUATION_THRESHOLD
+    n_bootstrap: int = MODEL_EVALUATION_BOOTSTRAP_REPLICATES
+    confidence_level: float = MODEL_EVALUATION_CONFIDENCE_LEVEL
+    bootstrap_chunk_elements: int = MODEL_EVALUATION_BOOTSTRAP_CHUNK_ELEMENTS
+    max_workers: int = MODEL_EVALUATION_MAX_WORKERS
+    calibration_bins: int = MODEL_EVALUATION_CALIBRATION_BINS
+    lift_bins: int = MODEL_EVALUATION_LIFT_BINS
+    random_state: int = MODEL_EVALUATION_RANDOM_STATE
+
+
+# Bulk Scoring Configuration
+@dataclass
+class BulkScoringConfig:
+    scoring_report_dir = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR, SCORING_REPORT_DIR)
+    report_file_path: str = os.path.join(scoring_report_dir, BULK_SCORING_REPORT_FILE_NAME)
+    fingerprint_file_path: str = os.path.join(scoring_report_dir, BULK_SCORING_FINGERPRINT_NAME)
+    predictions_table: str = BULK_SCORING_PREDICTIONS_TABLE
+    chunk_rows: int = BULK_SCORING_CHUNK_ROWS
+    max_workers: int = BULK_SCORING_MAX_WORKERS
+    write_method: str = BULK_SCORING_WRITE_METHOD
+    insert_batch_rows: int = BULK_SCORING_INSERT_BATCH_ROWS
+    keep_runs: int = BULK_SCORING_KEEP_RUNS
@@ -1,22 +1,58 @@
-import logging
+import logging as _logging
 import os
+import threading
 
-from from_root import from_root
 from datetime import datetime
 
 # Log constants
 LOGS_DIR = 'logs'
-LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
+LOG_FORMAT = "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s"
 
+_configure_lock = threading.Lock()
+_configured = False
 
-# Directory structure based on category
-logs_path = os.path.join(from_root(), LOGS_DIR, LOG_FILE)
-print(f"Log file will be written to: {logs_path}")  # Debug statement
-os.makedirs(LOGS_DIR, exist_ok=True)
 
+def configure_logging() -> str:
+    """
+    Create the log file and configure the root logger. Runs once, on the first logging call,
+    so importing modules that log does not touch the file system.
 
-logging.basicConfig(
-    filename=logs_path,
-    format="[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s",
-    level=logging.DEBUG,
-)
\ No newline at end of file
+    Returns:
+    str: Path of the log file.
+    """
+    global _configured, logs_path
+
+    with _configure_lock:
+        if not _configured:
+            from from_root import from_root
+
+            # Directory structure based on category
+            log_file = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
+            logs_path = os.path.join(from_root(), LOGS_DIR, log_file)
+            os.makedirs(os.path.dirname(logs_path), exist_ok=True)
+
+            _logging.basicConfig(
+                filename=logs_path,
+                format=LOG_FORMAT,
+                level=_logging.DEBUG,
+            )
+            _logging.debug(f"Log file will be written to: {logs_path}")
+            _configured = True
+
+    return logs_path
+
+
+class _LazyLogging:
+    """
+    Stand-in for the `logging` module that configures the log file on first use.
+    Modules keep using `from src.core.logger import logging` and `logging.info(...)`.
+    """
+
+    def __getattr__(self, name: str):
+        if not _configured:
+            configure_logging()
+        return getattr(_logging, name)
+
+
+logs_path = None
+logging = _LazyLogging()
@@ -0,0 +1,207 @@
+# Framework independent memoization for the helper functions (replaces streamlit's cache_resource)
+
+import os
+import sys
+import copy
+import inspect
+import hashlib
+import threading
+import functools
+
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from src.core.constants.common import CACHE_MAX_BYTES
+
+
+# numpy/pandas are not imported here: a value can only be an array or a DataFrame if the caller already
+# loaded the library, so the checks below look it up in sys.modules and importing the cache stays cheap
+def _loaded(module_name: str):
+    return sys.modules.get(module_name)
+
+
+class LRUCache:
+    """
+    Class Name :   LRUCache
+    Description :   Thread-safe least-recently-used cache bounded by an approximate byte budget.
+                    Entries larger than the whole budget are not cached.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> tuple:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Any, value: Any, n_bytes: int) -> None:
+        if n_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (value, n_bytes)
+            self.current_bytes += n_bytes
+
+            # Evict least recently used entries until the budget is met
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                    "current_bytes": self.current_bytes, "max_bytes": self.max_bytes}
+
+
+
+def file_fingerprint(file_path: str) -> tuple:
+    """
+    Identify a file (or a directory of part files) by path, modification time and size.
+    """
+    file_path = os.path.abspath(file_path)
+
+    if os.path.isdir(file_path):
+        entries = sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                         for entry in os.scandir(file_path) if entry.is_file())
+        return ("dir", file_path, tuple(entries))
+
+    stat = os.stat(file_path)
+    return ("file", file_path, stat.st_mtime_ns, stat.st_size)
+
+
+def _content_hash(value: Any) -> Any:
+    """
+    Build a hashable cache key for an argument: DataFrames/Series and arrays are hashed by content,
+    containers are frozen recursively, other hashable values are used as they are.
+    """
+    pd, np = _loaded("pandas"), _loaded("numpy")
+
+    if pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes(), digest_size=16)
+        columns = tuple(value.columns) if isinstance(value, pd.DataFrame) else value.name
+        dtypes = tuple(map(str, value.dtypes)) if isinstance(value, pd.DataFrame) else str(value.dtype)
+        return (type(value).__name__, columns, dtypes, digest.hexdigest())
+
+    if np is not None and isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16)
+        return ("ndarray", value.shape, str(value.dtype), digest.hexdigest())
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, _content_hash(item)) for key, item in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_content_hash(item) for item in value)
+
+    if isinstance(value, set):
+        return frozenset(_content_hash(item) for item in value)
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _size_of(value: Any) -> int:
+    """
+    Approximate in-memory size of a cached value in bytes.
+    """
+    pd, np = _loaded("pandas"), _loaded("numpy")
+
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if pd is not None and isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if np is not None and isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(_size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _copy_result(value: Any) -> Any:
+    """
+    Return a result that callers may modify without corrupting the cached entry: DataFrames/Series
+    are deep copied (a memcpy, far cheaper than reloading them, and bounded by the cache budget since
+    larger results are not cached), small containers (parsed YAML/JSON) are deep copied and other
+    objects (e.g. fitted models) are shared and must be treated as read-only. Global pandas options
+    are left alone.
+    """
+    pd = _loaded("pandas")
+
+    if pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=True)
+    if isinstance(value, tuple):
+        return tuple(_copy_result(item) for item in value)
+    if isinstance(value, (dict, list, set)):
+        return copy.deepcopy(value)
+    return value
+
+
+def memoize(func: Optional[Callable] = None, *, max_bytes: int = CACHE_MAX_BYTES,
+            file_arguments: tuple = ("file_path",)) -> Callable:
+    """
+    Memoize a helper function independently of any UI framework.
+
+    Arguments named in `file_arguments` are keyed on the file's path, modification time and size,
+    so an artifact rewritten on disk is reloaded. DataFrames, Series and arrays are keyed on a content
+    hash, other arguments on their value. Entries are evicted least-recently-used once the byte budget
+    is exceeded, and DataFrames and containers are returned as copies.
+
+    Parameters:
+    func (callable): The function to memoize (also accepts a staticmethod).
+    max_bytes (int, optional): Byte budget of the cache. Defaults to CACHE_MAX_BYTES.
+    file_arguments (tuple, optional): Names of the arguments that hold file paths.
+
+    Returns:
+    callable: The memoized function, with `cache_clear()` and `cache_info()` attributes.
+    """
+    def decorator(func: Callable) -> Callable:
+        func = getattr(func, "__func__", func)
+        signature = inspect.signature(func)
+        cache = LRUCache(max_bytes=max_bytes)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = tuple((name, file_fingerprint(value) if name in file_arguments and isinstance(value, str)
+                             and os.path.exists(value) else _content_hash(value))
+                            for name, value in bound.arguments.items())
+            except Exception:
+                # Arguments that cannot be keyed bypass the cache
+                return func(*args, **kwargs)
+
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                file_sizes = [item[3] for _, item in key if isinstance(item, tuple) and item[:1] == ("file",)]
+                cache.put(key, value, max(_size_of(value), sum(file_sizes)))
+
+            return _copy_result(value)
+
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_info = cache.info
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
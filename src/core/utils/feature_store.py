@@ -0,0 +1,306 @@
+# Memory-mapped feature store (preprocessed X and y as .npy arrays plus a column manifest)
+
+import io
+import os
+import sys
+import json
+import hashlib
+
+import numpy as np
+from datetime import datetime
+from typing import List, Optional, Tuple
+from numpy.lib.format import (dtype_to_descr, read_array_header_1_0,
+                               read_magic, write_array_header_1_0)
+
+from src.core.exception import BankChurnException
+
+
+FEATURE_STORE_VERSION = 1
+
+
+
+class FeatureStore:
+    """
+    Class Name :   FeatureStore
+    Description :   Holds the preprocessed feature matrix X (float32) and target y (int8) as contiguous C ordered
+                    .npy files next to a JSON manifest (column names, dtypes, shape and a content fingerprint).
+                    Arrays are opened as read-only memory maps: slices are zero-copy views, and every process
+                    opening the store shares the same page cache instead of holding its own copy. Subsets such
+                    as train/test splits are expressed as index arrays and gathered only when used.
+
+                    The store can be pickled to worker processes: only the file paths travel, every worker
+                    maps the files itself.
+
+    Output      :   Memory-mapped X and y, manifest
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, features_file_path: str, target_file_path: str, manifest_file_path: str):
+        self.features_file_path = features_file_path
+        self.target_file_path = target_file_path
+        self.manifest_file_path = manifest_file_path
+        self._features = None
+        self._target = None
+        self._manifest = None
+
+
+    @classmethod
+    def from_artifact(cls, data_preprocessing_artifact) -> "FeatureStore":
+        return cls(features_file_path=data_preprocessing_artifact.features_file_path,
+                   target_file_path=data_preprocessing_artifact.target_file_path,
+                   manifest_file_path=data_preprocessing_artifact.manifest_file_path)
+
+
+    def __getstate__(self) -> dict:
+        # Memory maps are not sent to other processes, they are reopened there
+        return {**self.__dict__, "_features": None, "_target": None}
+
+
+    # ---------------------------------------- Reading ----------------------------------------
+
+    @property
+    def manifest(self) -> dict:
+        if self._manifest is None:
+            with open(self.manifest_file_path, "r") as manifest_file:
+                self._manifest = json.load(manifest_file)
+        return self._manifest
+
+
+    @property
+    def features(self) -> np.ndarray:
+        if self._features is None:
+            self._features = np.load(self.features_file_path, mmap_mode="r")
+        return self._features
+
+
+    @property
+    def target(self) -> np.ndarray:
+        if self._target is None:
+            self._target = np.load(self.target_file_path, mmap_mode="r")
+        return self._target
+
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.manifest["columns"])
+
+
+    @property
+    def fingerprint(self) -> str:
+        return self.manifest["fingerprint"]
+
+
+    def __len__(self) -> int:
+        return int(self.manifest["n_rows"])
+
+
+    def get_split(self, indices: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        X and y for a subset of rows.
+
+        :param indices: Row indices (e.g. a saved train split). None returns zero-copy views of all rows.
+        :return: Tuple of (X, y). Index arrays gather one contiguous copy of the selected rows only.
+        """
+        try:
+            if indices is None:
+                return self.features, self.target
+
+            indices = np.asarray(indices)
+            if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+                raise IndexError(f"Split indices out of range for a store of {len(self)} rows")
+
+            # Gathering sorted indices reads the memory map sequentially
+            order = np.argsort(indices, kind="stable")
+            sorted_indices = indices[order]
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+
+            return self.features[sorted_indices][inverse], self.target[sorted_indices][inverse]
+
+        except Exception as e:
+            raise BankChurnException(f"Error reading split from the feature store: {str(e)}", sys) from e
+
+
+    # ---------------------------------------- Writing ----------------------------------------
+
+    def writer(self, n_rows: int, columns: List[str], target_column: str,
+               metadata: Optional[dict] = None, append: bool = False) -> "FeatureStoreWriter":
+        """
+        Open the store for writing `n_rows` rows chunk by chunk (see FeatureStoreWriter).
+
+        :param metadata: Extra JSON serializable entries of the manifest (e.g. the preprocessor that produced X).
+        :param append: Append the rows to the existing store instead of replacing it.
+        """
+        return FeatureStoreWriter(self, n_rows=n_rows, columns=columns, target_column=target_column,
+                                  metadata=metadata, append=append)
+
+
+    def write(self, features: np.ndarray, target: np.ndarray, columns: List[str], target_column: str,
+              metadata: Optional[dict] = None, append: bool = False) -> None:
+        """
+        Write (or append) complete X and y arrays and the manifest.
+        """
+        with self.writer(n_rows=len(features), columns=columns, target_column=target_column,
+                         metadata=metadata, append=append) as store_writer:
+            store_writer.append(features, target)
+
+
+
+class FeatureStoreWriter:
+    """
+    Class Name :   FeatureStoreWriter
+    Description :   Appends chunks of X and y to the .npy files of a FeatureStore. The headers are written first
+                    (the number of rows is known up front), the raw rows follow chunk by chunk, and the content
+                    fingerprint is updated with every chunk. The manifest is written last, on a clean exit only,
+                    so an interrupted write never leaves a store that looks complete.
+
+                    In append mode the rows are added after the existing ones: the shape in the .npy headers
+                    is rewritten in place (numpy pads headers so the first dimension can grow) and the
+                    manifest records the store it was appended to under "base". The fingerprint of an
+                    appended store chains the base fingerprint with the appended rows.
+
+    Output      :   .npy files and manifest of the store
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, store: FeatureStore, n_rows: int, columns: List[str], target_column: str,
+                 metadata: Optional[dict] = None, append: bool = False):
+        self.store = store
+        self.n_rows = n_rows
+        self.columns = list(columns)
+        self.target_column = target_column
+        self.metadata = dict(metadata or {})
+        self.append_mode = append
+        self.base = None
+        self.rows_written = 0
+        # X and y are hashed separately, so the fingerprint does not depend on the chunk boundaries
+        self._features_hash = hashlib.blake2b(digest_size=16)
+        self._target_hash = hashlib.blake2b(digest_size=16)
+
+
+    @staticmethod
+    def _write_header(file_obj, dtype, shape: tuple) -> None:
+        write_array_header_1_0(file_obj, {"descr": dtype_to_descr(np.dtype(dtype)),
+                                          "fortran_order": False,
+                                          "shape": shape})
+
+
+    @classmethod
+    def _open_for_append(cls, file_path: str, dtype, base_rows: int, total_rows: int):
+        # Rewrite the header with the new number of rows and position the file after the base rows
+        file_obj = open(file_path, "r+b")
+        read_magic(file_obj)
+        shape, fortran_order, stored_dtype = read_array_header_1_0(file_obj)
+        header_length = file_obj.tell()
+
+        if fortran_order or stored_dtype != np.dtype(dtype) or shape[0] != base_rows:
+            file_obj.close()
+            raise ValueError(f"{file_path} does not match the manifest ({shape} {stored_dtype})")
+
+        header = io.BytesIO()
+        cls._write_header(header, dtype, (total_rows,) + tuple(shape[1:]))
+        if len(header.getvalue()) != header_length:
+            file_obj.close()
+            raise ValueError(f"The header of {file_path} cannot be rewritten in place")
+
+        file_obj.seek(0)
+        file_obj.write(header.getvalue())
+        file_obj.seek(header_length + base_rows * int(np.prod(shape[1:], dtype=np.int64)) * np.dtype(dtype).itemsize)
+        file_obj.truncate()
+        return file_obj
+
+
+    def __enter__(self) -> "FeatureStoreWriter":
+        try:
+            for file_path in (self.store.features_file_path, self.store.target_file_path, self.store.manifest_file_path):
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+            if self.append_mode:
+                self.store._manifest = None
+                base_manifest = self.store.manifest
+                if base_manifest["columns"] != self.columns or base_manifest["target_column"] != self.target_column:
+                    raise ValueError("Appended rows must have the columns of the store")
+                self.base = {"n_rows": int(base_manifest["n_rows"]), "fingerprint": base_manifest["fingerprint"]}
+
+            # A stale manifest must not describe the files being rewritten
+            if os.path.exists(self.store.manifest_file_path):
+                os.remove(self.store.manifest_file_path)
+
+            if self.append_mode:
+                total_rows = self.base["n_rows"] + self.n_rows
+                self._features_file = self._open_for_append(self.store.features_file_path, np.float32,
+                                                            self.base["n_rows"], total_rows)
+                self._target_file = self._open_for_append(self.store.target_file_path, np.int8,
+                                                          self.base["n_rows"], total_rows)
+            else:
+                self._features_file = open(self.store.features_file_path, "wb")
+                self._target_file = open(self.store.target_file_path, "wb")
+                self._write_header(self._features_file, np.float32, (self.n_rows, len(self.columns)))
+                self._write_header(self._target_file, np.int8, (self.n_rows,))
+            return self
+
+        except Exception as e:
+            raise BankChurnException(f"Error opening the feature store for writing: {str(e)}", sys) from e
+
+
+    def append(self, features: np.ndarray, target: np.ndarray) -> None:
+        """
+        Append a chunk of rows: float32 features (n x n_columns) and int8 target (n).
+        """
+        try:
+            features = np.ascontiguousarray(features, dtype=np.float32)
+            target = np.ascontiguousarray(target, dtype=np.int8)
+
+            if features.ndim != 2 or features.shape[1] != len(self.columns) or len(target) != len(features):
+                raise ValueError(f"Chunk shapes {features.shape} / {target.shape} do not match {len(self.columns)} columns")
+            if self.rows_written + len(features) > self.n_rows:
+                raise ValueError(f"More than the declared {self.n_rows} rows were appended")
+
+            features.tofile(self._features_file)
+            target.tofile(self._target_file)
+            self._features_hash.update(features.view(np.uint8).reshape(-1))
+            self._target_hash.update(target.view(np.uint8))
+            self.rows_written += len(features)
+
+        except Exception as e:
+            raise BankChurnException(f"Error appending to the feature store: {str(e)}", sys) from e
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._features_file.close()
+        self._target_file.close()
+
+        if exc_type is not None:
+            return
+
+        try:
+            if self.rows_written != self.n_rows:
+                raise ValueError(f"{self.rows_written} rows were written, {self.n_rows} were declared")
+
+            fingerprint = hashlib.blake2b(digest_size=16)
+            for part in ((self.base["fingerprint"].encode() if self.base else b""), self._features_hash.digest(),
+                         self._target_hash.digest(), json.dumps(self.columns).encode()):
+                fingerprint.update(part)
+
+            total_rows = self.n_rows + (self.base["n_rows"] if self.base else 0)
+            manifest = {"version": FEATURE_STORE_VERSION,
+                        "created_at": datetime.now().isoformat(timespec="seconds"),
+                        "n_rows": total_rows,
+                        "n_features": len(self.columns),
+                        "columns": self.columns,
+                        "target_column": self.target_column,
+                        "features": {"file": os.path.basename(self.store.features_file_path), "dtype": "float32",
+                                     "shape": [total_rows, len(self.columns)]},
+                        "target": {"file": os.path.basename(self.store.target_file_path), "dtype": "int8",
+                                   "shape": [total_rows]},
+                        "fingerprint": fingerprint.hexdigest(),
+                        "base": self.base,
+                        **self.metadata}
+
+            with open(self.store.manifest_file_path, "w") as manifest_file:
+                json.dump(manifest, manifest_file, indent=4)
+
+            self.store._features, self.store._target, self.store._manifest = None, None, None
+
+        except Exception as e:
+            raise BankChurnException(f"Error writing the feature store manifest: {str(e)}", sys) from e
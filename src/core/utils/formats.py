@@ -0,0 +1,229 @@
+# Artifact format layer (CSV, Parquet, Feather) used by read_data/save_data
+# pandas/pyarrow are imported inside the methods, so the registry can be imported without loading them
+
+from __future__ import annotations
+
+import os
+import abc
+import shutil
+
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+from src.core.constants.data import DATA_ARTIFACT_FORMAT
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+
+class CsvFormat:
+    """
+    Class Name :   CsvFormat
+    Description :   Reads and writes DataFrame artifacts as a single CSV file.
+                    Appending adds rows to the end of the file without repeating the header.
+    """
+    name = "csv"
+    extension = ".csv"
+
+    def read(self, file_path: str, columns: Optional[List[str]] = None, dtype: Optional[dict] = None) -> pd.DataFrame:
+        import pandas as pd
+
+        if dtype and columns is not None:
+            dtype = {column: column_dtype for column, column_dtype in dtype.items() if column in columns}
+
+        return pd.read_csv(file_path, usecols=columns, dtype=dtype)
+
+    def read_columns(self, file_path: str) -> List[str]:
+        import pandas as pd
+
+        return list(pd.read_csv(file_path, nrows=0).columns)
+
+    def iter_chunks(self, file_path: str, chunk_rows: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        import pandas as pd
+
+        yield from pd.read_csv(file_path, usecols=columns, chunksize=chunk_rows)
+
+    def read_tail(self, file_path: str, n_rows: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        import pandas as pd
+
+        # Rows of a CSV file cannot be located without parsing it: stream it, keeping the last rows only
+        tail = pd.read_csv(file_path, usecols=columns, nrows=0)
+        if n_rows:
+            for i, chunk in enumerate(pd.read_csv(file_path, usecols=columns, chunksize=max(n_rows, 10_000))):
+                tail = (pd.concat([tail, chunk]) if i else chunk).tail(n_rows)
+        return tail.reset_index(drop=True)
+
+    def write(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        dataframe.to_csv(file_path, index=False, header=True)
+
+    def append(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        dataframe.to_csv(file_path, mode="a", index=False, header=False)
+
+
+
+class ColumnarFormat(abc.ABC):
+    """
+    Class Name :   ColumnarFormat
+    Description :   Reads and writes DataFrame artifacts in an Arrow based binary format. The artifact path
+                    is a directory of part files (`part-00000.parquet`, ...), so appending a chunk only
+                    writes a new part instead of rewriting the whole artifact. Single-file artifacts are
+                    read as well. Column types are stored in the file, so reads skip text parsing.
+    """
+    name: str = ""
+    extension: str = ""
+
+    @abc.abstractmethod
+    def _write_table(self, table, file_path: str) -> None:
+        """
+        Write a pyarrow Table to one part file.
+        """
+
+    def _dataset(self, file_path: str):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(file_path, format=self.name)
+
+        # Parts written from different chunks may disagree on nullability (e.g. int64 vs double)
+        if len(dataset.files) > 1:
+            schemas = [ds.dataset(part, format=self.name).schema for part in dataset.files]
+            try:
+                schema = pa.unify_schemas(schemas, promote_options="permissive")
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                schema = self._unify_as_text(schemas)
+            dataset = ds.dataset(file_path, format=self.name, schema=schema)
+
+        return dataset
+
+    @staticmethod
+    def _unify_as_text(schemas: list):
+        # A column kept with its raw values in some chunks (values that could not be coerced to the schema
+        # dtype at ingestion) has no common type with the coerced parts, it is read as text from every part
+        import pyarrow as pa
+
+        fields = {}
+        for schema in schemas:
+            for schema_field in schema:
+                fields.setdefault(schema_field.name, []).append(schema_field)
+
+        unified_fields = []
+        for name, candidates in fields.items():
+            try:
+                unified_fields.append(pa.unify_schemas([pa.schema([candidate]) for candidate in candidates],
+                                                       promote_options="permissive").field(name))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                unified_fields.append(pa.field(name, pa.string()))
+
+        # The pandas metadata of a part describes its own types, so it is dropped
+        return pa.schema(unified_fields)
+
+    def read(self, file_path: str, columns: Optional[List[str]] = None, dtype: Optional[dict] = None) -> pd.DataFrame:
+        dataframe = self._dataset(file_path).to_table(columns=columns).to_pandas()
+
+        # Stored types are kept; only columns whose stored type differs from the requested one are cast
+        if dtype:
+            dtype = {column: column_dtype for column, column_dtype in dtype.items()
+                     if column in dataframe.columns and str(dataframe[column].dtype) != str(column_dtype)}
+            if dtype:
+                dataframe = dataframe.astype(dtype)
+
+        return dataframe
+
+    def read_columns(self, file_path: str) -> List[str]:
+        return list(self._dataset(file_path).schema.names)
+
+    def read_tail(self, file_path: str, n_rows: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        import pyarrow as pa
+
+        # Only the last part files holding the `n_rows` rows are read (row counts come from their metadata)
+        dataset = self._dataset(file_path)
+        fragments, fragment_rows = [], 0
+        for fragment in sorted(dataset.get_fragments(), key=lambda fragment: fragment.path, reverse=True):
+            if fragment_rows >= n_rows:
+                break
+            fragments.append(fragment)
+            fragment_rows += fragment.count_rows()
+
+        tables = [fragment.to_table(columns=columns, schema=dataset.schema) for fragment in reversed(fragments)]
+        if not tables:
+            tables = [dataset.schema.empty_table().select(columns) if columns else dataset.schema.empty_table()]
+
+        table = pa.concat_tables(tables)
+        return table.slice(max(0, table.num_rows - n_rows)).to_pandas()
+
+    def iter_chunks(self, file_path: str, chunk_rows: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        # Record batches hold at most `chunk_rows` rows (fewer at part file / row group boundaries)
+        for batch in self._dataset(file_path).to_batches(columns=columns, batch_size=chunk_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def write(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        if os.path.isdir(file_path):
+            shutil.rmtree(file_path)
+        elif os.path.exists(file_path):
+            os.remove(file_path)
+
+        os.makedirs(file_path, exist_ok=True)
+        self.append(dataframe, file_path)
+
+    def append(self, dataframe: pd.DataFrame, file_path: str) -> None:
+        import pyarrow as pa
+
+        if not os.path.isdir(file_path):
+            raise ValueError(f"Cannot append to {file_path}: columnar artifacts are appended as part files of a directory.")
+
+        part_index = len([name for name in os.listdir(file_path) if name.endswith(self.extension)])
+        part_path = os.path.join(file_path, f"part-{part_index:05d}{self.extension}")
+
+        table = pa.Table.from_pandas(dataframe, preserve_index=False)
+        self._write_table(table, part_path)
+
+
+
+class ParquetFormat(ColumnarFormat):
+    name = "parquet"
+    extension = ".parquet"
+
+    def _write_table(self, table, file_path: str) -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, file_path, compression="snappy")
+
+
+
+class FeatherFormat(ColumnarFormat):
+    name = "feather"
+    extension = ".feather"
+
+    def _write_table(self, table, file_path: str) -> None:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, file_path, compression="lz4")
+
+
+
+ARTIFACT_FORMATS = {artifact_format.name: artifact_format for artifact_format in (CsvFormat(), ParquetFormat(), FeatherFormat())}
+
+
+def get_artifact_format(file_path: str, artifact_format: Optional[str] = None):
+    """
+    Pick the artifact format for a file path.
+
+    The explicit `artifact_format` wins, then the file extension (.csv, .parquet, .feather),
+    then the DATA_ARTIFACT_FORMAT setting.
+
+    Parameters:
+    file_path (str): Path of the artifact.
+    artifact_format (str, optional): Name of the format ('csv', 'parquet' or 'feather').
+
+    Returns:
+    The format handler with read/read_columns/iter_chunks/write/append methods.
+    """
+    if artifact_format is None:
+        extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+        artifact_format = extension if extension in ARTIFACT_FORMATS else DATA_ARTIFACT_FORMAT
+
+    if artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unsupported artifact format '{artifact_format}', expected one of {list(ARTIFACT_FORMATS)}.")
+
+    return ARTIFACT_FORMATS[artifact_format]
@@ -1,18 +1,28 @@
 # Helper functions
+# pandas, sklearn and dill (legacy object files) are imported inside the helpers that use them, so importing this module stays cheap
+
+from __future__ import annotations
 
 import os
 import sys
 
 import json
 import yaml
-import dill 
-
-import pandas as pd
-import streamlit as st
+import hashlib
 
-from sklearn.model_selection import train_test_split
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 from src.core.exception import BankChurnException
+from src.core.utils.cache import memoize
+from src.core.utils.formats import get_artifact_format
+from src.core.utils.serialization import (dump_object, is_object_file,
+                                          load_object_file, load_legacy_object)
+from src.core.constants.common import (SCHEMA_TYPE_MAPPING,
+                                       SCHEMA_COMPACT_TYPE_MAPPING)
+from src.core.constants.data import DATA_SPLIT_RANDOM_STATE
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 
@@ -24,7 +34,7 @@ from src.core.exception import BankChurnException
 # | JSON data.                           |
 # |______________________________________|
 
-@st.cache_resource(allow_output_mutation=True)
+@memoize
 @staticmethod
 def read_json(file_path: str) -> dict:
     """
@@ -89,7 +99,7 @@ def write_json(file_path: str, data, replace: bool = False) -> None:
 # | YAML file.                           |
 # |______________________________________|
 
-@st.cache_resource(allow_output_mutation=True)
+@memoize
 @staticmethod
 def read_yaml(file_path: str) -> dict:
     """
@@ -148,23 +158,27 @@ def write_yaml(file_path: str, data, replace: bool = False) -> None:
 # | DataFrames.                          |
 # |______________________________________|
 
-@st.cache_resource(allow_output_mutation=True)
+@memoize
 @staticmethod
-def read_data(file_path: str) -> pd.DataFrame:
+def read_data(file_path: str, columns: Optional[List[str]] = None, dtype: Optional[dict] = None) -> pd.DataFrame:
     """
-    Read data from a CSV file and return it as a DataFrame.
+    Read data from a CSV, Parquet or Feather artifact and return it as a DataFrame.
+    The format is picked from the file extension (see src/core/utils/formats.py).
 
     Parameters:
-    file_path (str): The path to the YAML file to be read.
+    file_path (str): The path to the data artifact to be read.
+    columns (list, optional): Only these columns are loaded (column projection). Defaults to all columns.
+    dtype (dict, optional): Column dtypes to enforce, e.g. from get_schema_dtypes. Binary formats keep
+                            their stored types and only cast columns that differ.
 
     Returns:
-    DataFrame: A DataFrame containing the data from the CSV file.
+    DataFrame: A DataFrame containing the data from the artifact.
 
     Raises:
-    BankChurnException: If an error occurs while reading the YAML file.
+    BankChurnException: If an error occurs while reading the data artifact.
     """
     try:
-        dataframe = pd.read_csv(file_path)
+        dataframe = get_artifact_format(file_path).read(file_path, columns=columns, dtype=dtype)
        
         return dataframe
     
@@ -173,27 +187,141 @@ def read_data(file_path: str) -> pd.DataFrame:
 
 
 @staticmethod
-def save_data(dataframe: pd.DataFrame, file_path: str) -> None:
+def read_data_in_chunks(file_path: str, chunk_rows: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV, Parquet or Feather artifact as a stream of DataFrame chunks, so only one chunk
+    is held in memory at a time. Chunks are not cached.
+
+    Parameters:
+    file_path (str): The path to the data artifact to be read.
+    chunk_rows (int): Maximum number of rows per chunk.
+    columns (list, optional): Only these columns are loaded (column projection). Defaults to all columns.
+
+    Yields:
+    DataFrame: The next chunk of the artifact.
+
+    Raises:
+    BankChurnException: If an error occurs while reading the data artifact.
+    """
+    try:
+        yield from get_artifact_format(file_path).iter_chunks(file_path, chunk_rows=chunk_rows, columns=columns)
+
+    except Exception as e:
+        raise BankChurnException(f"Error reading chunks from {file_path}: {str(e)}", sys) from e
+
+
+@staticmethod
+def read_data_columns(file_path: str) -> List[str]:
+    """
+    Read only the column names of a data artifact (CSV header or Parquet/Feather schema).
+
+    Parameters:
+    file_path (str): The path to the data artifact.
+
+    Returns:
+    list: The column names of the artifact.
+
+    Raises:
+    BankChurnException: If an error occurs while reading the data artifact.
+    """
+    try:
+        return get_artifact_format(file_path).read_columns(file_path)
+    
+    except Exception as e:
+        raise BankChurnException(f"Error reading columns from {file_path}: {str(e)}", sys) from e
+
+
+@staticmethod
+def read_data_tail(file_path: str, n_rows: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read only the last rows of a data artifact, e.g. the rows appended by the latest incremental run.
+    Parquet/Feather artifacts only read the last part files, CSV files are streamed. The result is not cached.
+
+    Parameters:
+    file_path (str): The path to the data artifact to be read.
+    n_rows (int): Number of rows to read from the end of the artifact.
+    columns (list, optional): Only these columns are loaded (column projection). Defaults to all columns.
+
+    Returns:
+    DataFrame: The last `n_rows` rows of the artifact (fewer when it is shorter).
+
+    Raises:
+    BankChurnException: If an error occurs while reading the data artifact.
+    """
+    try:
+        return get_artifact_format(file_path).read_tail(file_path, n_rows=n_rows, columns=columns)
+
+    except Exception as e:
+        raise BankChurnException(f"Error reading the last rows of {file_path}: {str(e)}", sys) from e
+
+
+@staticmethod
+def save_data(dataframe: pd.DataFrame, file_path: str, append: bool = False) -> None:
     """
-    Save the given DataFrame to a CSV file at the specified file path.
+    Save the given DataFrame to a CSV, Parquet or Feather artifact at the specified file path.
+    The format is picked from the file extension (see src/core/utils/formats.py).
 
     Parameters:
-    DataFrame: A DataFrame containing the data from the CSV file.
+    DataFrame: A DataFrame to be saved.
     file_path: The file path where the DataFrame will be saved.
+    append (bool, optional): If True, append rows to an existing artifact (CSV header is written only
+                             when the file does not exist yet, columnar artifacts get a new part file).
+                             Defaults to False.
 
     Raises:
-    BankChurnException: If an error occurs while reading the YAML file.
+    BankChurnException: If an error occurs while saving the data artifact.
     """
     try:
         # Ensure the directory exists
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        # Save the DataFrame to a CSV file
-        dataframe.to_csv(file_path, index=False, header=True)
+        artifact_format = get_artifact_format(file_path)
+
+        # Append chunks to an existing artifact, otherwise overwrite
+        if append and os.path.exists(file_path):
+            artifact_format.append(dataframe, file_path)
+        else:
+            artifact_format.write(dataframe, file_path)
     
     except Exception as e:
         raise BankChurnException(f"Error saving data to {file_path}: {str(e)}", sys) from e
+
+
+@staticmethod
+def get_schema_dtypes(schema_config: dict, columns: Optional[List[str]] = None, compact: bool = False) -> dict:
+    """
+    Map the feature types declared in settings/schema.yaml to pandas dtypes.
+
+    Parameters:
+    schema_config (dict): The parsed schema configuration.
+    columns (list, optional): Restrict the mapping to these columns. Defaults to all declared features.
+    compact (bool, optional): If True, map to the smallest dtypes instead: a feature's `dtype` override
+                              (e.g. int8), a categorical dtype for features declaring `categories`,
+                              otherwise SCHEMA_COMPACT_TYPE_MAPPING. Defaults to False.
+
+    Returns:
+    dict: Mapping of column name to pandas dtype.
+    """
+    features = schema_config.get("features", {}) or {}
+    dtypes = {}
+
+    for column, spec in features.items():
+        if spec.get("type") not in SCHEMA_TYPE_MAPPING or (columns is not None and column not in columns):
+            continue
+
+        if not compact:
+            dtypes[column] = SCHEMA_TYPE_MAPPING[spec["type"]]
+        elif spec.get("dtype"):
+            dtypes[column] = spec["dtype"]
+        elif spec.get("categories"):
+            from pandas import CategoricalDtype
+
+            dtypes[column] = CategoricalDtype(categories=spec["categories"])
+        else:
+            dtypes[column] = SCHEMA_COMPACT_TYPE_MAPPING[spec["type"]]
+
+    return dtypes
     
 
 
@@ -208,7 +336,9 @@ def save_data(dataframe: pd.DataFrame, file_path: str) -> None:
 @staticmethod
 def save_object(file_path: str, obj: object) -> None:
     """
-    Save an object to a file using the dill module.
+    Save an object (fitted preprocessor, model) in the object artifact format: pickle protocol 5 with the
+    numpy arrays stored out-of-band, a checksum and the library versions (see src/core/utils/serialization.py).
+    The file is replaced atomically.
     
     Parameters:
     file_path (str): The path to the file to be written.
@@ -218,22 +348,23 @@ def save_object(file_path: str, obj: object) -> None:
     BankChurnException: If an error occurs while saving the object.
     """
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+        dump_object(obj, file_path)
 
     except Exception as e:
         raise BankChurnException(e, sys) from e
     
 
-@st.cache_resource(allow_output_mutation=True)
+@memoize
 @staticmethod
-def load_object(file_path: str) -> object:
+def load_object(file_path: str, mmap_mode: bool = True) -> object:
     """
-    Load an object from a file using the dill module.
+    Load an object saved by save_object. The file is memory-mapped copy-on-write: arrays are views of the
+    mapping, read on first use and shared by the processes that load the same file. The checksum is verified
+    before unpickling. Files written by the former dill based save_object are still loaded with dill.
     
     Parameters:
     file_path (str): The path to the file containing the object to be loaded.
+    mmap_mode (bool, optional): Memory-map the file instead of reading it. Defaults to True.
     
     Returns:
     object: The loaded object from the file.
@@ -242,10 +373,10 @@ def load_object(file_path: str) -> object:
     BankChurnException: If an error occurs while loading the object.
     """
     try:
-        with open(file_path, "rb") as file_obj:
-            obj = dill.load(file_obj)
+        if not is_object_file(file_path):
+            return load_legacy_object(file_path)
 
-        return obj
+        return load_object_file(file_path, mmap_mode=mmap_mode)
 
     except Exception as e:
         raise BankChurnException(e, sys) from e
@@ -262,7 +393,7 @@ def load_object(file_path: str) -> object:
 # | Building.                            |
 # |______________________________________|
 
-@st.cache_resource(allow_output_mutation=True)
+@memoize
 @staticmethod
 def split_data(dataframe: pd.DataFrame, test_size: float) -> tuple:
     """
@@ -275,6 +406,8 @@ def split_data(dataframe: pd.DataFrame, test_size: float) -> tuple:
     Output      :   tuple           -> A tuple containing the training DataFrame and the testing DataFrame.
     """ 
     try:
+        from sklearn.model_selection import train_test_split
+
         # Split into train and test data
         train_data, test_data = train_test_split(
             dataframe, 
@@ -289,19 +422,19 @@ def split_data(dataframe: pd.DataFrame, test_size: float) -> tuple:
         raise BankChurnException(f"Error in split_data: {str(e)}", sys) from e
 
 
-@st.cache_resource(allow_output_mutation=True)
 @staticmethod
 def separate_features_and_target(dataframe: pd.DataFrame, target_column: str) -> tuple:
     """
     Method Name :   separate_features_and_target
-    Description :   Separates independent features and dependent (target) feature from the DataFrame.
+    Description :   Separates independent features and dependent (target) feature from the DataFrame
+                    (not memoized: hashing the frame would cost more than the split).
     
     Input       :   df              -> The input DataFrame (train/test).
                 :   target_column   -> The name of the target column in the DataFrame.
     
     Output      :   tuple           -> A tuple containing the independent features DataFrame and the target feature series.
     """
-    try:        
+    try:
         # Separating independent features (X) and target feature (y)
         X = dataframe.drop(columns=[target_column], axis=1)
         y = dataframe[target_column]
@@ -312,7 +445,38 @@ def separate_features_and_target(dataframe: pd.DataFrame, target_column: str) ->
         raise BankChurnException(f"Error in separate_features_and_target: {str(e)}", sys) from e
 
 
-@st.cache_resource(allow_output_mutation=True)
+@staticmethod
+def get_split_indices(target, test_size: float, stratify: bool = True, random_state: Optional[int] = None) -> tuple:
+    """
+    Compute train/test row indices from the target alone.
+
+    Only an integer index vector is shuffled, the features are never copied. The indices can be saved and
+    applied later to a memory-mapped feature store (FeatureStore.get_split) or a DataFrame (iloc).
+
+    :param target: Target vector (array or Series), used for stratification.
+    :param test_size: The proportion of the rows to put in the test split.
+    :param stratify: Keep the class proportions of the target in both splits.
+    :param random_state: Seed of the shuffle.
+    :return: A tuple of sorted (train_indices, test_indices) int64 arrays.
+    """
+    try:
+        import numpy as np
+        from sklearn.model_selection import train_test_split
+
+        target = np.asarray(target)
+        train_indices, test_indices = train_test_split(np.arange(len(target), dtype=np.int64),
+                                                       test_size=test_size,
+                                                       stratify=target if stratify else None,
+                                                       random_state=random_state)
+
+        # Sorted indices gather rows in storage order (sequential reads of a memory map)
+        return np.sort(train_indices), np.sort(test_indices)
+
+    except Exception as e:
+        raise BankChurnException(f"Error in get_split_indices: {str(e)}", sys) from e
+
+
+@memoize
 @staticmethod
 def train_test_split_for_data_validation(dataframe: pd.DataFrame, test_size: float) -> tuple:
     """
@@ -323,54 +487,100 @@ def train_test_split_for_data_validation(dataframe: pd.DataFrame, test_size: flo
     :return: A tuple containing the training set and the testing set.
     """
     try:
+        from sklearn.model_selection import train_test_split
+
         train_set, test_set = train_test_split(dataframe, test_size=test_size, random_state=42)
         return train_set, test_set
     except Exception as e:
         raise BankChurnException(e, sys) from e
 
 
-@st.cache_resource(allow_output_mutation=True)
 @staticmethod
-def train_test_split_for_model_building(dataframe: pd.DataFrame, test_size: float, target_column: str) -> tuple:
+def train_test_split_for_model_building(dataframe: pd.DataFrame, test_size: float, target_column: str,
+                                        random_state: int = DATA_SPLIT_RANDOM_STATE) -> tuple:
     """
     Perform train-test split on the given DataFrame with stratification for model training.
 
+    The split is computed on row indices (see get_split_indices) and every output is gathered once from
+    the input DataFrame, without an intermediate copy of the features.
+
     :param dataframe: The DataFrame to split.
     :param test_size: The proportion of the dataset to include in the test split.
     :param target_column: The name of the target column to stratify on.
-    :return: A tuple containing the training set and the testing set.
+    :param random_state: Seed of the split, so reruns on the same data give the same split.
+    :return: A tuple containing X_train, X_test, y_train and y_test.
     """
     try:
-        # Separate the features and the target column
-        X = dataframe.drop(columns=[target_column])
-        y = dataframe[target_column]
+        train_indices, test_indices = get_split_indices(dataframe[target_column], test_size=test_size,
+                                                         stratify=True, random_state=random_state)
 
-        # Perform train-test split with stratification
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, stratify=y)
+        feature_positions = [position for position, column in enumerate(dataframe.columns) if column != target_column]
+        target_position = dataframe.columns.get_loc(target_column)
 
-        # # Combine the features and target columns back into DataFrames
-        # train_set = pd.concat([X_train, y_train], axis=1)
-        # test_set = pd.concat([X_test, y_test], axis=1)
+        X_train = dataframe.iloc[train_indices, feature_positions]
+        X_test = dataframe.iloc[test_indices, feature_positions]
+        y_train = dataframe.iloc[train_indices, target_position]
+        y_test = dataframe.iloc[test_indices, target_position]
 
         return X_train, X_test, y_train, y_test 
     except Exception as e:
         raise BankChurnException(e, sys) from e
 
 
-@st.cache_resource(allow_output_mutation=True)
+@memoize
 @staticmethod
-def train_test_split_for_tuning(X_train: pd.DataFrame, y_train: pd.Series, test_size: float) -> tuple:
+def train_test_split_for_tuning(X_train: pd.DataFrame, y_train: pd.Series, test_size: float,
+                                random_state: int = DATA_SPLIT_RANDOM_STATE) -> tuple:
     """
     Perform train-test split on the given training data for hyperparameter tuning.
 
     :param X_train: The training features DataFrame.
     :param y_train: The training target Series.
     :param test_size: The proportion of the dataset to include in the test split.
+    :param random_state: Seed of the split, so reruns on the same data give the same tuning set.
     :return: A tuple containing the tuning set features and target.
     """
     try:
+        from sklearn.model_selection import train_test_split
+
         # Perform train-test split for hyperparameter tuning
-        X_tune, _, y_tune, _ = train_test_split(X_train, y_train, test_size=test_size)
+        X_tune, _, y_tune, _ = train_test_split(X_train, y_train, test_size=test_size, random_state=random_state)
         return X_tune, y_tune
     except Exception as e:
         raise BankChurnException(e, sys) from e
+
+
+
+# ________________________________________
+# |                                      |
+# |             Hash Helpers             |
+# |--------------------------------------|
+# | Functions for fingerprinting files   |
+# | and configurations.                  |
+# |______________________________________|
+
+@staticmethod
+def get_file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file, reading it in fixed-size blocks.
+
+    Parameters:
+    file_path (str): The path to the file to be hashed.
+    chunk_size (int, optional): Number of bytes read per block. Defaults to 1 MiB.
+
+    Returns:
+    str: The hex digest of the file content.
+
+    Raises:
+    BankChurnException: If an error occurs while reading the file.
+    """
+    try:
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as file_obj:
+            for block in iter(lambda: file_obj.read(chunk_size), b""):
+                sha256.update(block)
+
+        return sha256.hexdigest()
+
+    except Exception as e:
+        raise BankChurnException(f"Error hashing file {file_path}: {str(e)}", sys) from e
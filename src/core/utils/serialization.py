@@ -0,0 +1,223 @@
+# Model artifact format: pickle protocol 5 with out-of-band, memory-mappable numpy buffers
+#
+# File layout (offsets are absolute, every section starts on a 64 byte boundary):
+#
+#   MAGIC | padding | pickle stream | buffer 0 | buffer 1 | ... | JSON manifest | manifest length (8 bytes) | MAGIC
+#
+# The pickle stream holds the object graph without the contents of contiguous numpy arrays (coefficients, tree
+# nodes, category tables, ...): protocol 5 hands those out as separate buffers, which are written as raw bytes.
+# Loading maps the file copy-on-write and hands views of the mapping back to pickle, so arrays are not copied
+# (only read by the checksum pass) and forked serving workers share the pages of one mapping until one of them
+# writes to an array. The manifest records the checksum of everything before it and the library versions the
+# object was pickled with.
+
+import io
+import os
+import sys
+import json
+import mmap
+import zlib
+import pickle
+import platform
+
+from datetime import datetime
+from typing import List
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+
+OBJECT_FORMAT_MAGIC = b"BCOBJv1\x00"
+OBJECT_FORMAT_VERSION = 1
+OBJECT_ALIGNMENT = 64
+
+# Libraries whose versions decide whether a pickled estimator can be loaded
+TRACKED_LIBRARIES = ("numpy", "pandas", "sklearn", "scipy")
+
+
+def _padding(offset: int) -> bytes:
+    return b"\x00" * (-offset % OBJECT_ALIGNMENT)
+
+
+def get_library_versions() -> dict:
+    """
+    Versions of python and of the tracked libraries that are loaded (a library that is not imported
+    is not needed by the object).
+    """
+    versions = {"python": platform.python_version()}
+    for name in TRACKED_LIBRARIES:
+        module = sys.modules.get(name)
+        if module is not None:
+            versions[name] = getattr(module, "__version__", None)
+    return versions
+
+
+def is_object_file(file_path: str) -> bool:
+    """
+    True for files written by `dump_object`, False for legacy (dill) pickles.
+    """
+    with open(file_path, "rb") as file_obj:
+        return file_obj.read(len(OBJECT_FORMAT_MAGIC)) == OBJECT_FORMAT_MAGIC
+
+
+def dump_object(obj: object, file_path: str) -> dict:
+    """
+    Write an object in the artifact format. The file is written next to the target and moved in place,
+    so processes that mapped the previous version keep a consistent view of it.
+
+    Parameters:
+    obj (object): The object to save (fitted preprocessor, model, ...).
+    file_path (str): The path to the file to be written.
+
+    Returns:
+    dict: The manifest of the file.
+
+    Raises:
+    BankChurnException: If an error occurs while saving the object.
+    """
+    try:
+        buffers: List[pickle.PickleBuffer] = []
+        stream = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        temporary_file_path = f"{file_path}.{os.getpid()}.tmp"
+        checksum = 0
+
+        try:
+            with open(temporary_file_path, "wb") as file_obj:
+                def write(data) -> int:
+                    nonlocal checksum
+                    offset = file_obj.tell()
+                    file_obj.write(data)
+                    checksum = zlib.crc32(data, checksum)
+                    return offset
+
+                write(OBJECT_FORMAT_MAGIC)
+                write(_padding(file_obj.tell()))
+
+                pickle_section = {"offset": write(stream), "length": len(stream)}
+                buffer_sections = []
+                for buffer in buffers:
+                    write(_padding(file_obj.tell()))
+                    data = buffer.raw()
+                    buffer_sections.append({"offset": write(data), "length": data.nbytes})
+
+                manifest = {"format_version": OBJECT_FORMAT_VERSION,
+                            "created_at": datetime.now().isoformat(timespec="seconds"),
+                            "object_type": f"{type(obj).__module__}.{type(obj).__qualname__}",
+                            "libraries": get_library_versions(),
+                            "pickle_protocol": 5,
+                            "pickle": pickle_section,
+                            "buffers": buffer_sections,
+                            "n_bytes": file_obj.tell(),
+                            "checksum": {"algorithm": "crc32", "digest": f"{checksum:08x}"}}
+
+                manifest_bytes = json.dumps(manifest).encode()
+                file_obj.write(manifest_bytes)
+                file_obj.write(len(manifest_bytes).to_bytes(8, "little"))
+                file_obj.write(OBJECT_FORMAT_MAGIC)
+
+            os.replace(temporary_file_path, file_path)
+
+        finally:
+            if os.path.exists(temporary_file_path):
+                os.remove(temporary_file_path)
+
+        return manifest
+
+    except Exception as e:
+        raise BankChurnException(f"Error saving object to {file_path}: {str(e)}", sys) from e
+
+
+def read_object_manifest(file_path: str) -> dict:
+    """
+    Read the manifest of an object file without loading the object.
+
+    Raises:
+    BankChurnException: If the file is not in the artifact format or is truncated.
+    """
+    try:
+        with open(file_path, "rb") as file_obj:
+            if file_obj.read(len(OBJECT_FORMAT_MAGIC)) != OBJECT_FORMAT_MAGIC:
+                raise ValueError("not an object artifact (legacy pickle?)")
+
+            file_obj.seek(-(8 + len(OBJECT_FORMAT_MAGIC)), io.SEEK_END)
+            trailer = file_obj.read()
+            if trailer[8:] != OBJECT_FORMAT_MAGIC:
+                raise ValueError("truncated object artifact")
+
+            manifest_length = int.from_bytes(trailer[:8], "little")
+            file_obj.seek(-(manifest_length + len(trailer)), io.SEEK_END)
+            return json.loads(file_obj.read(manifest_length))
+
+    except Exception as e:
+        raise BankChurnException(f"Error reading the manifest of {file_path}: {str(e)}", sys) from e
+
+
+def load_object_file(file_path: str, mmap_mode: bool = True, verify: bool = True) -> object:
+    """
+    Load an object written by `dump_object`.
+
+    Parameters:
+    file_path (str): The path to the object file.
+    mmap_mode (bool): Map the file copy-on-write and build the arrays on views of the mapping (zero-copy,
+                      pages are read on first use and shared between processes). False reads the file.
+    verify (bool): Check the checksum of the file before unpickling it.
+
+    Returns:
+    object: The loaded object.
+
+    Raises:
+    BankChurnException: If the checksum does not match or the object cannot be loaded.
+    """
+    try:
+        manifest = read_object_manifest(file_path)
+
+        if manifest.get("format_version", 0) > OBJECT_FORMAT_VERSION:
+            raise ValueError(f"format version {manifest['format_version']} is newer than this code "
+                             f"({OBJECT_FORMAT_VERSION})")
+
+        with open(file_path, "rb") as file_obj:
+            if mmap_mode:
+                data = memoryview(mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_COPY))
+            else:
+                data = memoryview(bytearray(file_obj.read()))
+
+        if verify:
+            # CRC32 detects corrupted or truncated files at several GB/s
+            checksum = f"{zlib.crc32(data[:manifest['n_bytes']]):08x}"
+            if checksum != manifest["checksum"]["digest"]:
+                raise ValueError("checksum mismatch, the file is corrupted")
+
+        pickle_section = manifest["pickle"]
+        stream = data[pickle_section["offset"]:pickle_section["offset"] + pickle_section["length"]]
+        buffers = [data[section["offset"]:section["offset"] + section["length"]] for section in manifest["buffers"]]
+
+        obj = pickle.loads(stream, buffers=buffers)
+
+        # Pickled estimators are only guaranteed to work with the library versions that wrote them
+        # (compared after unpickling, which imports the libraries the object needs)
+        current_versions = get_library_versions()
+        mismatches = {name: (version, current_versions.get(name)) for name, version in manifest["libraries"].items()
+                      if name != "python" and current_versions.get(name) not in (None, version)}
+        if mismatches:
+            logging.warning(f"{file_path} was saved with other library versions (saved, current): {mismatches}")
+
+        return obj
+
+    except Exception as e:
+        raise BankChurnException(f"Error loading object from {file_path}: {str(e)}", sys) from e
+
+
+def load_legacy_object(file_path: str) -> object:
+    """
+    Load a pickle written by the previous dill based save_object.
+    """
+    try:
+        import dill
+
+        with open(file_path, "rb") as file_obj:
+            return dill.load(file_obj)
+
+    except Exception as e:
+        raise BankChurnException(f"Error loading legacy object from {file_path}: {str(e)}", sys) from e
@@ -1,7 +1,12 @@
 import os
 import sys
 
-from pandas import DataFrame
+import numpy as np
+
+from typing import Any, Iterator, Optional
+from pandas import DataFrame, Series, CategoricalDtype, to_numeric
+from pandas.api.types import (is_bool_dtype, is_integer_dtype,
+                              is_float_dtype, is_numeric_dtype)
 
 from src.core.logger import logging
 from src.core.exception import BankChurnException
@@ -10,7 +15,9 @@ from src.configs.mysql_connection import HotelBookingData
 from src.core.entities.config_entity import DataIngestionConfig
 from src.core.entities.artifact_entity import DataIngestionArtifact
 
-from src.core.utils.helpers import (read_yaml, save_data) 
+from src.core.utils.helpers import (read_yaml, save_data,
+                                    read_json, write_json,
+                                    get_file_hash, get_schema_dtypes) 
 
 from src.core.constants.common import (DATASET_NAME,
                                        SCHEMA_FILE_PATH)
@@ -37,6 +44,9 @@ class DataIngestion:
             self.data_ingestion_config = data_ingestion_config
             # Read the schema configuration for insignificant columns and other details
             self._schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+            self.watermark_column = self._schema_config.get("watermark_column")
+            # Compact dtypes (bool, int8/int16, float32, categorical) declared by the schema
+            self._compact_dtypes = get_schema_dtypes(self._schema_config, compact=True)
      
         except Exception as e:
             logging.error(f"Error in DataIngestion initialization: {str(e)}")
@@ -44,11 +54,22 @@ class DataIngestion:
 
 
 
-    def export_data_into_artifact_data(self) -> DataFrame:
+    def export_data_into_artifact_data(self, watermark_value: Any = None) -> DataFrame:
+        """
+        Method Name :   export_data_into_artifact_data
+        Description :   This method exports the MySQL table (or only the rows above `watermark_value`)
+                        and saves it into the raw artifact file. New rows are appended to the
+                        existing raw file when a watermark is given.
+
+        Output      :   DataFrame with the exported rows.
+        On Failure  :   Write an exception log and then raise an exception
+        """
         try:
             logging.info("Exporting data from MySQL Database")
             hotel_booking_data = HotelBookingData()
-            dataframe = hotel_booking_data.export_data_as_dataframe(dataset_name=self.dataset_name)
+            dataframe = hotel_booking_data.export_data_as_dataframe(dataset_name=self.dataset_name,
+                                                                    watermark_column=self.watermark_column,
+                                                                    watermark_value=watermark_value)
             logging.info(f"Shape of dataframe: {dataframe.shape}")
 
 
@@ -58,7 +79,7 @@ class DataIngestion:
 
 
             logging.info(f"Saving exported data into artifact raw file path: {artifact_raw_file_path}")
-            save_data(dataframe, artifact_raw_file_path)
+            save_data(dataframe, artifact_raw_file_path, append=watermark_value is not None)
         
             return dataframe
         except Exception as e:
@@ -67,6 +88,158 @@ class DataIngestion:
 
 
 
+    def export_data_into_artifact_data_in_chunks(self, watermark_value: Any = None) -> Iterator[DataFrame]:
+        """
+        Method Name :   export_data_into_artifact_data_in_chunks
+        Description :   This method streams the MySQL table chunk by chunk, appending every chunk
+                        to the raw artifact file before yielding it, so peak memory is bounded by
+                        the configured chunk size instead of the table size. With more than one
+                        partition configured, key ranges of the table (of about `chunk_size` rows
+                        at most) are fetched concurrently and yielded in key order instead. Only rows above `watermark_value` are
+                        streamed when a watermark is given.
+
+        Output      :   Generator of DataFrame chunks.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            hotel_booking_data = HotelBookingData()
+            n_partitions = self.data_ingestion_config.n_partitions
+            partition_column = self._schema_config.get("partition_column")
+
+            if n_partitions > 1 and partition_column:
+                max_workers = self.data_ingestion_config.max_workers
+                logging.info(f"Exporting data from MySQL Database in at least {n_partitions} partitions on {partition_column} "
+                             f"with {max_workers} workers")
+                chunks = hotel_booking_data.export_data_in_partitions(dataset_name=self.dataset_name,
+                                                                      partition_column=partition_column,
+                                                                      n_partitions=n_partitions,
+                                                                      max_workers=max_workers,
+                                                                      chunk_size=self.data_ingestion_config.chunk_size,
+                                                                      watermark_column=self.watermark_column,
+                                                                      watermark_value=watermark_value)
+            else:
+                chunk_size = self.data_ingestion_config.chunk_size
+                logging.info(f"Streaming data from MySQL Database in chunks of {chunk_size} rows")
+                chunks = hotel_booking_data.export_data_as_chunks(dataset_name=self.dataset_name,
+                                                                  chunk_size=chunk_size,
+                                                                  watermark_column=self.watermark_column,
+                                                                  watermark_value=watermark_value)
+
+            artifact_raw_file_path = self.data_ingestion_config.raw_file_path
+            logging.info(f"Saving exported data into artifact raw file path: {artifact_raw_file_path}")
+
+            n_rows = 0
+            for i, chunk in enumerate(chunks):
+                # A full export overwrites the previous raw file with its first chunk,
+                # an incremental export appends every chunk
+                save_data(chunk, artifact_raw_file_path, append=watermark_value is not None or i > 0)
+                n_rows += len(chunk)
+
+                yield chunk
+
+            logging.info(f"Number of rows exported: {n_rows}")
+            logging.info(f"MySQL connection pool stats: {hotel_booking_data.mysql_connect.get_pool_stats()}")
+        except Exception as e:
+            logging.error(f"Error in export_data_into_artifact_data_in_chunks: {str(e)}")
+            raise BankChurnException(f"Error in export_data_into_artifact_data_in_chunks: {str(e)}",sys) from e
+
+
+
+    def get_watermark(self, schema_hash: str) -> Optional[Any]:
+        """
+        Method Name :   get_watermark
+        Description :   This method returns the persisted high-water mark of the previous ingestion run.
+                        A full export is forced (None is returned) when incremental mode is disabled,
+                        no watermark column is configured, the schema changed since the last run or
+                        one of the ingested artifacts is missing.
+
+        Output      :   Last ingested value of the watermark column, or None for a full export.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            watermark_file_path = self.data_ingestion_config.watermark_file_path
+
+            if not (self.data_ingestion_config.incremental and self.watermark_column):
+                logging.info("Incremental ingestion disabled, exporting the full table")
+                return None
+
+            if not os.path.exists(watermark_file_path):
+                logging.info("No watermark found, exporting the full table")
+                return None
+
+            if not (os.path.exists(self.data_ingestion_config.raw_file_path)
+                    and os.path.exists(self.data_ingestion_config.data_file_path)):
+                logging.info("Ingested artifacts are missing, exporting the full table")
+                return None
+
+            watermark = read_json(file_path=watermark_file_path)
+
+            if watermark.get("schema_hash") != schema_hash or watermark.get("watermark_column") != self.watermark_column:
+                logging.info("Schema changed since the last ingestion, exporting the full table")
+                return None
+
+            logging.info(f"Found watermark {self.watermark_column} = {watermark['watermark_value']}")
+            return watermark["watermark_value"]
+
+        except Exception as e:
+            logging.error(f"Error in get_watermark: {str(e)}")
+            raise BankChurnException(f"Error in get_watermark: {str(e)}", sys) from e
+
+
+
+    def get_source_snapshot(self) -> dict:
+        """
+        Method Name :   get_source_snapshot
+        Description :   This method summarises the source MySQL table (row count and maximum of the
+                        watermark column) without exporting it. The pipeline uses it as an input of
+                        the stage fingerprint to skip ingestion when the table did not change.
+
+        Output      :   Dictionary describing the table snapshot.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            snapshot = HotelBookingData().get_table_snapshot(dataset_name=self.dataset_name,
+                                                             watermark_column=self.watermark_column)
+            logging.info(f"Source table snapshot: {snapshot}")
+            return snapshot
+
+        except Exception as e:
+            logging.error(f"Error in get_source_snapshot: {str(e)}")
+            raise BankChurnException(f"Error in get_source_snapshot: {str(e)}", sys) from e
+
+
+
+    def get_chunk_watermark(self, dataframe: DataFrame, watermark_value: Any = None) -> Any:
+        """
+        Method Name :   get_chunk_watermark
+        Description :   This method returns the larger of `watermark_value` and the maximum of the
+                        watermark column in the dataframe, as a JSON serializable value.
+
+        Output      :   Updated high-water mark.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            if not self.watermark_column or self.watermark_column not in dataframe.columns or dataframe.empty:
+                return watermark_value
+
+            chunk_watermark = dataframe[self.watermark_column].max()
+
+            # Convert numpy / pandas scalars into plain python values
+            if hasattr(chunk_watermark, "isoformat"):
+                chunk_watermark = chunk_watermark.isoformat()
+            elif hasattr(chunk_watermark, "item"):
+                chunk_watermark = chunk_watermark.item()
+
+            if watermark_value is None:
+                return chunk_watermark
+            return max(watermark_value, chunk_watermark)
+
+        except Exception as e:
+            logging.error(f"Error in get_chunk_watermark: {str(e)}")
+            raise BankChurnException(f"Error in get_chunk_watermark: {str(e)}", sys) from e
+
+
+
     def drop_insignificant_columns(self, dataframe: DataFrame) -> DataFrame:
         """
         Method Name :   drop_insignificant_columns
@@ -95,6 +268,115 @@ class DataIngestion:
         
 
 
+    def coerce_schema_dtypes(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Method Name :   coerce_schema_dtypes
+        Description :   This method casts every column declared in the schema to its compact dtype
+                        (bool, int8/int16/int32, float32 or categorical). Columns with missing values
+                        use the nullable variant (boolean, Int8, ...). Raw values are never replaced,
+                        so validation reports them: values outside the declared categories are added to
+                        the categories (every chunk keeps the categorical type), and boolean columns with
+                        values other than 0/1, true/false or yes/no, numeric columns with non-numeric
+                        values and integer columns with fractional values or values that do not fit the
+                        declared dtype are left unchanged.
+
+        Output      :   DataFrame with compact dtypes.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            columns = {}
+
+            for column, dtype in self._compact_dtypes.items():
+                if column not in dataframe.columns:
+                    continue
+
+                series = dataframe[column]
+                has_missing_values = bool(series.isna().any())
+
+                if isinstance(dtype, CategoricalDtype):
+                    unknown_values = series.notna() & ~series.isin(dtype.categories)
+                    if unknown_values.any():
+                        # The cast would turn them into missing values, hiding them from validation
+                        unknown_categories = sorted(set(series[unknown_values]), key=str)
+                        logging.warning(f"{int(unknown_values.sum())} values of {column} are not in the declared "
+                                        f"categories {list(dtype.categories)}, adding {unknown_categories}")
+                        dtype = CategoricalDtype(list(dtype.categories) + unknown_categories, ordered=dtype.ordered)
+                    columns[column] = series.astype(dtype)
+
+                elif is_bool_dtype(dtype):
+                    flags = series
+                    if not is_numeric_dtype(series) and not is_bool_dtype(series):
+                        # Textual flags such as "Yes"/"No" or "True"/"False"
+                        flags = series.astype("string").str.lower().map(
+                            {"true": True, "yes": True, "1": True, "false": False, "no": False, "0": False})
+                    elif not is_bool_dtype(series):
+                        flags = series.map({0: False, 1: True})
+
+                    if (flags.isna() & series.notna()).any():
+                        logging.warning(f"Values of {column} are not boolean flags, keeping {series.dtype}")
+                        continue
+                    columns[column] = flags.astype("boolean" if has_missing_values else "bool")
+
+                elif is_integer_dtype(dtype) or is_float_dtype(dtype):
+                    numbers = to_numeric(series, errors="coerce")
+                    if (numbers.isna() & series.notna()).any():
+                        logging.warning(f"Values of {column} are not numeric, keeping {series.dtype}")
+                        continue
+
+                    if is_float_dtype(dtype):
+                        columns[column] = numbers.astype(dtype)
+                        continue
+
+                    dtype_info = np.iinfo(np.dtype(dtype))
+                    if (numbers.dropna() % 1 != 0).any():
+                        logging.warning(f"Values of {column} are not whole numbers, keeping {series.dtype}")
+                        continue
+                    if numbers.min() < dtype_info.min or numbers.max() > dtype_info.max:
+                        logging.warning(f"Values of {column} do not fit into {dtype}, keeping {series.dtype}")
+                        continue
+                    columns[column] = numbers.astype(str(dtype).capitalize() if has_missing_values else dtype)
+
+            if columns:
+                dataframe = dataframe.assign(**columns)
+
+            return dataframe
+
+        except Exception as e:
+            logging.error(f"Error in coerce_schema_dtypes: {str(e)}")
+            raise BankChurnException(f"Error in coerce_schema_dtypes: {str(e)}", sys) from e
+
+
+
+    def log_memory_savings(self, memory_before: Series, memory_after: Series) -> dict:
+        """
+        Method Name :   log_memory_savings
+        Description :   This method logs the in-memory size of every column before and after the dtype
+                        coercion, along with the bytes saved.
+
+        Output      :   Dictionary of column -> {"before", "after", "saved"} bytes.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            report = {}
+
+            for column in memory_before.index:
+                before = int(memory_before[column])
+                after = int(memory_after.get(column, before))
+                report[column] = {"before": before, "after": after, "saved": before - after}
+                logging.info(f"{column}: {before:,} -> {after:,} bytes ({before - after:,} bytes saved)")
+
+            total_before, total_after = int(memory_before.sum()), int(memory_after.sum())
+            ratio = total_before / total_after if total_after else 0.0
+            logging.info(f"Total memory: {total_before:,} -> {total_after:,} bytes ({ratio:.1f}x smaller)")
+
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in log_memory_savings: {str(e)}")
+            raise BankChurnException(f"Error in log_memory_savings: {str(e)}", sys) from e
+
+
+
     def initiate_data_ingestion(self) -> DataIngestionArtifact:
         """
         Method Name :   initiate_data_ingestion
@@ -106,24 +388,63 @@ class DataIngestion:
         logging.info("Entered initiate_data_ingestion method of DataIngestion class")
 
         try:
-            dataframe = self.export_data_into_artifact_data()
-            logging.info("Got the data from MySQL Database")
+            data_file_path = self.data_ingestion_config.data_file_path
+            dir_path = os.path.dirname(data_file_path)
+            os.makedirs(dir_path, exist_ok=True)
 
 
-            dataframe = self.drop_insignificant_columns(dataframe)
-            logging.info("Dropped insignificant columns from the dataframe")
+            # Only rows above the persisted watermark are fetched, unless the schema changed
+            schema_hash = get_file_hash(SCHEMA_FILE_PATH)
+            watermark_value = self.get_watermark(schema_hash=schema_hash)
+            incremental = watermark_value is not None
 
 
-            data_file_path = self.data_ingestion_config.data_file_path
-            dir_path = os.path.dirname(data_file_path)
-            os.makedirs(dir_path, exist_ok=True)
+            if self.data_ingestion_config.chunk_size or self.data_ingestion_config.n_partitions > 1:
+                # Streaming / partitioned mode: raw and ingested files are written chunk by chunk
+                chunks = self.export_data_into_artifact_data_in_chunks(watermark_value=watermark_value)
+            else:
+                chunks = iter([self.export_data_into_artifact_data(watermark_value=watermark_value)])
 
 
             logging.info(f"Saving ingested data into file path: {data_file_path}")
-            save_data(dataframe, data_file_path)
+            n_rows = 0
+            new_watermark_value = watermark_value
+            memory_before, memory_after = Series(dtype="int64"), Series(dtype="int64")
+            for i, chunk in enumerate(chunks):
+                new_watermark_value = self.get_chunk_watermark(chunk, new_watermark_value)
+
+                chunk = self.drop_insignificant_columns(chunk)
+
+                # Cast to the compact dtypes declared in the schema
+                memory_before = memory_before.add(chunk.memory_usage(index=False, deep=True), fill_value=0)
+                chunk = self.coerce_schema_dtypes(chunk)
+                memory_after = memory_after.add(chunk.memory_usage(index=False, deep=True), fill_value=0)
+
+                save_data(chunk, data_file_path, append=incremental or i > 0)
+                n_rows += len(chunk)
+
+            logging.info(f"Got {n_rows} {'new ' if incremental else ''}rows from MySQL Database")
+            if n_rows:
+                self.log_memory_savings(memory_before, memory_after)
+
+
+            # Persist the watermark only after both artifacts are written
+            if self.watermark_column:
+                rows_ingested_total = n_rows
+                if incremental:
+                    previous_watermark = read_json(file_path=self.data_ingestion_config.watermark_file_path)
+                    rows_ingested_total += previous_watermark["rows_ingested_total"]
+
+                write_json(file_path=self.data_ingestion_config.watermark_file_path,
+                           data={"watermark_column": self.watermark_column,
+                                 "watermark_value": new_watermark_value,
+                                 "schema_hash": schema_hash,
+                                 "rows_ingested_last": n_rows,
+                                 "rows_ingested_total": rows_ingested_total},
+                           replace=True)
 
             
-            data_ingestion_artifact = DataIngestionArtifact(data_file_path=data_file_path)
+            data_ingestion_artifact = DataIngestionArtifact(data_file_path=data_file_path, new_rows=n_rows)
             logging.info(f"Data ingestion artifact: {data_ingestion_artifact}")
         
         
@@ -0,0 +1,643 @@
+import os
+import sys
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from pandas import DataFrame
+from pandas.api.types import is_numeric_dtype, is_bool_dtype
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.entities.config_entity import DataPreprocessingConfig
+from src.core.entities.artifact_entity import (DataIngestionArtifact,
+                                               DataPreprocessingArtifact)
+
+from src.core.utils.helpers import (read_data, read_data_in_chunks,
+                                    read_yaml, save_object, load_object)
+from src.core.utils.feature_store import FeatureStore
+
+from src.core.constants.common import (SCHEMA_FILE_PATH,
+                                       TARGET_COLUMN,
+                                       TARGET_MAPPING)
+from src.core.constants.data import DATA_PREPROCESSING_BLOCK_ROWS
+
+
+
+
+class SchemaPreprocessor:
+    """
+    Class Name :   SchemaPreprocessor
+    Description :   Compiles the `transformation` block of settings/schema.yaml into one fitted transformer:
+
+                      - label_encoding  : integer code per category (-1 for unknown or missing values)
+                      - onehot_encoding : one 0/1 column per category (all zeros for unknown or missing values)
+                      - scaling         : standardisation with the fitted mean and standard deviation
+
+                    Remaining numerical/boolean features (except the target) pass through unchanged. Missing
+                    numerical values are filled with the fitted mean. Categories declared in the schema are used
+                    as vocabularies, other vocabularies are learned by `fit`.
+
+                    `transform` writes straight into one preallocated float32 matrix, block of rows by block of
+                    rows: per column work (category codes, missing values, scaling) is done once on whole
+                    contiguous numpy arrays, the blocks are only filled with copies and one-hot scatters.
+
+    Output      :   float32 feature matrix (n_rows x n_features_out), feature names in `feature_names_out`
+    On Failure  :   Raises an exception
+    """
+
+    TRANSFORMATIONS = ("label_encoding", "onehot_encoding", "scaling")
+    NUMERIC_TYPES = {"integer", "float", "boolean"}
+
+    def __init__(self, schema_config: dict, target_column: str = TARGET_COLUMN,
+                 block_rows: int = DATA_PREPROCESSING_BLOCK_ROWS):
+        try:
+            features = schema_config.get("features", {}) or {}
+            insignificant_columns = set(schema_config.get("insignificant_columns", []) or [])
+            transformation = schema_config.get("transformation", {}) or {}
+
+            unknown = set(transformation) - set(self.TRANSFORMATIONS)
+            if unknown:
+                raise ValueError(f"Unsupported transformations in schema: {sorted(unknown)}")
+
+            self.target_column = target_column
+            self.block_rows = block_rows
+            self.label_columns = list(transformation.get("label_encoding") or [])
+            self.onehot_columns = list(transformation.get("onehot_encoding") or [])
+            self.scaling_columns = list(transformation.get("scaling") or [])
+
+            transformed_columns = set(self.label_columns) | set(self.onehot_columns) | set(self.scaling_columns)
+            self.passthrough_columns = [column for column, spec in features.items()
+                                        if column not in insignificant_columns and column not in transformed_columns
+                                        and column != target_column and spec.get("type") in self.NUMERIC_TYPES]
+
+            self._declared_categories = {column: list(spec["categories"]) for column, spec in features.items()
+                                         if spec.get("categories")}
+
+            # Statistics accumulated by partial_fit
+            self._count = None
+
+            # Fitted state
+            self.vocabularies = {}
+            self.means = np.zeros(0, dtype=np.float32)  # fill value of missing numerical values
+            self.centers = np.zeros(0, dtype=np.float32)  # mean of scaled columns, 0 for passthrough columns
+            self.scales = np.ones(0, dtype=np.float32)
+            self.feature_names_out: List[str] = []
+            self.is_fitted = False
+
+        except Exception as e:
+            raise BankChurnException(f"Error initializing SchemaPreprocessor: {str(e)}", sys) from e
+
+
+    @property
+    def input_columns(self) -> List[str]:
+        return self.label_columns + self.onehot_columns + self.scaling_columns + self.passthrough_columns
+
+
+    @property
+    def numerical_columns(self) -> List[str]:
+        # Scaled columns first, then passthrough columns: one contiguous block of the output matrix
+        return self.scaling_columns + self.passthrough_columns
+
+
+    @staticmethod
+    def _numerical_values(series: pd.Series) -> np.ndarray:
+        return series.to_numpy(dtype=np.float32, na_value=np.nan)
+
+
+    @staticmethod
+    def _codes(series: pd.Series, vocabulary: list) -> np.ndarray:
+        """
+        Position of every value in the vocabulary, -1 for values outside it and missing values.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype) and list(series.cat.categories) == vocabulary:
+            # Ingested columns already carry the declared categories: the codes are stored
+            return series.cat.codes.to_numpy()
+
+        if is_numeric_dtype(series) and all(isinstance(value, (bool, int, float)) for value in vocabulary):
+            vocabulary = np.asarray(vocabulary, dtype=np.float32)
+            values = series.to_numpy(dtype=np.float32, na_value=np.nan)
+
+            if np.array_equal(vocabulary, np.arange(vocabulary[0], vocabulary[0] + len(vocabulary))):
+                # Consecutive integers (flags, tenure years): the code is the offset from the first value
+                positions = values - vocabulary[0]
+                known = (positions >= 0) & (positions < len(vocabulary)) & (positions == np.floor(positions))
+            else:
+                # Other sorted numerical vocabularies: binary search instead of hashing
+                positions = np.minimum(np.searchsorted(vocabulary, values), len(vocabulary) - 1)
+                known = vocabulary[positions] == values
+
+            return np.where(known, positions, -1).astype(np.int16)
+
+        # Hash based lookup in C
+        return pd.Categorical(series, categories=vocabulary).codes
+
+
+    def _scaled_values(self, series: pd.Series, i: int) -> np.ndarray:
+        """
+        float32 values of the i-th numerical column, missing values filled with the fitted mean,
+        standardised when the column is scaled.
+        """
+        values = self._numerical_values(series)
+
+        missing_values = np.isnan(values)
+        if missing_values.any():
+            values = np.where(missing_values, self.means[i], values)
+
+        if self.centers[i] != 0.0 or self.scales[i] != 1.0:
+            values = (values - self.centers[i]) * np.float32(1.0 / self.scales[i])
+
+        return values
+
+
+    def reset(self) -> "SchemaPreprocessor":
+        """
+        Clear the accumulated statistics before a new fit.
+        """
+        n_numerical = len(self.numerical_columns)
+        self._count = np.zeros(n_numerical, dtype=np.float64)
+        self._mean = np.zeros(n_numerical, dtype=np.float64)
+        self._m2 = np.zeros(n_numerical, dtype=np.float64)
+        self._observed_categories = {column: set() for column in self.label_columns + self.onehot_columns
+                                     if column not in self._declared_categories}
+        self.is_fitted = False
+        return self
+
+
+    def partial_fit(self, dataframe: DataFrame) -> "SchemaPreprocessor":
+        """
+        Accumulate the statistics of one chunk: observed categories of the encoded columns without declared
+        categories, and count/mean/sum of squared deviations of the numerical columns. Chunk statistics are
+        merged with Chan's parallel update, so chunks can come in any size and order:
+
+            n = n_a + n_b,  delta = mean_b - mean_a
+            mean = mean_a + delta * n_b / n
+            M2 = M2_a + M2_b + delta^2 * n_a * n_b / n
+
+        Call `finalize_fit` after the last chunk.
+
+        :param dataframe: Chunk of training data with the input columns.
+        :return: The preprocessor.
+        """
+        try:
+            if getattr(self, "_count", None) is None:
+                self.reset()
+
+            missing_columns = [column for column in self.input_columns if column not in dataframe.columns]
+            if missing_columns:
+                raise ValueError(f"Columns missing for preprocessing: {missing_columns}")
+
+            for column, categories in self._observed_categories.items():
+                values = pd.unique(dataframe[column].dropna())
+                categories.update(value.item() if hasattr(value, "item") else value for value in values)
+
+            if self.numerical_columns:
+                values = np.column_stack([dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                                          for column in self.numerical_columns])
+                count = np.sum(~np.isnan(values), axis=0).astype(np.float64)
+                observed = count > 0
+
+                mean = np.zeros_like(count)
+                mean[observed] = np.nanmean(values[:, observed], axis=0)
+                m2 = np.nansum((values - mean) ** 2, axis=0)
+
+                total = self._count + count
+                delta = mean - self._mean
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    self._mean = np.where(total > 0, self._mean + delta * count / total, 0.0)
+                    self._m2 = np.where(total > 0, self._m2 + m2 + delta ** 2 * self._count * count / total, 0.0)
+                self._count = total
+
+            return self
+
+        except Exception as e:
+            raise BankChurnException(f"Error in SchemaPreprocessor.partial_fit: {str(e)}", sys) from e
+
+
+    def finalize_fit(self) -> "SchemaPreprocessor":
+        """
+        Turn the accumulated statistics into the fitted state (vocabularies, means, scales, feature names).
+        """
+        try:
+            if getattr(self, "_count", None) is None:
+                raise ValueError("partial_fit was not called")
+
+            self.vocabularies = {column: self._declared_categories.get(column) or sorted(self._observed_categories[column])
+                                 for column in self.label_columns + self.onehot_columns}
+
+            is_scaled = np.array([column in self.scaling_columns for column in self.numerical_columns], dtype=bool)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                std = np.where(self._count > 0, np.sqrt(self._m2 / self._count), 0.0)
+
+            self.means = self._mean.astype(np.float32)
+            self.centers = np.where(is_scaled, self._mean, 0.0).astype(np.float32)
+            self.scales = np.where(is_scaled & (std > 0), std, 1.0).astype(np.float32)
+
+            self.feature_names_out = (list(self.label_columns)
+                                      + [f"{column}_{category}" for column in self.onehot_columns
+                                         for category in self.vocabularies[column]]
+                                      + self.numerical_columns)
+            self.is_fitted = True
+
+            return self
+
+        except Exception as e:
+            raise BankChurnException(f"Error in SchemaPreprocessor.finalize_fit: {str(e)}", sys) from e
+
+
+    def fit(self, dataframe: DataFrame) -> "SchemaPreprocessor":
+        """
+        Learn the vocabularies of the encoded columns and the mean/standard deviation of the numerical columns.
+        Same statistics as feeding the rows chunk by chunk to `partial_fit`.
+
+        :param dataframe: Training data with the input columns.
+        :return: The fitted preprocessor.
+        """
+        return self.reset().partial_fit(dataframe).finalize_fit()
+
+
+    def transform(self, dataframe: DataFrame, out: np.ndarray = None) -> np.ndarray:
+        """
+        Transform a DataFrame into the float32 feature matrix.
+
+        :param dataframe: Data with the input columns.
+        :param out: Optional preallocated float32 array (n_rows x n_features_out) to write into,
+                    e.g. a slice of a memory-mapped file, in any memory layout.
+        :return: The feature matrix.
+        """
+        try:
+            if not self.is_fitted:
+                raise ValueError("SchemaPreprocessor is not fitted")
+
+            n_rows = len(dataframe)
+            if out is None:
+                out = np.empty((n_rows, len(self.feature_names_out)), dtype=np.float32)
+            elif out.shape != (n_rows, len(self.feature_names_out)):
+                raise ValueError(f"Output array has shape {out.shape}, expected {(n_rows, len(self.feature_names_out))}")
+
+            # Column wise work on whole contiguous arrays: category codes, missing values and scaling
+            label_codes = [self._codes(dataframe[column], self.vocabularies[column]) for column in self.label_columns]
+            onehot_codes = [self._codes(dataframe[column], self.vocabularies[column]).astype(np.intp)
+                            for column in self.onehot_columns]
+            numerical_values = [self._scaled_values(dataframe[column], i) for i, column in enumerate(self.numerical_columns)]
+
+            onehot_offsets = np.cumsum([len(self.label_columns)] + [len(self.vocabularies[column]) for column in self.onehot_columns])
+            numerical_offset = int(onehot_offsets[-1])
+
+            # Row blocks keep the output block in cache while its columns are filled
+            for start in range(0, n_rows, self.block_rows):
+                stop = min(start + self.block_rows, n_rows)
+                block = out[start:stop]
+
+                for i, codes in enumerate(label_codes):
+                    block[:, i] = codes[start:stop]
+
+                if onehot_codes:
+                    # Scatter the ones through (row, column) indices, which also works for non contiguous `out`
+                    block[:, len(self.label_columns):numerical_offset] = 0.0
+                    block_rows = np.arange(stop - start)
+                    for i, codes in enumerate(onehot_codes):
+                        block_codes = codes[start:stop]
+                        known = block_codes >= 0
+                        block[block_rows[known], onehot_offsets[i] + block_codes[known]] = 1.0
+
+                for i, values in enumerate(numerical_values):
+                    block[:, numerical_offset + i] = values[start:stop]
+
+            return out
+
+        except Exception as e:
+            raise BankChurnException(f"Error in SchemaPreprocessor.transform: {str(e)}", sys) from e
+
+
+    def fit_transform(self, dataframe: DataFrame) -> np.ndarray:
+        return self.fit(dataframe).transform(dataframe)
+
+
+    @property
+    def state_hash(self) -> str:
+        """
+        Hash of the fitted state. Feature matrices transformed by preprocessors with the same state hash
+        are consistent with each other (and with the models trained on them).
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(json.dumps({"features": self.feature_names_out,
+                                  "vocabularies": {column: [str(category) for category in vocabulary]
+                                                   for column, vocabulary in self.vocabularies.items()}}).encode())
+        for array in (self.means, self.centers, self.scales):
+            hasher.update(np.ascontiguousarray(array).tobytes())
+        return hasher.hexdigest()
+
+
+    def get_drift(self, dataframe: DataFrame) -> dict:
+        """
+        Distance of new rows from the fitted statistics, in the units the transformation works in:
+
+          - numerical columns : absolute shift of the mean, in fitted standard deviations
+          - encoded columns   : share of non-missing values outside the fitted vocabulary
+
+        :param dataframe: New rows with the input columns.
+        :return: Dict with the per-column drift and its maximum under "max_drift".
+        """
+        try:
+            if not self.is_fitted:
+                raise ValueError("SchemaPreprocessor is not fitted")
+
+            drift = {}
+            with np.errstate(invalid="ignore", divide="ignore"):
+                std = np.sqrt(self._m2 / self._count)
+            for i, column in enumerate(self.numerical_columns):
+                values = dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                if np.isnan(values).all():
+                    continue
+                shift = abs(np.nanmean(values) - self._mean[i])
+                drift[column] = float(shift / std[i]) if std[i] > 0 else (0.0 if shift == 0 else float("inf"))
+
+            for column in self.label_columns + self.onehot_columns:
+                present = dataframe[column].notna().to_numpy()
+                if present.any():
+                    codes = np.asarray(self._codes(dataframe[column], self.vocabularies[column]))
+                    drift[column] = float((codes[present] < 0).mean())
+
+            return {"columns": drift, "max_drift": max(drift.values(), default=0.0)}
+
+        except Exception as e:
+            raise BankChurnException(f"Error in SchemaPreprocessor.get_drift: {str(e)}", sys) from e
+
+
+    def transform_target(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Encode the target column as an int8 vector (textual labels are mapped with TARGET_MAPPING).
+        """
+        try:
+            target = dataframe[self.target_column]
+            if not (is_numeric_dtype(target) or is_bool_dtype(target)):
+                target = target.map(TARGET_MAPPING)
+
+            return target.to_numpy(dtype=np.int8)
+
+        except Exception as e:
+            raise BankChurnException(f"Error in SchemaPreprocessor.transform_target: {str(e)}", sys) from e
+
+
+
+
+class DataPreprocessing:
+    def __init__(self,
+                 data_ingestion_artifact: DataIngestionArtifact,
+                 data_preprocessing_config: DataPreprocessingConfig):
+        """
+        :param data_ingestion_artifact: Output reference of data ingestion artifact stage
+        :param data_preprocessing_config: configuration for data preprocessing
+        """
+        try:
+            logging.info("")
+            logging.info("- - - Started Data Preprocessing Stage: - - -")
+            logging.info("- "*50)
+
+            self.data_ingestion_artifact = data_ingestion_artifact
+            self.data_preprocessing_config = data_preprocessing_config
+            self._schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+
+        except Exception as e:
+            logging.error(f"Error in DataPreprocessing initialization: {str(e)}")
+            raise BankChurnException(f"Error during DataPreprocessing initialization: {str(e)}", sys) from e
+
+
+
+    def preprocess_in_memory(self, preprocessor: SchemaPreprocessor, feature_store: FeatureStore,
+                             metadata: dict) -> int:
+        """
+        Method Name :   preprocess_in_memory
+        Description :   This method loads the ingested data at once, fits the preprocessor and writes the
+                        feature matrix and the target to the feature store.
+
+        Output      :   Number of preprocessed rows.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            # Only the columns used by the preprocessor and the target are read
+            dataframe = read_data(self.data_ingestion_artifact.data_file_path,
+                                  columns=preprocessor.input_columns + [preprocessor.target_column])
+
+            features = preprocessor.fit_transform(dataframe)
+            self.log_unknown_codes(preprocessor, features)
+
+            feature_store.write(features, preprocessor.transform_target(dataframe),
+                                columns=preprocessor.feature_names_out, target_column=preprocessor.target_column,
+                                metadata={**metadata, "preprocessor_id": preprocessor.state_hash})
+
+            return len(features)
+
+        except Exception as e:
+            logging.error(f"Error in preprocess_in_memory: {str(e)}")
+            raise BankChurnException(f"Error in preprocess_in_memory: {str(e)}", sys) from e
+
+
+
+    def preprocess_in_chunks(self, preprocessor: SchemaPreprocessor, feature_store: FeatureStore,
+                             metadata: dict) -> int:
+        """
+        Method Name :   preprocess_in_chunks
+        Description :   This method preprocesses the ingested data in two streaming passes over chunks of
+                        `chunk_rows` rows, so memory stays bounded by the chunk size:
+
+                          1. partial_fit on every chunk (mergeable statistics), then finalize_fit
+                          2. transform every chunk into a reused buffer and append it to the feature store
+
+                        The fitted state and the output are the same as with preprocess_in_memory.
+
+        Output      :   Number of preprocessed rows.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_preprocessing_config
+            data_file_path = self.data_ingestion_artifact.data_file_path
+            columns = preprocessor.input_columns + [preprocessor.target_column]
+
+            # Pass 1: statistics
+            n_rows, n_chunks = 0, 0
+            preprocessor.reset()
+            for chunk in read_data_in_chunks(data_file_path, chunk_rows=config.chunk_rows, columns=columns):
+                preprocessor.partial_fit(chunk)
+                n_rows += len(chunk)
+                n_chunks += 1
+            preprocessor.finalize_fit()
+            logging.info(f"Fitted the preprocessor on {n_rows} rows in {n_chunks} chunks")
+
+            # Pass 2: transform every chunk into one reused buffer and append it to the feature store
+            n_features = len(preprocessor.feature_names_out)
+            buffer = np.empty((config.chunk_rows, n_features), dtype=np.float32)
+
+            # The store checks that exactly n_rows rows were appended (the ingested data could change between passes)
+            with feature_store.writer(n_rows=n_rows, columns=preprocessor.feature_names_out,
+                                      target_column=preprocessor.target_column,
+                                      metadata={**metadata, "preprocessor_id": preprocessor.state_hash}) as store_writer:
+                for chunk in read_data_in_chunks(data_file_path, chunk_rows=config.chunk_rows, columns=columns):
+                    if len(chunk) > len(buffer):
+                        buffer = np.empty((len(chunk), n_features), dtype=np.float32)
+
+                    features = preprocessor.transform(chunk, out=buffer[:len(chunk)])
+                    self.log_unknown_codes(preprocessor, features)
+                    store_writer.append(features, preprocessor.transform_target(chunk))
+
+            return n_rows
+
+        except Exception as e:
+            logging.error(f"Error in preprocess_in_chunks: {str(e)}")
+            raise BankChurnException(f"Error in preprocess_in_chunks: {str(e)}", sys) from e
+
+
+
+    def get_source_parts(self) -> Optional[List[list]]:
+        """
+        Method Name :   get_source_parts
+        Description :   Part files ([name, size]) of the ingested data. Incremental ingestion appends new rows
+                        as new part files of a columnar artifact directory, None for single-file artifacts.
+        """
+        data_file_path = self.data_ingestion_artifact.data_file_path
+        if not os.path.isdir(data_file_path):
+            return None
+        return [[name, os.path.getsize(os.path.join(data_file_path, name))]
+                for name in sorted(os.listdir(data_file_path)) if not name.startswith(".")]
+
+
+
+    def get_new_parts(self, feature_store: FeatureStore, source_parts: Optional[List[list]]) -> List[str]:
+        """
+        Method Name :   get_new_parts
+        Description :   This method returns the part files ingested since the feature store was written, when
+                        the store can be extended: incremental mode, a complete store and preprocessor object,
+                        and ingested parts that start with exactly the parts the store was built from.
+
+        Output      :   Names of the new part files, empty when the store has to be rebuilt.
+        """
+        config = self.data_preprocessing_config
+        if not (config.incremental and source_parts
+                and os.path.exists(config.manifest_file_path) and os.path.exists(config.preprocessor_object_file_path)):
+            return []
+
+        previous_parts = feature_store.manifest.get("source_parts")
+        if not previous_parts or source_parts[:len(previous_parts)] != previous_parts:
+            return []
+
+        return [name for name, _ in source_parts[len(previous_parts):]]
+
+
+
+    def preprocess_new_rows(self, preprocessor: SchemaPreprocessor, feature_store: FeatureStore,
+                            new_parts: List[str], metadata: dict) -> Optional[int]:
+        """
+        Method Name :   preprocess_new_rows
+        Description :   This method transforms only the rows of the new part files with the frozen preprocessor
+                        and appends them to the feature store. The preprocessor is not refitted: the rows
+                        already in the store, and the model trained on them, stay consistent with it. When the
+                        new rows drift further than `drift_threshold` from the fitted statistics, nothing is
+                        written and the caller rebuilds the store (full refit and retrain).
+
+        Output      :   Number of appended rows, None when the drift requires a rebuild.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_preprocessing_config
+            columns = preprocessor.input_columns + [preprocessor.target_column]
+
+            # The delta is small compared to the history, it is transformed at once
+            dataframe = pd.concat([read_data(os.path.join(self.data_ingestion_artifact.data_file_path, name), columns=columns)
+                                   for name in new_parts], ignore_index=True)
+
+            drift = preprocessor.get_drift(dataframe)
+            if drift["max_drift"] > config.drift_threshold:
+                drifted = {column: round(value, 4) for column, value in drift["columns"].items() if value > config.drift_threshold}
+                logging.warning(f"New rows drifted beyond {config.drift_threshold} ({drifted}), refitting the preprocessor")
+                return None
+
+            features = preprocessor.transform(dataframe)
+            self.log_unknown_codes(preprocessor, features)
+            feature_store.write(features, preprocessor.transform_target(dataframe),
+                                columns=preprocessor.feature_names_out, target_column=preprocessor.target_column,
+                                metadata={**metadata, "preprocessor_id": preprocessor.state_hash,
+                                          "drift": round(drift["max_drift"], 6)},
+                                append=True)
+            logging.info(f"Appended {len(dataframe)} new rows from {len(new_parts)} part files "
+                         f"(max drift {drift['max_drift']:.4f})")
+
+            return len(dataframe)
+
+        except Exception as e:
+            logging.error(f"Error in preprocess_new_rows: {str(e)}")
+            raise BankChurnException(f"Error in preprocess_new_rows: {str(e)}", sys) from e
+
+
+
+    @staticmethod
+    def log_unknown_codes(preprocessor: SchemaPreprocessor, features: np.ndarray) -> None:
+        unknown_codes = int((features[:, :len(preprocessor.label_columns)] < 0).sum())
+        if unknown_codes:
+            logging.warning(f"{unknown_codes} label encoded values are unknown or missing (encoded as -1)")
+
+
+
+    def initiate_data_preprocessing(self) -> DataPreprocessingArtifact:
+        """
+        Method Name :   initiate_data_preprocessing
+        Description :   This method fits the schema driven preprocessor on the ingested data, writes the
+                        float32 feature matrix and the int8 target to the memory-mapped feature store
+                        (X.npy, y.npy and a column manifest) and saves the fitted preprocessor object.
+                        The data is streamed in chunks unless `chunk_rows` is 0.
+
+                        In incremental mode, rows ingested since the last run are transformed with the saved
+                        preprocessor and appended to the store, unless they drifted (see preprocess_new_rows).
+
+        Output      :   Returns the data preprocessing artifact.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered initiate_data_preprocessing method of DataPreprocessing class")
+
+        try:
+            config = self.data_preprocessing_config
+            feature_store = FeatureStore(features_file_path=config.features_file_path,
+                                         target_file_path=config.target_file_path,
+                                         manifest_file_path=config.manifest_file_path)
+
+            source_parts = self.get_source_parts()
+            metadata = {"source_parts": source_parts}
+
+            n_rows = None
+            new_parts = self.get_new_parts(feature_store, source_parts)
+            if new_parts:
+                preprocessor = load_object(file_path=config.preprocessor_object_file_path)
+                n_rows = self.preprocess_new_rows(preprocessor, feature_store, new_parts, metadata)
+
+            if n_rows is None:
+                preprocessor = SchemaPreprocessor(self._schema_config, block_rows=config.block_rows)
+                logging.info(f"Preprocessing: label encoding {preprocessor.label_columns}, "
+                             f"one-hot encoding {preprocessor.onehot_columns}, scaling {preprocessor.scaling_columns}, "
+                             f"passthrough {preprocessor.passthrough_columns}")
+
+                if config.chunk_rows:
+                    self.preprocess_in_chunks(preprocessor, feature_store, metadata)
+                else:
+                    self.preprocess_in_memory(preprocessor, feature_store, metadata)
+
+                save_object(file_path=config.preprocessor_object_file_path, obj=preprocessor)
+                logging.info(f"Saved the preprocessor to {config.preprocessor_object_file_path}")
+
+            logging.info(f"Feature matrix: ({len(feature_store)}, {len(preprocessor.feature_names_out)}) float32 "
+                         f"saved to {config.features_file_path}, fingerprint {feature_store.fingerprint}")
+
+            data_preprocessing_artifact = DataPreprocessingArtifact(features_file_path=config.features_file_path,
+                                                                    target_file_path=config.target_file_path,
+                                                                    manifest_file_path=config.manifest_file_path,
+                                                                    preprocessor_object_file_path=config.preprocessor_object_file_path)
+            logging.info(f"Data preprocessing artifact: {data_preprocessing_artifact}")
+
+            logging.info("Exited initiate_data_preprocessing method of DataPreprocessing class")
+            return data_preprocessing_artifact
+
+        except Exception as e:
+            logging.error(f"Error in initiate_data_preprocessing: {str(e)}")
+            raise BankChurnException(f"Error in initiate_data_preprocessing: {str(e)}", sys) from e
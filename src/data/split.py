@@ -0,0 +1,329 @@
+import os
+import sys
+import json
+import hashlib
+
+import numpy as np
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.entities.config_entity import DataSplitConfig
+from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
+                                               DataSplitArtifact)
+
+from src.core.utils.helpers import get_split_indices, read_json, write_json
+from src.core.utils.feature_store import FeatureStore
+
+from src.core.constants.data import (DATA_SPLIT_TRAIN_FILE,
+                                     DATA_SPLIT_TEST_FILE,
+                                     DATA_SPLIT_TUNE_FILE,
+                                     DATA_SPLIT_FOLDS_FILE,
+                                     DATA_SPLIT_MANIFEST_FILE)
+
+
+
+
+class DataSplit:
+    """
+    Class Name :   DataSplit
+    Description :   Splits the feature store into seeded, stratified train/test/tune sets and k folds. The splits
+                    are persisted as compact index arrays (int32 row indices into the feature store, one int8
+                    fold id per training row) instead of copies of the data. They are stored in a directory per
+                    split id, a hash of the dataset fingerprint and the split parameters, and reused as long as
+                    the same data is split the same way, so downstream stages can cache on the split id.
+
+                    When rows were appended to the feature store, the split of the base store is extended
+                    instead of recomputed: existing rows keep their set and fold (a model updated with the new
+                    rows never sees former test rows) and only the new rows are assigned.
+
+    Output      :   Data split artifact (index files and manifest)
+    On Failure  :   Write an exception log and then raise an exception
+    """
+
+    def __init__(self,
+                 data_preprocessing_artifact: DataPreprocessingArtifact,
+                 data_split_config: DataSplitConfig):
+        """
+        :param data_preprocessing_artifact: Output reference of data preprocessing artifact stage
+        :param data_split_config: configuration for data split
+        """
+        try:
+            logging.info("")
+            logging.info("- - - Started Data Split Stage: - - -")
+            logging.info("- "*50)
+
+            self.data_preprocessing_artifact = data_preprocessing_artifact
+            self.data_split_config = data_split_config
+            self.feature_store = FeatureStore.from_artifact(data_preprocessing_artifact)
+
+        except Exception as e:
+            logging.error(f"Error in DataSplit initialization: {str(e)}")
+            raise BankChurnException(f"Error during DataSplit initialization: {str(e)}", sys) from e
+
+
+
+    def get_split_parameters(self) -> dict:
+        config = self.data_split_config
+        return {"test_size": config.test_size,
+                "tune_size": config.tune_size,
+                "n_folds": config.n_folds,
+                "random_state": config.random_state}
+
+
+
+    def get_split_id(self, dataset_fingerprint: Optional[str] = None) -> str:
+        """
+        Method Name :   get_split_id
+        Description :   Identity of the split: the same dataset split with the same parameters always gets
+                        the same id (and the same indices).
+
+        Output      :   16 hex characters
+        """
+        key = {"dataset": dataset_fingerprint or self.feature_store.fingerprint, "parameters": self.get_split_parameters()}
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+
+    def get_split_artifact(self, split_id: str) -> DataSplitArtifact:
+        split_dir = os.path.join(self.data_split_config.splitted_data_dir, split_id)
+        return DataSplitArtifact(split_id=split_id,
+                                 train_indices_file_path=os.path.join(split_dir, DATA_SPLIT_TRAIN_FILE),
+                                 test_indices_file_path=os.path.join(split_dir, DATA_SPLIT_TEST_FILE),
+                                 tune_indices_file_path=os.path.join(split_dir, DATA_SPLIT_TUNE_FILE),
+                                 folds_file_path=os.path.join(split_dir, DATA_SPLIT_FOLDS_FILE),
+                                 manifest_file_path=os.path.join(split_dir, DATA_SPLIT_MANIFEST_FILE))
+
+
+
+    def compute_split(self) -> dict:
+        """
+        Method Name :   compute_split
+        Description :   This method computes the split from the target vector alone (the feature matrix is
+                        never read):
+
+                          - test  : `test_size` of all rows, stratified on the target
+                          - train : the remaining rows
+                          - tune  : `tune_size` of the training rows, stratified (hyperparameter search)
+                          - folds : stratified k-fold id of every training row
+
+                        Every step is seeded with `random_state`.
+
+        Output      :   dict of index arrays (train, test, tune, folds)
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            from sklearn.model_selection import StratifiedKFold
+
+            config = self.data_split_config
+            if config.n_folds < 2:
+                raise ValueError(f"n_folds must be at least 2, got {config.n_folds}")
+
+            target = np.asarray(self.feature_store.target)
+            index_dtype = np.int32 if len(target) < np.iinfo(np.int32).max else np.int64
+
+            train_indices, test_indices = get_split_indices(target, test_size=config.test_size,
+                                                            stratify=True, random_state=config.random_state)
+            train_target = target[train_indices]
+
+            if config.tune_size:
+                _, tune_positions = get_split_indices(train_target, test_size=config.tune_size,
+                                                      stratify=True, random_state=config.random_state)
+                tune_indices = train_indices[tune_positions]
+            else:
+                tune_indices = np.empty(0, dtype=index_dtype)
+
+            folds = np.empty(len(train_indices), dtype=np.int8)
+            k_fold = StratifiedKFold(n_splits=config.n_folds, shuffle=True, random_state=config.random_state)
+            for fold, (_, validation_positions) in enumerate(k_fold.split(np.zeros(len(train_indices)), train_target)):
+                folds[validation_positions] = fold
+
+            return {"train": train_indices.astype(index_dtype),
+                    "test": test_indices.astype(index_dtype),
+                    "tune": tune_indices.astype(index_dtype),
+                    "folds": folds}
+
+        except Exception as e:
+            logging.error(f"Error in compute_split: {str(e)}")
+            raise BankChurnException(f"Error in compute_split: {str(e)}", sys) from e
+
+
+
+    def get_base_split(self) -> Optional[DataSplitArtifact]:
+        """
+        Method Name :   get_base_split
+        Description :   Saved split of the store the current feature store was appended to, if any.
+        """
+        base = self.feature_store.manifest.get("base")
+        if not base:
+            return None
+        base_split_artifact = self.get_split_artifact(self.get_split_id(base["fingerprint"]))
+        return base_split_artifact if self.is_split_saved(base_split_artifact) else None
+
+
+
+    def extend_split(self, base_split_artifact: DataSplitArtifact) -> dict:
+        """
+        Method Name :   extend_split
+        Description :   This method keeps the base split and assigns the appended rows class by class: a seeded
+                        shuffle of the new rows of each class puts `test_size` of them in the test set, then
+                        `tune_size` of the remaining training rows in the tuning set, and deals the training
+                        rows round-robin over the folds. Proportions hold for any number of new rows.
+
+        Output      :   dict of index arrays (train, test, tune, folds)
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_split_config
+            base_rows = int(self.feature_store.manifest["base"]["n_rows"])
+            target = np.asarray(self.feature_store.target)
+            rng = np.random.default_rng([config.random_state, base_rows])
+
+            new_train, new_test, new_tune, new_folds = [], [], [], []
+            new_rows = np.arange(base_rows, len(target), dtype=np.int64)
+            for label in np.unique(target[base_rows:]):
+                rows = rng.permutation(new_rows[target[base_rows:] == label])
+                n_test = int(round(len(rows) * config.test_size))
+                train_rows = rows[n_test:]
+                new_test.append(rows[:n_test])
+                new_train.append(train_rows)
+                new_tune.append(train_rows[:int(round(len(train_rows) * config.tune_size))])
+                new_folds.append((np.arange(len(train_rows)) + rng.integers(config.n_folds)) % config.n_folds)
+
+            # New rows come after the base rows, the concatenated index arrays stay sorted
+            new_train = np.concatenate(new_train) if new_train else np.empty(0, dtype=np.int64)
+            order = np.argsort(new_train, kind="stable")
+            base = {name: np.asarray(self.load_indices(base_split_artifact, name)) for name in ("train", "test", "tune")}
+            index_dtype = base["train"].dtype
+
+            return {"train": np.concatenate([base["train"], new_train[order]]).astype(index_dtype),
+                    "test": np.concatenate([base["test"], np.sort(np.concatenate(new_test or [new_rows[:0]]))]).astype(index_dtype),
+                    "tune": np.concatenate([base["tune"], np.sort(np.concatenate(new_tune or [new_rows[:0]]))]).astype(index_dtype),
+                    "folds": np.concatenate([np.load(base_split_artifact.folds_file_path),
+                                             np.concatenate(new_folds or [new_rows[:0]])[order].astype(np.int8)])}
+
+        except Exception as e:
+            logging.error(f"Error in extend_split: {str(e)}")
+            raise BankChurnException(f"Error in extend_split: {str(e)}", sys) from e
+
+
+
+    def is_split_saved(self, data_split_artifact: DataSplitArtifact) -> bool:
+        if not os.path.exists(data_split_artifact.manifest_file_path):
+            return False
+        manifest = read_json(file_path=data_split_artifact.manifest_file_path)
+        return (manifest.get("split_id") == data_split_artifact.split_id
+                and all(os.path.exists(file_path) for file_path in (data_split_artifact.train_indices_file_path,
+                                                                    data_split_artifact.test_indices_file_path,
+                                                                    data_split_artifact.tune_indices_file_path,
+                                                                    data_split_artifact.folds_file_path)))
+
+
+
+    def save_split(self, data_split_artifact: DataSplitArtifact, split: dict,
+                   base_split_artifact: Optional[DataSplitArtifact] = None) -> None:
+        """
+        Method Name :   save_split
+        Description :   This method writes the index arrays, then the manifest (written last, it marks the
+                        split as complete).
+        """
+        try:
+            os.makedirs(os.path.dirname(data_split_artifact.manifest_file_path), exist_ok=True)
+            np.save(data_split_artifact.train_indices_file_path, split["train"])
+            np.save(data_split_artifact.test_indices_file_path, split["test"])
+            np.save(data_split_artifact.tune_indices_file_path, split["tune"])
+            np.save(data_split_artifact.folds_file_path, split["folds"])
+
+            target = np.asarray(self.feature_store.target)
+            write_json(file_path=data_split_artifact.manifest_file_path,
+                       data={"split_id": data_split_artifact.split_id,
+                             "dataset_fingerprint": self.feature_store.fingerprint,
+                             "base_split_id": base_split_artifact.split_id if base_split_artifact else None,
+                             "parameters": self.get_split_parameters(),
+                             "created_at": datetime.now().isoformat(timespec="seconds"),
+                             "n_rows": len(target),
+                             "sizes": {name: int(len(indices)) for name, indices in split.items() if name != "folds"},
+                             "positive_rate": {name: round(float(target[split[name]].mean()), 6) if len(split[name]) else None
+                                               for name in ("train", "test", "tune")}},
+                       replace=True)
+
+        except Exception as e:
+            logging.error(f"Error in save_split: {str(e)}")
+            raise BankChurnException(f"Error in save_split: {str(e)}", sys) from e
+
+
+
+    @staticmethod
+    def load_indices(data_split_artifact: DataSplitArtifact, name: str) -> np.ndarray:
+        """
+        Method Name :   load_indices
+        Description :   Memory-mapped row indices of a split ("train", "test" or "tune"), to be passed to
+                        FeatureStore.get_split.
+        """
+        file_paths = {"train": data_split_artifact.train_indices_file_path,
+                      "test": data_split_artifact.test_indices_file_path,
+                      "tune": data_split_artifact.tune_indices_file_path}
+        try:
+            return np.load(file_paths[name], mmap_mode="r")
+        except Exception as e:
+            raise BankChurnException(f"Error loading the {name} split indices: {str(e)}", sys) from e
+
+
+
+    @staticmethod
+    def iter_folds(data_split_artifact: DataSplitArtifact) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Method Name :   iter_folds
+        Description :   Yields (fit_indices, validation_indices) feature store row indices for every fold.
+        """
+        try:
+            train_indices = np.load(data_split_artifact.train_indices_file_path)
+            folds = np.load(data_split_artifact.folds_file_path)
+            for fold in range(int(folds.max()) + 1 if len(folds) else 0):
+                in_fold = folds == fold
+                yield train_indices[~in_fold], train_indices[in_fold]
+
+        except Exception as e:
+            raise BankChurnException(f"Error iterating over the split folds: {str(e)}", sys) from e
+
+
+
+    def initiate_data_split(self) -> DataSplitArtifact:
+        """
+        Method Name :   initiate_data_split
+        Description :   This method returns the split of the current feature store, computing (or extending
+                        the split of the base store) and saving it only when no split with the same id
+                        (dataset fingerprint and parameters) exists.
+
+        Output      :   Returns the data split artifact.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered initiate_data_split method of DataSplit class")
+
+        try:
+            split_id = self.get_split_id()
+            data_split_artifact = self.get_split_artifact(split_id)
+
+            if self.is_split_saved(data_split_artifact):
+                logging.info(f"Reusing split {split_id} of dataset {self.feature_store.fingerprint}")
+            else:
+                base_split_artifact = self.get_base_split()
+                if base_split_artifact:
+                    logging.info(f"Extending split {base_split_artifact.split_id} with the appended rows")
+                    split = self.extend_split(base_split_artifact)
+                else:
+                    split = self.compute_split()
+                self.save_split(data_split_artifact, split, base_split_artifact)
+                logging.info(f"Saved split {split_id}: {len(split['train'])} train, {len(split['test'])} test, "
+                             f"{len(split['tune'])} tune rows and {self.data_split_config.n_folds} folds")
+
+            logging.info(f"Data split artifact: {data_split_artifact}")
+            logging.info("Exited initiate_data_split method of DataSplit class")
+
+            return data_split_artifact
+
+        except Exception as e:
+            logging.error(f"Error in initiate_data_split: {str(e)}")
+            raise BankChurnException(f"Error in initiate_data_split: {str(e)}", sys) from e
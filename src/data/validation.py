@@ -1,19 +1,23 @@
+import os
 import sys
-import json
 
+import numpy as np
+from datetime import datetime
+from typing import Optional
 from pandas import DataFrame
-
-from evidently.model_profile import Profile
-from evidently.model_profile.sections import DataDriftProfileSection
+from pandas.api.types import (is_bool_dtype, is_numeric_dtype,
+                              is_integer_dtype)
 
 from src.core.logger import logging
 from src.core.exception import BankChurnException
+from src.mlops.drift import DriftDetector
 
 from src.core.entities.config_entity import DataValidationConfig
 from src.core.entities.artifact_entity import (DataIngestionArtifact,
                                                DataValidationArtifact)
 
-from src.core.utils.helpers import (read_data, read_yaml, write_yaml,
+from src.core.utils.helpers import (read_data, read_data_columns, read_data_tail, read_yaml, write_yaml,
+                                    read_json, write_json, get_file_hash,
                                     train_test_split_for_data_validation)
 
 from src.core.constants.common import (SCHEMA_FILE_PATH,
@@ -22,6 +26,153 @@ from src.core.constants.common import (SCHEMA_FILE_PATH,
 
 
 
+class SchemaValidator:
+    """
+    Class Name :   SchemaValidator
+    Description :   Compiles the `features` block of settings/schema.yaml once into set based column lookups,
+                    range vectors and category arrays, then validates a DataFrame in a single vectorized pass:
+                    column presence, declared type, null counts, numeric ranges (min/max), integrality and
+                    allowed categories. Insignificant columns are not required.
+
+    Output      :   Structured report (dict) with an overall status and per-column results
+    On Failure  :   Raises an exception
+    """
+
+    NUMERIC_TYPES = {"integer", "float"}
+
+    def __init__(self, schema_config: dict):
+        try:
+            features = schema_config.get("features", {}) or {}
+            insignificant_columns = set(schema_config.get("insignificant_columns", []) or [])
+
+            self.features = {column: spec for column, spec in features.items() if column not in insignificant_columns}
+            self.required_columns = list(self.features)
+            self._required_columns = set(self.required_columns)
+
+            self.numerical_columns = [column for column, spec in self.features.items() if spec.get("type") in self.NUMERIC_TYPES]
+            self.categorical_columns = [column for column in self.required_columns if column not in self.numerical_columns]
+
+            # Range vectors aligned with numerical_columns (unbounded sides are +/- inf)
+            self._min_values = np.array([self.features[column].get("min", -np.inf) for column in self.numerical_columns], dtype=np.float64)
+            self._max_values = np.array([self.features[column].get("max", np.inf) for column in self.numerical_columns], dtype=np.float64)
+            self._is_integer = np.array([self.features[column].get("type") == "integer" for column in self.numerical_columns], dtype=bool)
+
+            self._categories = {column: np.array(spec["categories"], dtype=object)
+                                for column, spec in self.features.items() if spec.get("categories")}
+            self._nullable = {column: bool(spec.get("nullable", False)) for column, spec in self.features.items()}
+
+        except Exception as e:
+            raise BankChurnException(f"Error compiling schema: {str(e)}", sys) from e
+
+
+    def get_missing_columns(self, columns, required_columns=None) -> list:
+        """
+        Returns the required (or given) columns that are not in `columns`, using a set lookup.
+        """
+        columns = set(columns)
+        return [column for column in (required_columns if required_columns is not None else self.required_columns)
+                if column not in columns]
+
+
+    def _is_type_valid(self, dataframe: DataFrame, column: str) -> bool:
+        series_dtype = dataframe[column].dtype
+        declared_type = self.features[column].get("type")
+
+        if declared_type in self.NUMERIC_TYPES:
+            return is_numeric_dtype(series_dtype) and not is_bool_dtype(series_dtype)
+        if declared_type == "boolean":
+            # Booleans may also be stored as 0/1 integers, values are checked separately
+            return is_bool_dtype(series_dtype) or is_integer_dtype(series_dtype)
+        return not is_numeric_dtype(series_dtype)
+
+
+    def validate(self, dataframe: DataFrame) -> dict:
+        """
+        Validates the DataFrame against the compiled schema.
+
+        :param dataframe: DataFrame to validate.
+        :return: Report with `status`, `n_rows`, `missing_columns`, `unexpected_columns` and per-column
+                 `dtype`, `type_valid`, `null_count` and, where declared, `below_min`/`above_max`/`non_integer`
+                 or `unknown_categories` counts.
+        """
+        try:
+            columns = set(dataframe.columns)
+            missing_columns = self.get_missing_columns(columns)
+            report_columns = {}
+
+            present_columns = [column for column in self.required_columns if column in columns]
+            for column in present_columns:
+                report_columns[column] = {"dtype": str(dataframe[column].dtype),
+                                          "type_valid": self._is_type_valid(dataframe, column)}
+
+            # Numerical columns: one float64 block, every check is a column-wise reduction
+            numeric_index = [i for i, column in enumerate(self.numerical_columns)
+                             if column in columns and report_columns[column]["type_valid"]]
+            if numeric_index:
+                numeric_columns = [self.numerical_columns[i] for i in numeric_index]
+                block = dataframe[numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+                is_null = np.isnan(block)
+                null_counts = is_null.sum(axis=0)
+                below_min = (block < self._min_values[numeric_index]).sum(axis=0)
+                above_max = (block > self._max_values[numeric_index]).sum(axis=0)
+
+                # Integrality is only checked on integer columns stored as floats
+                non_integer = np.zeros(len(numeric_index), dtype=np.int64)
+                is_integer = self._is_integer[numeric_index] & np.array([dataframe[column].dtype.kind == "f" for column in numeric_columns])
+                if is_integer.any():
+                    integer_block = block[:, is_integer]
+                    non_integer[is_integer] = (integer_block != np.trunc(integer_block)).sum(axis=0) - is_null[:, is_integer].sum(axis=0)
+
+                for j, column in enumerate(numeric_columns):
+                    report_columns[column].update(null_count=int(null_counts[j]),
+                                                  below_min=int(below_min[j]),
+                                                  above_max=int(above_max[j]),
+                                                  non_integer=int(non_integer[j]))
+
+            # Categorical and boolean columns: vectorized null and membership checks
+            for column in self.categorical_columns:
+                if column not in columns or not report_columns[column]["type_valid"]:
+                    continue
+
+                series = dataframe[column]
+                is_null = series.isna()
+                report_columns[column]["null_count"] = int(is_null.sum())
+
+                if column in self._categories:
+                    allowed_values = self._categories[column]
+                elif self.features[column].get("type") == "boolean" and not is_bool_dtype(series.dtype):
+                    allowed_values = np.array([0, 1])
+                else:
+                    continue
+
+                unknown = ~(series.isin(allowed_values) | is_null)
+                report_columns[column]["unknown_categories"] = sorted(map(str, series[unknown].unique()))[:20]
+                report_columns[column]["unknown_count"] = int(unknown.sum())
+
+            # Consolidate column status
+            for column, result in report_columns.items():
+                result["valid"] = bool(result["type_valid"]
+                                       and (self._nullable[column] or result.get("null_count", 0) == 0)
+                                       and result.get("below_min", 0) == 0
+                                       and result.get("above_max", 0) == 0
+                                       and result.get("non_integer", 0) == 0
+                                       and result.get("unknown_count", 0) == 0)
+
+            return {
+                "status": not missing_columns and all(result["valid"] for result in report_columns.values()),
+                "n_rows": int(len(dataframe)),
+                "missing_columns": missing_columns,
+                "unexpected_columns": [column for column in dataframe.columns if column not in self._required_columns],
+                "columns": report_columns,
+            }
+
+        except Exception as e:
+            raise BankChurnException(f"Error in schema validation: {str(e)}", sys) from e
+
+
+
+
 class DataValidation:
     def __init__(self, 
                  data_ingestion_artifact: DataIngestionArtifact, 
@@ -38,6 +189,8 @@ class DataValidation:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
             self._schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+            self._schema_validator = SchemaValidator(self._schema_config)
+            self._drift_detector = DriftDetector(self._schema_config)
         
         except Exception as e:
             logging.error(f"Error in DataValidation initialization: {str(e)}")
@@ -50,19 +203,12 @@ class DataValidation:
         matches the schema configuration. Logs missing columns for better traceability.
         """
         try:
-            # Retrieve schema and insignificant columns from the configuration
-            numerical_columns = self._schema_config.get("numerical_columns", [])
-            categorical_columns = self._schema_config.get("categorical_columns", [])
-            insignificant_columns = self._schema_config.get("insignificant_columns", [])
-            
-            
-            # Combine numerical and categorical columns into required columns
-            required_columns = numerical_columns + categorical_columns
-            required_columns = [col for col in required_columns if col not in insignificant_columns]
+            # Required columns are compiled once from the schema (excluding insignificant columns)
+            required_columns = self._schema_validator.required_columns
 
             
             # Identify any missing columns
-            missing_columns = [col for col in required_columns if col not in dataframe.columns]
+            missing_columns = self._schema_validator.get_missing_columns(dataframe.columns)
             
 
             # Validation status
@@ -96,25 +242,16 @@ class DataValidation:
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            dataframe_columns = df.columns
-            missing_numerical_columns = []
-            missing_categorical_columns = []
-            
-            
-            for column in self._schema_config.get("numerical_columns",[]):
-                if column not in dataframe_columns:
-                    missing_numerical_columns.append(column)
+            missing_numerical_columns = self._schema_validator.get_missing_columns(
+                df.columns, self._schema_validator.numerical_columns)
+            missing_categorical_columns = self._schema_validator.get_missing_columns(
+                df.columns, self._schema_validator.categorical_columns)
 
             
             if len(missing_numerical_columns)>0:
                 logging.info(f"Missing numerical column: {missing_numerical_columns}")
 
 
-            for column in self._schema_config.get("categorical_columns", []):
-                if column not in dataframe_columns:
-                    missing_categorical_columns.append(column)
-
-
             if len(missing_categorical_columns)>0:
                 logging.info(f"Missing categorical column: {missing_categorical_columns}")
 
@@ -127,32 +264,117 @@ class DataValidation:
 
 
 
-    def detect_dataset_drift(self, reference_df: DataFrame, current_df: DataFrame, ) -> bool:
+    def validate_schema(self, dataframe: DataFrame) -> bool:
         """
-        Method Name :   detect_dataset_drift
-        Description :   This method validates if drift is detected
+        Method Name :   validate_schema
+        Description :   This method validates declared types, null counts, numeric ranges and allowed categories
+                        of every schema column in one vectorized pass and saves the structured report.
         
         Output      :   Returns bool value based on validation results
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            data_drift_profile = Profile(sections=[DataDriftProfileSection()])
-            data_drift_profile.calculate(reference_df, current_df)
+            report = self._schema_validator.validate(dataframe)
+            write_yaml(file_path=self.data_validation_config.schema_report_file_path, data=report, replace=True)
+
 
+            invalid_columns = [column for column, result in report["columns"].items() if not result["valid"]]
+            if invalid_columns:
+                logging.error(f"Schema validation failed for columns: {invalid_columns}")
+                for column in invalid_columns:
+                    logging.info(f"{column}: {report['columns'][column]}")
 
-            report = data_drift_profile.json()
-            json_report = json.loads(report)
 
+            return report["status"]
 
-            write_yaml(file_path=self.data_validation_config.validation_report_file_path, data=json_report)
+        except Exception as e:
+            logging.error(f"Error in validate_schema: {str(e)}")
+            raise BankChurnException(f"Error in validate_schema: {str(e)}", sys) from e
 
 
-            n_features = json_report["data_drift"]["data"]["metrics"]["n_features"]
-            n_drifted_features = json_report["data_drift"]["data"]["metrics"]["n_drifted_features"]
+
+    def get_reference_profile(self, schema_hash: str) -> Optional[dict]:
+        """
+        Method Name :   get_reference_profile
+        Description :   This method loads the persisted reference profile (per-feature quantile bins and category
+                        frequency tables of the training snapshot). Nothing is returned when the profile does not
+                        exist, was built for another schema or a refresh is requested.
+        
+        Output      :   Returns the reference profile or None
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            reference_profile_file_path = self.data_validation_config.reference_profile_file_path
+
+            if self.data_validation_config.refresh_reference_profile or not os.path.exists(reference_profile_file_path):
+                return None
+
+            reference_profile = read_json(file_path=reference_profile_file_path)
+            if reference_profile.get("schema_hash") != schema_hash:
+                logging.info("Schema changed since the reference profile was built, rebuilding it.")
+                return None
+
+            logging.info(f"Loaded reference profile built on {reference_profile['created_at']} "
+                         f"from {reference_profile['n_rows']} rows.")
+            return reference_profile["features"]
+
+        except Exception as e:
+            logging.error(f"Error in get_reference_profile: {str(e)}")
+            raise BankChurnException(f"Error in get_reference_profile: {str(e)}", sys) from e
+
+
+
+    def save_reference_profile(self, reference_df: DataFrame, schema_hash: str) -> dict:
+        """
+        Method Name :   save_reference_profile
+        Description :   This method summarises the reference (training) snapshot into a compact profile and
+                        saves it under the validation reports directory, so later batches are checked against
+                        it without reloading the reference dataset.
+        
+        Output      :   Returns the reference profile
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            reference_profile = self._drift_detector.build_profile(reference_df)
+
+            write_json(file_path=self.data_validation_config.reference_profile_file_path,
+                       data={"schema_hash": schema_hash,
+                             "created_at": datetime.now().isoformat(timespec="seconds"),
+                             "n_rows": int(len(reference_df)),
+                             "features": reference_profile},
+                       replace=True)
+            logging.info(f"Saved reference profile of {len(reference_df)} rows to "
+                         f"{self.data_validation_config.reference_profile_file_path}")
+
+            return reference_profile
+
+        except Exception as e:
+            logging.error(f"Error in save_reference_profile: {str(e)}")
+            raise BankChurnException(f"Error in save_reference_profile: {str(e)}", sys) from e
+
+
+
+    def detect_dataset_drift(self, reference_profile: dict, current_df: DataFrame) -> bool:
+        """
+        Method Name :   detect_dataset_drift
+        Description :   This method validates if drift is detected between the reference profile and the current data
+        
+        Output      :   Returns bool value based on validation results
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            report = self._drift_detector.compare(reference_profile, current_df)
+
+
+            write_yaml(file_path=self.data_validation_config.validation_report_file_path, data=report, replace=True)
+
+
+            n_features = report["n_features"]
+            n_drifted_features = report["n_drifted_features"]
 
 
             logging.info(f"{n_drifted_features}/{n_features} drift detected.")
-            drift_status = json_report["data_drift"]["data"]["metrics"]["dataset_drift"]
+            drift_status = report["dataset_drift"]
 
             return drift_status
 
@@ -175,9 +397,25 @@ class DataValidation:
             logging.info("Starting data validation process.")
 
 
-            # Reading dataset
-            df = read_data(file_path=self.data_ingestion_artifact.data_file_path)
-            logging.info("Training and testing datasets loaded successfully.")
+            # Reading dataset, loading only the columns declared in the schema
+            data_file_path = self.data_ingestion_artifact.data_file_path
+            insignificant_columns = self._schema_config.get("insignificant_columns", []) or []
+            available_columns = set(read_data_columns(file_path=data_file_path))
+            columns = [col for col in self._schema_config.get("features", {})
+                       if col in available_columns and col not in insignificant_columns]
+
+            # With a reference profile only the rows ingested by this run are validated and compared with
+            # it (earlier increments were validated by earlier runs); the first run reads the whole artifact
+            schema_hash = get_file_hash(SCHEMA_FILE_PATH)
+            reference_profile = self.get_reference_profile(schema_hash=schema_hash)
+            new_rows = self.data_ingestion_artifact.new_rows
+
+            if reference_profile is not None and new_rows is not None:
+                df = read_data_tail(file_path=data_file_path, n_rows=new_rows, columns=columns)
+                logging.info(f"Loaded the {len(df)} rows ingested by this run.")
+            else:
+                df = read_data(file_path=data_file_path, columns=columns)
+                logging.info(f"Loaded the whole dataset ({len(df)} rows).")
 
 
             # Step 1: Validate number of columns in training and testing datasets
@@ -194,24 +432,38 @@ class DataValidation:
                 validation_error_msg += "Required or insignificant columns validation failed for dataframe.\n"
 
 
-            # Consolidate validation status
-            validation_status = len(validation_error_msg) == 0
+            # Step 3: Validate types, nulls, ranges and categories against the schema
+            status = self.validate_schema(dataframe=df)
+            logging.info(f"Validation of column types and values in dataframe: {status}")
+            if not status:
+                validation_error_msg += "Column types or values do not match the schema.\n"
 
 
-            # Step 3: Split dataset into training and testing datasets
-            train_df, test_df = train_test_split_for_data_validation(dataframe=df, test_size=VALIDATION_REPORT_SPLIT_RATIO)
+            # Consolidate validation status
+            validation_status = len(validation_error_msg) == 0
 
 
             # Step 4: Detect dataset drift if validation passes
             if validation_status:
-                drift_status = self.detect_dataset_drift(train_df, test_df)
+                if reference_profile is None:
+                    # No stored reference yet: the training split becomes the reference snapshot
+                    train_df, current_df = train_test_split_for_data_validation(dataframe=df, test_size=VALIDATION_REPORT_SPLIT_RATIO)
+                    reference_profile = self.save_reference_profile(reference_df=train_df, schema_hash=schema_hash)
+                else:
+                    current_df = df
+
+                if current_df.empty:
+                    logging.info("No new rows ingested, skipping the drift check.")
+                    drift_status = False
+                else:
+                    drift_status = self.detect_dataset_drift(reference_profile, current_df)
 
                 if drift_status:
-                    logging.warning("Drift detected between training and testing datasets.")
-                    validation_error_msg += "Drift detected between training and testing datasets.\n"
+                    logging.warning("Drift detected between reference and current datasets.")
+                    validation_error_msg += "Drift detected between reference and current datasets.\n"
 
-                else:
-                    logging.info("No drift detected between training and testing datasets.")
+                elif not current_df.empty:
+                    logging.info(f"No drift detected between reference and current datasets ({len(current_df)} rows).")
 
             else:
                 logging.warning(f"Validation failed with the following errors: {validation_error_msg}")
@@ -222,6 +474,8 @@ class DataValidation:
                 validation_status=validation_status,
                 message=validation_error_msg.strip(),
                 validation_report_file_path=self.data_validation_config.validation_report_file_path,
+                schema_report_file_path=self.data_validation_config.schema_report_file_path,
+                reference_profile_file_path=self.data_validation_config.reference_profile_file_path,
             )
             logging.info(f"Data validation artifact: {data_validation_artifact}")
 
@@ -0,0 +1,239 @@
+# Native data drift engine (replaces the evidently DataDriftProfileSection)
+
+import sys
+import math
+
+import numpy as np
+from pandas import DataFrame
+
+from src.core.exception import BankChurnException
+
+from src.core.constants.data import (DATA_VALIDATION_DRIFT_BINS,
+                                     DATA_VALIDATION_DRIFT_P_VALUE,
+                                     DATA_VALIDATION_DRIFT_SHARE)
+
+
+
+class DriftDetector:
+    """
+    Class Name :   DriftDetector
+    Description :   Detects data drift between a reference and a current dataset with per-feature statistical tests.
+                    The reference side is summarised once into a profile of histograms: numerical features keep
+                    their exact value counts (low cardinality) or `n_bins` quantile bin edges with counts, and
+                    categorical/boolean features keep a category frequency table. The current data is binned on
+                    the reference edges with numpy (searchsorted + bincount) and compared with:
+
+                      - numerical   : two-sample Kolmogorov-Smirnov test on the binned CDFs
+                      - categorical : chi-square test of homogeneity (PSI is reported as well)
+
+                    A feature drifts when its p-value is below `p_value_threshold`, the dataset drifts when the
+                    share of drifted features reaches `drift_share` (same defaults as evidently).
+
+    Output      :   Drift report with n_features, n_drifted_features, share_drifted_features, dataset_drift
+                    and per-feature results
+    On Failure  :   Raises an exception
+    """
+
+    NUMERICAL_TYPES = {"integer", "float"}
+
+    def __init__(self, schema_config: dict,
+                 n_bins: int = DATA_VALIDATION_DRIFT_BINS,
+                 p_value_threshold: float = DATA_VALIDATION_DRIFT_P_VALUE,
+                 drift_share: float = DATA_VALIDATION_DRIFT_SHARE):
+        try:
+            features = schema_config.get("features", {}) or {}
+            insignificant_columns = set(schema_config.get("insignificant_columns", []) or [])
+
+            self.feature_types = {column: "num" if spec.get("type") in self.NUMERICAL_TYPES else "cat"
+                                  for column, spec in features.items() if column not in insignificant_columns}
+            self.n_bins = n_bins
+            self.p_value_threshold = p_value_threshold
+            self.drift_share = drift_share
+
+        except Exception as e:
+            raise BankChurnException(f"Error initializing DriftDetector: {str(e)}", sys) from e
+
+
+    @staticmethod
+    def _numerical_values(dataframe: DataFrame, column: str) -> np.ndarray:
+        values = dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return values[~np.isnan(values)]
+
+
+    @staticmethod
+    def _bin_counts(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        # Bin i holds edges[i-1] < value <= edges[i], the last bin holds values above the last edge
+        return np.bincount(np.searchsorted(edges, values, side="left"), minlength=len(edges) + 1)
+
+
+    @staticmethod
+    def _category_counts(dataframe: DataFrame, column: str) -> dict:
+        counts = dataframe[column].value_counts(dropna=True, sort=False)
+        return {str(category): int(count) for category, count in counts.items() if count > 0}
+
+
+    def build_profile(self, dataframe: DataFrame) -> dict:
+        """
+        Summarises the reference dataset into per-feature histograms.
+
+        :param dataframe: Reference dataset.
+        :return: Profile dict (JSON/YAML serializable) keyed by feature name.
+        """
+        try:
+            profile = {}
+
+            for column, feature_type in self.feature_types.items():
+                if column not in dataframe.columns:
+                    continue
+
+                null_count = int(dataframe[column].isna().sum())
+
+                if feature_type == "num":
+                    values = self._numerical_values(dataframe, column)
+                    unique_values = np.unique(values)
+
+                    # Exact value counts for low cardinality, quantile bin edges otherwise
+                    if len(unique_values) <= self.n_bins:
+                        edges = unique_values
+                    else:
+                        edges = np.unique(np.quantile(values, np.linspace(0.0, 1.0, self.n_bins + 1)))
+
+                    profile[column] = {"type": "num",
+                                       "n": int(len(values)),
+                                       "null_count": null_count,
+                                       "edges": edges.tolist(),
+                                       "counts": self._bin_counts(values, edges).tolist()}
+                else:
+                    counts = self._category_counts(dataframe, column)
+                    profile[column] = {"type": "cat",
+                                       "n": int(sum(counts.values())),
+                                       "null_count": null_count,
+                                       "counts": counts}
+
+            return profile
+
+        except Exception as e:
+            raise BankChurnException(f"Error in build_profile: {str(e)}", sys) from e
+
+
+    @staticmethod
+    def ks_p_value(statistic: float, n: int, m: int) -> float:
+        """
+        Asymptotic two-sample Kolmogorov-Smirnov p-value (Kolmogorov distribution with Stephens' correction).
+        """
+        if n == 0 or m == 0:
+            return 1.0
+
+        effective_n = math.sqrt(n * m / (n + m))
+        lam = (effective_n + 0.12 + 0.11 / effective_n) * statistic
+        if lam < 0.2:
+            return 1.0
+
+        k = np.arange(1, 101)
+        p_value = 2.0 * np.sum((-1.0) ** (k - 1) * np.exp(-2.0 * (k * lam) ** 2))
+        return float(min(max(p_value, 0.0), 1.0))
+
+
+    @staticmethod
+    def chi_square_p_value(statistic: float, dof: int) -> float:
+        """
+        Upper tail of the chi-square distribution (Wilson-Hilferty normal approximation).
+        """
+        if dof <= 0:
+            return 1.0
+
+        z = ((statistic / dof) ** (1.0 / 3.0) - (1.0 - 2.0 / (9.0 * dof))) / math.sqrt(2.0 / (9.0 * dof))
+        return float(0.5 * math.erfc(z / math.sqrt(2.0)))
+
+
+    @staticmethod
+    def psi(reference_share: np.ndarray, current_share: np.ndarray, epsilon: float = 1e-4) -> float:
+        """
+        Population stability index between two distributions over the same bins.
+        """
+        reference_share = np.clip(reference_share, epsilon, None)
+        current_share = np.clip(current_share, epsilon, None)
+        return float(np.sum((current_share - reference_share) * np.log(current_share / reference_share)))
+
+
+    def _compare_numerical(self, reference: dict, values: np.ndarray) -> dict:
+        reference_counts = np.asarray(reference["counts"], dtype=np.float64)
+        current_counts = self._bin_counts(values, np.asarray(reference["edges"], dtype=np.float64)).astype(np.float64)
+        n, m = reference["n"], int(current_counts.sum())
+
+        if n == 0 or m == 0:
+            return {"stattest": "ks", "statistic": 0.0, "p_value": 1.0, "psi": 0.0}
+
+        reference_cdf = np.cumsum(reference_counts) / n
+        current_cdf = np.cumsum(current_counts) / m
+        statistic = float(np.max(np.abs(reference_cdf - current_cdf)))
+
+        return {"stattest": "ks",
+                "statistic": statistic,
+                "p_value": self.ks_p_value(statistic, n, m),
+                "psi": self.psi(reference_counts / n, current_counts / m)}
+
+
+    def _compare_categorical(self, reference: dict, current_counts: dict) -> dict:
+        categories = sorted(set(reference["counts"]) | set(current_counts))
+        reference_counts = np.array([reference["counts"].get(category, 0) for category in categories], dtype=np.float64)
+        current_counts = np.array([current_counts.get(category, 0) for category in categories], dtype=np.float64)
+        n, m = reference_counts.sum(), current_counts.sum()
+
+        if n == 0 or m == 0:
+            return {"stattest": "chi_square", "statistic": 0.0, "p_value": 1.0, "psi": 0.0}
+
+        # Chi-square test of homogeneity on the 2 x k contingency table (both sides are samples)
+        observed = np.vstack([reference_counts, current_counts])
+        expected = np.outer([n, m], (reference_counts + current_counts) / (n + m))
+        statistic = float(np.sum((observed - expected) ** 2 / expected))
+
+        return {"stattest": "chi_square",
+                "statistic": statistic,
+                "p_value": self.chi_square_p_value(statistic, len(categories) - 1),
+                "psi": self.psi(reference_counts / n, current_counts / m)}
+
+
+    def compare(self, reference_profile: dict, current_df: DataFrame) -> dict:
+        """
+        Tests every profiled feature of the current dataset against the reference profile.
+
+        :param reference_profile: Profile returned by build_profile.
+        :param current_df: Current dataset.
+        :return: Drift report.
+        """
+        try:
+            features = {}
+
+            for column, reference in reference_profile.items():
+                if column not in current_df.columns:
+                    continue
+
+                if reference["type"] == "num":
+                    result = self._compare_numerical(reference, self._numerical_values(current_df, column))
+                else:
+                    result = self._compare_categorical(reference, self._category_counts(current_df, column))
+
+                result["type"] = reference["type"]
+                result["drift_detected"] = bool(result["p_value"] < self.p_value_threshold)
+                features[column] = result
+
+            n_features = len(features)
+            n_drifted_features = sum(result["drift_detected"] for result in features.values())
+            share_drifted_features = n_drifted_features / n_features if n_features else 0.0
+
+            return {"n_features": n_features,
+                    "n_drifted_features": n_drifted_features,
+                    "share_drifted_features": share_drifted_features,
+                    "dataset_drift": bool(n_features and share_drifted_features >= self.drift_share),
+                    "features": features}
+
+        except Exception as e:
+            raise BankChurnException(f"Error in compare: {str(e)}", sys) from e
+
+
+    def detect(self, reference_df: DataFrame, current_df: DataFrame) -> dict:
+        """
+        Builds the reference profile and compares the current dataset against it.
+        """
+        return self.compare(self.build_profile(reference_df), current_df)
@@ -0,0 +1,287 @@
+# Online feature lookup cache keyed by CustomerId (read-through, TTL and LRU eviction)
+
+import sys
+import time
+import threading
+
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from pandas import DataFrame
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.constants.common import DATASET_NAME, SCHEMA_FILE_PATH
+from src.core.constants.data import DATA_PREPROCESSING_CHUNK_ROWS
+from src.core.constants.model import (FEATURE_CACHE_KEY_COLUMN, FEATURE_CACHE_CAPACITY,
+                                      FEATURE_CACHE_TTL, FEATURE_CACHE_MAX_KEYS_PER_QUERY)
+from src.core.entities.config_entity import DataIngestionConfig
+
+from src.core.utils.helpers import read_data_in_chunks, read_yaml
+
+
+
+class CustomerFeatureCache:
+    """
+    Class Name :   CustomerFeatureCache
+    Description :   Preprocessed feature vectors of known customers, keyed by CustomerId, so repeat scoring of a
+                    customer skips the database and the preprocessor.
+
+                    Feature vectors live in one preallocated float32 matrix (capacity x n_features) with an
+                    expiry time per row; an OrderedDict maps every key to its row in least recently used order.
+                    Lookups of a batch gather all their rows at once. Entries expire `ttl` seconds after they
+                    were stored and the least recently used entry gives its row up when the cache is full.
+
+                    The cache is read-through: the keys that miss are fetched from MySQL with one
+                    `WHERE CustomerId IN (...)` query per batch, preprocessed together and stored. `warm` fills
+                    the cache in chunks from the raw ingestion artifact, which still has the CustomerId column
+                    that ingestion drops.
+
+                    Keys are compared as strings (CustomerId is declared as a string in the schema), all methods
+                    are thread safe.
+
+    Output      :   Feature matrix of the requested customers and a mask of the customers found
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, preprocessor, capacity: int = FEATURE_CACHE_CAPACITY, ttl: float = FEATURE_CACHE_TTL,
+                 key_column: str = FEATURE_CACHE_KEY_COLUMN,
+                 fetch_rows: Optional[Callable[[List[str]], DataFrame]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param preprocessor: Fitted SchemaPreprocessor (e.g. ChurnPredictor.preprocessor).
+        :param fetch_rows: Function returning the raw rows (key column and input columns) of a list of keys,
+                           defaults to a MySQL query on the source table.
+        :param clock: Time source of the TTL, in seconds.
+        """
+        try:
+            if capacity < 1 or ttl <= 0:
+                raise ValueError("capacity must be at least 1 and ttl positive")
+
+            self.preprocessor = preprocessor
+            self.capacity = capacity
+            self.ttl = ttl
+            self.key_column = key_column
+            self.fetch_rows = fetch_rows or self._fetch_rows_from_mysql
+            self.clock = clock
+            self.n_features = len(preprocessor.feature_names_out)
+
+            self._features = np.empty((capacity, self.n_features), dtype=np.float32)
+            self._expires = np.zeros(capacity, dtype=np.float64)
+            self._slots: "OrderedDict[str, int]" = OrderedDict()  # key -> row, least recently used first
+            self._free_slots = list(range(capacity - 1, -1, -1))
+            self._lock = threading.Lock()
+
+            self.hits = self.misses = self.expired = self.evictions = self.fetched = 0
+
+        except Exception as e:
+            raise BankChurnException(f"Error initializing CustomerFeatureCache: {str(e)}", sys) from e
+
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+    @property
+    def stats(self) -> dict:
+        return {"size": len(self._slots), "capacity": self.capacity, "ttl": self.ttl,
+                "hits": self.hits, "misses": self.misses, "expired": self.expired,
+                "evictions": self.evictions, "fetched": self.fetched}
+
+
+    # ---------------------------------------- Storage ----------------------------------------
+
+    def _store(self, keys: List[str], features: np.ndarray) -> None:
+        # Caller holds the lock. The last row of a key wins, and only the last `capacity` keys fit.
+        latest = {}
+        for i, key in enumerate(keys):
+            latest.pop(key, None)
+            latest[key] = i
+        positions = np.fromiter(latest.values(), dtype=np.intp, count=len(latest))[-self.capacity:]
+        latest_keys = list(latest)[-self.capacity:]
+
+        rows = np.empty(len(latest_keys), dtype=np.intp)
+        for j, key in enumerate(latest_keys):
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                if self._free_slots:
+                    slot = self._free_slots.pop()
+                else:
+                    _, slot = self._slots.popitem(last=False)
+                    self.evictions += 1
+            self._slots[key] = slot
+            rows[j] = slot
+
+        # One scatter for the whole batch
+        self._features[rows] = features[positions]
+        self._expires[rows] = self.clock() + self.ttl
+
+
+    def put(self, keys: Iterable[Any], features: np.ndarray) -> None:
+        """
+        Store preprocessed feature vectors (n_keys x n_features), replacing the entries of existing keys.
+        """
+        try:
+            keys = [str(key) for key in keys]
+            features = np.asarray(features, dtype=np.float32)
+            if features.shape != (len(keys), self.n_features):
+                raise ValueError(f"Expected features of shape {(len(keys), self.n_features)}, got {features.shape}")
+
+            with self._lock:
+                self._store(keys, features)
+
+        except Exception as e:
+            raise BankChurnException(f"Error in CustomerFeatureCache.put: {str(e)}", sys) from e
+
+
+    def put_rows(self, dataframe: DataFrame) -> int:
+        """
+        Preprocess raw rows (key column and input columns) and store them. Returns the number of rows stored.
+        """
+        try:
+            dataframe = dataframe[dataframe[self.key_column].notna()]
+            if dataframe.empty:
+                return 0
+            features = self.preprocessor.transform(dataframe)
+            self.put(dataframe[self.key_column].tolist(), features)
+            return len(dataframe)
+
+        except Exception as e:
+            raise BankChurnException(f"Error in CustomerFeatureCache.put_rows: {str(e)}", sys) from e
+
+
+    def _lookup(self, keys: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        # Rows of the cached, unexpired keys, refreshed as most recently used
+        features = np.zeros((len(keys), self.n_features), dtype=np.float32)
+        found = np.zeros(len(keys), dtype=bool)
+        rows = np.empty(len(keys), dtype=np.intp)
+
+        with self._lock:
+            now = self.clock()
+            for i, key in enumerate(keys):
+                slot = self._slots.get(key)
+                if slot is None:
+                    continue
+                if self._expires[slot] <= now:
+                    del self._slots[key]
+                    self._free_slots.append(slot)
+                    self.expired += 1
+                    continue
+                self._slots.move_to_end(key)
+                rows[i] = slot
+                found[i] = True
+
+            # One gather for the whole batch
+            features[found] = self._features[rows[found]]
+
+        return features, found
+
+
+    def get_cached(self, keys: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Feature vectors of the cached, unexpired keys, without fetching the others.
+
+        :return: Tuple of (features n_keys x n_features, found mask). Rows of keys not found are zeros.
+        """
+        features, found = self._lookup([str(key) for key in keys])
+        n_found = int(found.sum())
+        with self._lock:
+            self.hits += n_found
+            self.misses += len(found) - n_found
+        return features, found
+
+
+    # ---------------------------------------- Read-through ----------------------------------------
+
+    def _fetch_rows_from_mysql(self, keys: List[str]) -> DataFrame:
+        from src.configs.mysql_connection import HotelBookingData
+
+        schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+        return HotelBookingData().export_rows_by_key(dataset_name=DATASET_NAME, key_column=self.key_column,
+                                                     key_values=keys,
+                                                     watermark_column=schema_config.get("watermark_column"))
+
+
+    def get_features(self, keys: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Feature vectors of a batch of customers. Cached keys are served from memory, the others are fetched
+        (see `fetch_missing`).
+
+        :return: Tuple of (features n_keys x n_features, found mask). Customers unknown to the database
+                 are not found and their rows are zeros.
+        """
+        keys = [str(key) for key in keys]
+        features, found = self.get_cached(keys)
+        if found.all():
+            return features, found
+        return self.fetch_missing(keys, features, found)
+
+
+    def fetch_missing(self, keys: List[Any], features: np.ndarray, found: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Complete the result of `get_cached`: the keys not found are fetched with one IN (...) query per
+        FEATURE_CACHE_MAX_KEYS_PER_QUERY keys, preprocessed together and filled in from the fetched rows.
+        Storing them in the cache is a side effect, so a batch larger than the capacity is still complete.
+
+        :return: The updated (features, found) arrays.
+        """
+        try:
+            keys = [str(key) for key in keys]
+            missing_positions = {}
+            for i in np.flatnonzero(~found):
+                missing_positions.setdefault(keys[i], []).append(i)
+
+            missing_keys = list(missing_positions)
+            for start in range(0, len(missing_keys), FEATURE_CACHE_MAX_KEYS_PER_QUERY):
+                rows = self.fetch_rows(missing_keys[start:start + FEATURE_CACHE_MAX_KEYS_PER_QUERY])
+                rows = rows[rows[self.key_column].notna()] if len(rows) else rows
+                if not len(rows):
+                    continue
+
+                row_keys = rows[self.key_column].astype(str).tolist()
+                fetched_features = np.asarray(self.preprocessor.transform(rows), dtype=np.float32)
+
+                # The raw rows of a customer may repeat, the last one wins (as in the cache)
+                latest = {key: j for j, key in enumerate(row_keys)}
+                positions, fetched_positions = [], []
+                for key, j in latest.items():
+                    for i in missing_positions.get(key, ()):
+                        positions.append(i)
+                        fetched_positions.append(j)
+                features[positions] = fetched_features[fetched_positions]
+                found[positions] = True
+
+                self.put(row_keys, fetched_features)
+                with self._lock:
+                    self.fetched += len(row_keys)
+
+            return features, found
+
+        except Exception as e:
+            raise BankChurnException(f"Error in CustomerFeatureCache.fetch_missing: {str(e)}", sys) from e
+
+
+    def warm(self, raw_file_path: Optional[str] = None, chunk_rows: int = DATA_PREPROCESSING_CHUNK_ROWS) -> int:
+        """
+        Fill the cache from the raw ingestion artifact, chunk by chunk. Later rows of a customer replace earlier
+        ones, and when the artifact has more customers than the capacity the most recent rows are kept.
+
+        :param raw_file_path: Raw artifact with the key column, defaults to the ingestion stage output.
+        :return: Number of rows stored.
+        """
+        try:
+            raw_file_path = raw_file_path or DataIngestionConfig().raw_file_path
+            columns = [self.key_column] + self.preprocessor.input_columns
+
+            n_rows = 0
+            for chunk in read_data_in_chunks(raw_file_path, chunk_rows=chunk_rows, columns=columns):
+                # Only the last `capacity` rows can survive the eviction
+                n_rows += self.put_rows(chunk.tail(self.capacity))
+
+            logging.info(f"Warmed the customer feature cache with {n_rows} rows from {raw_file_path} "
+                         f"({len(self)} customers cached)")
+            return n_rows
+
+        except Exception as e:
+            raise BankChurnException(f"Error in CustomerFeatureCache.warm: {str(e)}", sys) from e
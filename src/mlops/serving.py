@@ -0,0 +1,390 @@
+# Asyncio HTTP scoring service with micro-batching of concurrent requests
+
+import sys
+import json
+import math
+import time
+import asyncio
+
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.constants.model import (MODEL_SERVING_HOST, MODEL_SERVING_PORT,
+                                      MODEL_SERVING_MAX_BATCH_SIZE, MODEL_SERVING_MAX_WAIT_US,
+                                      MODEL_SERVING_THRESHOLD)
+
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+MAX_BODY_BYTES = 16 * 1024 ** 2
+
+CATEGORY_TYPES = (str, int, float, bool)
+
+
+
+def coerce_record(record: dict, numerical_columns: Iterable[str], categorical_columns: Iterable[str]) -> dict:
+    """
+    Check one raw customer record before it joins a micro-batch, so a malformed request is answered alone.
+    Numerical values may be numbers, booleans or numeric strings (converted to float); null and NaN are
+    missing. Categorical values must be scalars (strings, numbers or booleans) or null. Other keys are kept
+    as they are.
+
+    :return: A copy of the record with the numerical values converted.
+    :raises ValueError: Naming the offending column.
+    """
+    record = dict(record)
+    for column in numerical_columns:
+        value = record.get(column)
+        if value is None or isinstance(value, bool):
+            continue
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError(f"'{column}' must be a finite number or null") from None
+        if not isinstance(value, (int, float)) or math.isinf(value):
+            raise ValueError(f"'{column}' must be a finite number or null")
+        record[column] = float(value)
+
+    for column in categorical_columns:
+        value = record.get(column)
+        if value is not None and not isinstance(value, CATEGORY_TYPES):
+            raise ValueError(f"'{column}' must be a string, a number, a boolean or null")
+
+    return record
+
+
+
+class MicroBatcher:
+    """
+    Class Name :   MicroBatcher
+    Description :   Gathers concurrent single-record requests into micro-batches that are scored with one call of
+                    `score_batch` (a list of records in, a sequence of scores out).
+
+                    The first request of a batch arms a timer of `max_wait_us` microseconds; the batch is scored
+                    when the timer fires or as soon as `max_batch_size` requests are waiting, whichever comes
+                    first. Under light load a request waits at most `max_wait_us` (the event loop timer
+                    resolution is about a millisecond), under heavy load batches fill up before the timer fires,
+                    so the cost of a scoring call is shared by more requests and throughput grows with the load
+                    while the wait of each request stays bounded.
+
+                    Scoring runs on the event loop: the vectorized predictor takes microseconds per batch, far
+                    less than a thread hand-off.
+
+    Output      :   Score of every submitted record
+    On Failure  :   When a batch call raises, its records are scored one by one, so only the requests whose
+                    record fails raise the exception
+    """
+
+    def __init__(self, score_batch: Callable[[List[dict]], Sequence[float]],
+                 max_batch_size: int = MODEL_SERVING_MAX_BATCH_SIZE,
+                 max_wait_us: int = MODEL_SERVING_MAX_WAIT_US):
+        if max_batch_size < 1 or max_wait_us < 0:
+            raise ValueError("max_batch_size must be at least 1 and max_wait_us not negative")
+
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1e6
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Statistics reported by /metrics
+        self.n_requests = 0
+        self.n_batches = 0
+        self.n_batch_failures = 0  # batches rescored record by record
+        self.scoring_seconds = 0.0
+
+
+    async def submit(self, record: dict) -> float:
+        """
+        Score one record as part of the next micro-batch.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((record, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+
+        return await future
+
+
+    def flush(self) -> None:
+        """
+        Score the waiting requests now.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            results = [float(score) for score in self.score_batch([record for record, _ in batch])]
+        except Exception as batch_error:
+            if len(batch) == 1:
+                results = [batch_error]
+            else:
+                # Isolate the failing records: the other requests of the batch still get their score
+                self.n_batch_failures += 1
+                results = []
+                for record, _ in batch:
+                    try:
+                        results.append(float(self.score_batch([record])[0]))
+                    except Exception as e:
+                        results.append(e)
+        finally:
+            self.scoring_seconds += time.perf_counter() - start
+            self.n_batches += 1
+            self.n_requests += len(batch)
+
+        for (_, future), result in zip(batch, results):
+            # Requests whose client went away are cancelled
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+    @property
+    def stats(self) -> dict:
+        return {"requests": self.n_requests,
+                "batches": self.n_batches,
+                "mean_batch_size": self.n_requests / self.n_batches if self.n_batches else 0.0,
+                "batch_failures": self.n_batch_failures,
+                "scoring_seconds": self.scoring_seconds,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_us": int(self.max_wait * 1e6)}
+
+
+
+class ScoringServer:
+    """
+    Class Name :   ScoringServer
+    Description :   Minimal HTTP/1.1 server (asyncio streams, keep-alive) for churn scoring:
+
+                      - POST /predict : one customer record (JSON object), scored through the MicroBatcher,
+                                        or a list of records (JSON array), scored directly as one batch
+                      - POST /predict/customers : {"customer_ids": [...]}, known customers scored from their
+                                        cached feature vectors (needs a CustomerFeatureCache)
+                      - GET  /health  : model in use
+                      - GET  /metrics : batching statistics
+
+                    Responses are JSON: {"churn_probability": p, "churn": 0|1} per record. Records are checked
+                    before scoring (400 for the malformed request only), and internal errors are answered
+                    with a generic 500 body, the details go to the log.
+
+    Output      :   Running HTTP service
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, predictor=None, host: str = MODEL_SERVING_HOST, port: int = MODEL_SERVING_PORT,
+                 max_batch_size: int = MODEL_SERVING_MAX_BATCH_SIZE,
+                 max_wait_us: int = MODEL_SERVING_MAX_WAIT_US,
+                 threshold: float = MODEL_SERVING_THRESHOLD,
+                 feature_cache=None):
+        """
+        :param predictor: ChurnPredictor, loaded from the latest pipeline artifacts by default.
+        :param feature_cache: CustomerFeatureCache built on the predictor's preprocessor (optional).
+        """
+        try:
+            if predictor is None:
+                from src.model.predictor import ChurnPredictor
+                predictor = ChurnPredictor()
+
+            self.predictor = predictor
+            self.host = host
+            self.port = port
+            self.threshold = threshold
+            self.feature_cache = feature_cache
+            self.numerical_columns = list(predictor.preprocessor.numerical_columns)
+            self.categorical_columns = [column for column in predictor.input_columns
+                                        if column not in self.numerical_columns]
+            self.batcher = MicroBatcher(predictor.predict_records, max_batch_size=max_batch_size,
+                                        max_wait_us=max_wait_us)
+            self.server: Optional[asyncio.AbstractServer] = None
+
+        except Exception as e:
+            raise BankChurnException(f"Error initializing ScoringServer: {str(e)}", sys) from e
+
+
+    def _coerce(self, record: dict) -> dict:
+        return coerce_record(record, self.numerical_columns, self.categorical_columns)
+
+
+    def _prediction(self, probability: float) -> dict:
+        return {"churn_probability": probability, "churn": int(probability >= self.threshold)}
+
+
+    async def handle_request(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        """
+        Route one request, returns (status, JSON payload).
+        """
+        path = path.split("?", 1)[0]
+
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError:
+                return 400, {"error": "body is not valid JSON"}
+
+            if isinstance(payload, dict):
+                try:
+                    record = self._coerce(payload)
+                except ValueError as e:
+                    return 400, {"error": str(e)}
+                return 200, self._prediction(await self.batcher.submit(record))
+
+            if isinstance(payload, list) and all(isinstance(record, dict) for record in payload):
+                records = []
+                for i, record in enumerate(payload):
+                    try:
+                        records.append(self._coerce(record))
+                    except ValueError as e:
+                        return 400, {"error": f"record {i}: {str(e)}"}
+                probabilities = self.predictor.predict_records(records) if records else []
+                return 200, {"predictions": [self._prediction(float(p)) for p in probabilities]}
+            return 400, {"error": "expected a customer record (object) or a list of records"}
+
+        if path == "/predict/customers":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            if self.feature_cache is None:
+                return 404, {"error": "the customer feature cache is not enabled"}
+            try:
+                customer_ids = json.loads(body or b"null")
+            except ValueError:
+                return 400, {"error": "body is not valid JSON"}
+            if isinstance(customer_ids, dict):
+                customer_ids = customer_ids.get("customer_ids")
+            if not isinstance(customer_ids, list):
+                return 400, {"error": "expected {\"customer_ids\": [...]}"}
+            return 200, {"predictions": await self.predict_customers(customer_ids)}
+
+        if path == "/health":
+            return 200, {"status": "ok",
+                         "model": type(self.predictor.model).__name__,
+                         "compiled": self.predictor.is_compiled,
+                         "features": self.predictor.input_columns}
+
+        if path == "/metrics":
+            if self.feature_cache is not None:
+                return 200, {**self.batcher.stats, "feature_cache": self.feature_cache.stats}
+            return 200, self.batcher.stats
+
+        return 404, {"error": f"unknown path {path}"}
+
+
+    async def predict_customers(self, customer_ids: list) -> List[dict]:
+        """
+        Score known customers from the feature cache. Cache hits are served on the event loop, a batch with
+        misses is looked up on a worker thread (one database query for all its misses).
+        """
+        features, found = self.feature_cache.get_cached(customer_ids)
+        if not found.all():
+            features, found = await asyncio.to_thread(self.feature_cache.fetch_missing, customer_ids, features, found)
+
+        probabilities = self.predictor.predict_proba_features(features) if len(features) else []
+        return [{"customer_id": customer_id, **self._prediction(float(probability))} if is_found
+                else {"customer_id": customer_id, "error": "unknown customer"}
+                for customer_id, probability, is_found in zip(customer_ids, probabilities, found)]
+
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # One task per connection, requests of a keep-alive connection are answered in order
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive")
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.handle_request(method, path, body)
+                except Exception as e:
+                    # The details (paths, values) stay in the log
+                    logging.error(f"Error scoring request {method} {path}: {str(e)}")
+                    status, payload = 500, {"error": "internal server error"}
+
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+        body = json.dumps(payload).encode()
+        writer.write((f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                      f"Content-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode() + body)
+        await writer.drain()
+
+
+    async def start(self) -> asyncio.AbstractServer:
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logging.info(f"Scoring server listening on http://{self.host}:{self.port} "
+                     f"(max batch size {self.batcher.max_batch_size}, max wait {int(self.batcher.max_wait * 1e6)} us)")
+        return self.server
+
+
+    async def serve_forever(self) -> None:
+        try:
+            server = await self.start()
+            async with server:
+                await server.serve_forever()
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise BankChurnException(f"Error in ScoringServer.serve_forever: {str(e)}", sys) from e
+
+
+    def run(self) -> None:
+        """
+        Serve until interrupted (Ctrl+C).
+        """
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            logging.info("Scoring server stopped")
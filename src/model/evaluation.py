@@ -0,0 +1,466 @@
+import os
+import sys
+import math
+import time
+
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.entities.config_entity import ModelEvaluationConfig
+from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
+                                               DataSplitArtifact,
+                                               ModelTrainerArtifact,
+                                               ModelEvaluationArtifact)
+
+from src.core.utils.helpers import load_object, read_json, write_json, get_file_hash
+from src.core.utils.feature_store import FeatureStore
+from src.core.constants.model import (MODEL_EVALUATION_THRESHOLD, MODEL_EVALUATION_BOOTSTRAP_REPLICATES,
+                                      MODEL_EVALUATION_CONFIDENCE_LEVEL, MODEL_EVALUATION_BOOTSTRAP_CHUNK_ELEMENTS,
+                                      MODEL_EVALUATION_MAX_WORKERS, MODEL_EVALUATION_CALIBRATION_BINS,
+                                      MODEL_EVALUATION_LIFT_BINS, MODEL_EVALUATION_RANDOM_STATE)
+from src.data.split import DataSplit
+from src.model.trainer import predict_scores
+
+
+# Poisson(1) bootstrap weights are drawn as 16 bit integers mapped through the inverse CDF: one random draw and
+# one table lookup per weight (numpy's poisson sampler is about 10 times slower). Counts above 8 have a
+# probability below 1e-6 and are folded into the last entries.
+POISSON_TABLE_SIZE = 1 << 16
+POISSON_TABLE = np.searchsorted(np.cumsum([math.exp(-1) / math.factorial(k) for k in range(16)]) * POISSON_TABLE_SIZE,
+                                np.arange(POISSON_TABLE_SIZE), side="right").astype(np.uint8)
+
+
+
+class SortedScores:
+    """
+    Class Name :   SortedScores
+    Description :   One descending sort of the holdout scores, shared by every metric. Rows with the same score
+                    form a threshold group, and a row is predicted positive at threshold t when its score is
+                    at least t.
+
+                    The metrics of a set of row weights (all ones for the point estimate, Poisson counts for a
+                    bootstrap replicate) only need two cumulative sums in score order: rows and positives
+                    scored at or above every position. ROC-AUC, PR-AUC and the best F1 only change at the
+                    groups that contain a positive, so they are computed on those groups only, for a whole
+                    matrix of replicates at once.
+
+    Output      :   Metrics, threshold curves, calibration and lift tables
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, y_true: np.ndarray, y_score: np.ndarray):
+        y_true = np.asarray(y_true).ravel()
+        y_score = np.asarray(y_score, dtype=np.float64).ravel()
+        if len(y_true) != len(y_score):
+            raise ValueError(f"Got {len(y_true)} labels and {len(y_score)} scores")
+        if not np.isfinite(y_score).all():
+            raise ValueError("Scores must be finite")
+        if not np.isin(y_true, (0, 1)).all():
+            raise ValueError("Labels must be 0 or 1")
+
+        order = np.argsort(y_score, kind="stable")[::-1]
+        self.score = y_score[order]
+        self.label = y_true[order] == 1
+        self.n_rows = len(self.score)
+        self.positives_through = np.cumsum(self.label)  # positives among the rows at or above every position
+        self.n_positives = int(self.positives_through[-1]) if self.n_rows else 0
+        if self.n_positives in (0, self.n_rows):
+            raise ValueError("The holdout rows need both classes")
+
+        self.is_probability = bool(self.score[-1] >= 0 and self.score[0] <= 1)
+
+        # Threshold groups (distinct scores, descending)
+        self.group_starts = np.flatnonzero(np.r_[True, self.score[1:] != self.score[:-1]])
+        self.group_ends = np.r_[self.group_starts[1:], self.n_rows] - 1
+
+        # Groups with a positive, as positions in the cumulative sums (-1 is "no row")
+        positives_to_end = self.positives_through[self.group_ends]
+        has_positive = positives_to_end > np.r_[0, positives_to_end[:-1]]
+        self.positive_rows = np.flatnonzero(self.label)
+        self._rows_end = self.group_ends[has_positive]
+        self._rows_before = self.group_starts[has_positive] - 1
+        self._positives_end = positives_to_end[has_positive] - 1
+
+        self._losses = None
+        self._losses_float32 = None
+
+
+    def _count_at_or_above(self, thresholds) -> np.ndarray:
+        return np.searchsorted(-self.score, -np.asarray(thresholds, dtype=np.float64), side="right")
+
+
+    @property
+    def losses(self) -> np.ndarray:
+        # Squared error and log loss of every row (n_rows x 2), for probability scores
+        if self._losses is None:
+            probability = np.clip(np.where(self.label, self.score, 1 - self.score), 1e-15, 1)
+            self._losses = np.column_stack([(self.score - self.label) ** 2, -np.log(probability)])
+        return self._losses
+
+
+    @staticmethod
+    def _counts_at(cumulative: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        # Columns of a (replicates x rows) cumulative sum, 0 at position -1
+        counts = cumulative[:, np.maximum(positions, 0)].astype(np.float64)
+        counts[:, positions < 0] = 0
+        return counts
+
+
+    def replicate_metrics(self, weights: Optional[np.ndarray] = None,
+                          threshold: float = MODEL_EVALUATION_THRESHOLD) -> Dict[str, np.ndarray]:
+        """
+        Metrics of every row of a weight matrix.
+
+        :param weights: Row weights in score order (replicates x n_rows, small integers), None for the
+                        point estimate (every row once).
+        :param threshold: Score from which a row is predicted positive, for the label based metrics.
+        :return: Dict of metric name to an array with one value per replicate.
+        """
+        point_estimate = weights is None
+        if point_estimate:
+            weights = np.ones((1, self.n_rows), dtype=np.uint8)
+
+        predicted = np.cumsum(weights, axis=1, dtype=np.int32)
+        positives = np.cumsum(weights[:, self.positive_rows], axis=1, dtype=np.int32)
+
+        n_rows = predicted[:, -1].astype(np.float64)
+        n_positives = positives[:, -1].astype(np.float64)
+        n_negatives = n_rows - n_positives
+
+        # At the end of every group with a positive, and before its first row. No positive lies between two
+        # such groups, so the positives gained by a group are the difference of consecutive tp.
+        tp = positives[:, self._positives_end].astype(np.float64)
+        predicted_positive = predicted[:, self._rows_end].astype(np.float64)
+        predicted_before = self._counts_at(predicted, self._rows_before)
+        gained = np.diff(tp, axis=1, prepend=0)
+
+        threshold_rows = self._count_at_or_above(threshold)
+        threshold_tp = self._counts_at(positives, np.array([self.positives_through[threshold_rows - 1]
+                                                            if threshold_rows else 0]) - 1)[:, 0]
+        threshold_predicted = self._counts_at(predicted, np.array([threshold_rows - 1]))[:, 0]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Positives of a group rank above the negatives below it and tie with half of the negatives in it:
+            # sum(gained * (n_negatives - (fp + fp_before) / 2)), where sum(gained * (tp + tp_before)) telescopes
+            # to n_positives ** 2
+            roc_auc = (n_positives * n_negatives + n_positives ** 2 / 2
+                       - np.einsum("ij,ij->i", gained, predicted_positive + predicted_before) / 2) \
+                      / (n_positives * n_negatives)
+            # Average precision: precision at every threshold, weighted by the recall gained there
+            pr_auc = np.einsum("ij,ij->i", gained, tp / np.maximum(predicted_positive, 1)) / n_positives
+
+            f1 = tp / (n_positives[:, None] + predicted_positive)
+            best = np.argmax(f1, axis=1)
+
+            metrics = {"roc_auc": roc_auc,
+                       "pr_auc": pr_auc,
+                       "best_f1": 2 * f1[np.arange(len(best)), best],
+                       "best_f1_threshold": self.score[self._rows_end[best]],
+                       "precision": threshold_tp / np.maximum(threshold_predicted, 1),
+                       "recall": threshold_tp / n_positives,
+                       "f1": 2 * threshold_tp / (n_positives + threshold_predicted),
+                       "accuracy": (n_negatives + 2 * threshold_tp - threshold_predicted) / n_rows}
+
+            if self.is_probability:
+                if point_estimate:
+                    losses = self.losses.sum(axis=0)[None, :]
+                else:
+                    # float32 GEMM: one pass over the weights for both losses
+                    if self._losses_float32 is None:
+                        self._losses_float32 = self.losses.astype(np.float32)
+                    losses = weights.astype(np.float32) @ self._losses_float32
+                metrics["brier_score"] = losses[:, 0] / n_rows
+                metrics["log_loss"] = losses[:, 1] / n_rows
+
+        return metrics
+
+
+    def threshold_curves(self) -> Dict[str, np.ndarray]:
+        """
+        ROC, precision-recall and F1 curves at every distinct score, in descending order of threshold.
+        """
+        predicted = self.group_ends + 1
+        tp = self.positives_through[self.group_ends]
+        fp = predicted - tp
+        n_negatives = self.n_rows - self.n_positives
+        return {"threshold": self.score[self.group_starts],
+                "tp": tp,
+                "fp": fp,
+                "tpr": tp / self.n_positives,
+                "fpr": fp / n_negatives,
+                "precision": tp / predicted,
+                "recall": tp / self.n_positives,
+                "f1": 2 * tp / (self.n_positives + predicted)}
+
+
+    def calibration(self, n_bins: int = MODEL_EVALUATION_CALIBRATION_BINS) -> dict:
+        """
+        Reliability table of `n_bins` equal width probability bins and the expected calibration error.
+        """
+        edges = np.linspace(0, 1, n_bins + 1)
+        # Rows at or above every edge, the last bin includes 1.0
+        above = np.r_[self._count_at_or_above(edges[:-1]), 0]
+        score_through = np.r_[0, np.cumsum(self.score)]
+        positives_through = np.r_[0, self.positives_through]
+
+        rows = above[:-1] - above[1:]
+        score_sums = score_through[above[:-1]] - score_through[above[1:]]
+        positive_sums = positives_through[above[:-1]] - positives_through[above[1:]]
+
+        bins, calibration_error = [], 0.0
+        for i in np.flatnonzero(rows):
+            mean_score = score_sums[i] / rows[i]
+            observed_rate = positive_sums[i] / rows[i]
+            calibration_error += rows[i] / self.n_rows * abs(mean_score - observed_rate)
+            bins.append({"lower": float(edges[i]), "upper": float(edges[i + 1]), "rows": int(rows[i]),
+                         "mean_probability": float(mean_score), "observed_rate": float(observed_rate)})
+
+        return {"bins": bins, "expected_calibration_error": float(calibration_error)}
+
+
+    def lift(self, n_bins: int = MODEL_EVALUATION_LIFT_BINS) -> List[dict]:
+        """
+        Lift and cumulative gains of `n_bins` equal size bins of rows ranked by descending score.
+        """
+        cuts = np.unique(np.ceil(np.arange(1, n_bins + 1) * self.n_rows / n_bins).astype(np.int64))
+        starts = np.r_[0, cuts[:-1]]
+        captured = self.positives_through[cuts - 1]
+        positives = np.diff(np.r_[0, captured])
+        base_rate = self.n_positives / self.n_rows
+
+        return [{"bin": i + 1,
+                 "rows": int(cut - start),
+                 "min_score": float(self.score[cut - 1]),
+                 "max_score": float(self.score[start]),
+                 "positives": int(positives[i]),
+                 "response_rate": float(positives[i] / (cut - start)),
+                 "lift": float(positives[i] / (cut - start) / base_rate),
+                 "cumulative_share": float(cut / self.n_rows),
+                 "gain": float(captured[i] / self.n_positives),
+                 "cumulative_lift": float(captured[i] / cut / base_rate)}
+                for i, (start, cut) in enumerate(zip(starts, cuts))]
+
+
+
+def _bootstrap_chunk(sorted_scores: SortedScores, seed: np.random.SeedSequence, n_replicates: int,
+                     threshold: float) -> Dict[str, np.ndarray]:
+    rng = np.random.Generator(np.random.SFC64(seed))
+    weights = POISSON_TABLE[rng.integers(0, POISSON_TABLE_SIZE, size=(n_replicates, sorted_scores.n_rows),
+                                         dtype=np.uint16)]
+    return sorted_scores.replicate_metrics(weights, threshold)
+
+
+def bootstrap_metrics(sorted_scores: SortedScores, threshold: float = MODEL_EVALUATION_THRESHOLD,
+                      n_replicates: int = MODEL_EVALUATION_BOOTSTRAP_REPLICATES,
+                      random_state: Optional[int] = MODEL_EVALUATION_RANDOM_STATE,
+                      chunk_elements: int = MODEL_EVALUATION_BOOTSTRAP_CHUNK_ELEMENTS,
+                      max_workers: int = MODEL_EVALUATION_MAX_WORKERS) -> Dict[str, np.ndarray]:
+    """
+    Poisson bootstrap: every replicate weighs each row with an independent Poisson(1) count, which matches
+    resampling the rows with replacement for large holdouts and needs no index gathers.
+
+    Replicates are computed in chunks of about `chunk_elements` weights (replicates x rows) on a thread pool
+    (numpy releases the GIL); every chunk has its own seed, so the result does not depend on `max_workers`.
+
+    :return: Dict of metric name to an array of `n_replicates` values.
+    """
+    chunk = max(1, chunk_elements // sorted_scores.n_rows)
+    sizes = [min(chunk, n_replicates - start) for start in range(0, n_replicates, chunk)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sizes)))) as executor:
+        chunks = list(executor.map(lambda seed, size: _bootstrap_chunk(sorted_scores, seed, size, threshold),
+                                   seeds, sizes))
+
+    return {name: np.concatenate([metrics[name] for metrics in chunks]) for name in chunks[0]}
+
+
+def confidence_intervals(replicates: Dict[str, np.ndarray],
+                         confidence_level: float = MODEL_EVALUATION_CONFIDENCE_LEVEL) -> dict:
+    """
+    Percentile intervals of bootstrap replicates (replicates with an undefined metric are left out).
+    """
+    tail = (1 - confidence_level) / 2
+    intervals = {}
+    for name, values in replicates.items():
+        values = values[np.isfinite(values)]
+        if not len(values):
+            intervals[name] = None
+            continue
+        lower, upper = np.quantile(values, [tail, 1 - tail])
+        intervals[name] = {"lower": float(lower), "upper": float(upper),
+                           "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0}
+    return intervals
+
+
+def evaluate_scores(y_true: np.ndarray, y_score: np.ndarray, threshold: float = MODEL_EVALUATION_THRESHOLD,
+                    n_bootstrap: int = MODEL_EVALUATION_BOOTSTRAP_REPLICATES,
+                    confidence_level: float = MODEL_EVALUATION_CONFIDENCE_LEVEL,
+                    calibration_bins: int = MODEL_EVALUATION_CALIBRATION_BINS,
+                    lift_bins: int = MODEL_EVALUATION_LIFT_BINS,
+                    random_state: Optional[int] = MODEL_EVALUATION_RANDOM_STATE,
+                    chunk_elements: int = MODEL_EVALUATION_BOOTSTRAP_CHUNK_ELEMENTS,
+                    max_workers: int = MODEL_EVALUATION_MAX_WORKERS) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """
+    Evaluate holdout scores: point metrics, bootstrap confidence intervals, calibration (probability scores
+    only) and lift/gains, all from one sort of the scores.
+
+    :return: Tuple of (report, threshold curves).
+    """
+    seconds = {}
+    start = time.perf_counter()
+    sorted_scores = SortedScores(y_true, y_score)
+    seconds["sort"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metrics = {name: float(values[0]) for name, values in sorted_scores.replicate_metrics(None, threshold).items()}
+    calibration = sorted_scores.calibration(calibration_bins) if sorted_scores.is_probability else None
+    lift = sorted_scores.lift(lift_bins)
+    curves = sorted_scores.threshold_curves()
+    seconds["metrics"] = time.perf_counter() - start
+
+    report = {"n_rows": sorted_scores.n_rows,
+              "n_positives": sorted_scores.n_positives,
+              "positive_rate": sorted_scores.n_positives / sorted_scores.n_rows,
+              "n_thresholds": len(sorted_scores.group_starts),
+              "threshold": threshold,
+              "scores_are_probabilities": sorted_scores.is_probability,
+              "metrics": metrics}
+
+    if n_bootstrap:
+        start = time.perf_counter()
+        replicates = bootstrap_metrics(sorted_scores, threshold=threshold, n_replicates=n_bootstrap,
+                                       random_state=random_state, chunk_elements=chunk_elements,
+                                       max_workers=max_workers)
+        seconds["bootstrap"] = time.perf_counter() - start
+        report["confidence_intervals"] = {"method": "poisson bootstrap, percentile",
+                                          "n_replicates": n_bootstrap,
+                                          "confidence_level": confidence_level,
+                                          "random_state": random_state,
+                                          "metrics": confidence_intervals(replicates, confidence_level)}
+
+    report["calibration"] = calibration
+    report["lift"] = lift
+    report["seconds"] = seconds
+    return report, curves
+
+
+
+
+class ModelEvaluation:
+    """
+    Class Name :   ModelEvaluation
+    Description :   Scores the test rows of the split with the trained model and evaluates the scores:
+                    ROC-AUC, PR-AUC, F1 at every threshold, calibration and lift/gains tables, with Poisson
+                    bootstrap confidence intervals of the metrics.
+
+    Output      :   report.json and curves.npz (threshold curves) in the evaluation reports directory
+    On Failure  :   Write an exception log and then raise an exception
+    """
+
+    def __init__(self,
+                 data_preprocessing_artifact: DataPreprocessingArtifact,
+                 data_split_artifact: DataSplitArtifact,
+                 model_trainer_artifact: ModelTrainerArtifact,
+                 model_evaluation_config: Optional[ModelEvaluationConfig] = None):
+        """
+        :param data_preprocessing_artifact: Output reference of data preprocessing artifact stage
+        :param data_split_artifact: Output reference of data split artifact stage
+        :param model_trainer_artifact: Output reference of model trainer artifact stage
+        :param model_evaluation_config: configuration for model evaluation (defaults to ModelEvaluationConfig())
+        """
+        try:
+            logging.info("")
+            logging.info("- - - Started Model Evaluation Stage: - - -")
+            logging.info("- "*50)
+
+            self.data_preprocessing_artifact = data_preprocessing_artifact
+            self.data_split_artifact = data_split_artifact
+            self.model_trainer_artifact = model_trainer_artifact
+            self.model_evaluation_config = model_evaluation_config or ModelEvaluationConfig()
+            self.feature_store = FeatureStore.from_artifact(data_preprocessing_artifact)
+
+        except Exception as e:
+            logging.error(f"Error in ModelEvaluation initialization: {str(e)}")
+            raise BankChurnException(f"Error during ModelEvaluation initialization: {str(e)}", sys) from e
+
+
+
+    def get_test_scores(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Method Name :   get_test_scores
+        Description :   This method scores the test rows with the trained model.
+
+        Output      :   Tuple of (labels, positive class scores).
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            model = load_object(file_path=self.model_trainer_artifact.model_object_file_path)
+            X, y = self.feature_store.get_split(DataSplit.load_indices(self.data_split_artifact, "test"))
+            return y, predict_scores(model, X)
+
+        except Exception as e:
+            logging.error(f"Error in get_test_scores: {str(e)}")
+            raise BankChurnException(f"Error in get_test_scores: {str(e)}", sys) from e
+
+
+
+    def initiate_model_evaluation(self) -> ModelEvaluationArtifact:
+        """
+        Method Name :   initiate_model_evaluation
+        Description :   This method evaluates the trained model on the test rows and saves the evaluation
+                        report and the threshold curves.
+
+        Output      :   Returns the model evaluation artifact.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered initiate_model_evaluation method of ModelEvaluation class")
+
+        try:
+            config = self.model_evaluation_config
+
+            start = time.perf_counter()
+            y, scores = self.get_test_scores()
+            scoring_seconds = time.perf_counter() - start
+
+            report, curves = evaluate_scores(y, scores, threshold=config.threshold, n_bootstrap=config.n_bootstrap,
+                                             confidence_level=config.confidence_level,
+                                             calibration_bins=config.calibration_bins, lift_bins=config.lift_bins,
+                                             random_state=config.random_state,
+                                             chunk_elements=config.bootstrap_chunk_elements,
+                                             max_workers=config.max_workers)
+            report["seconds"]["scoring"] = scoring_seconds
+
+            params = read_json(file_path=self.model_trainer_artifact.best_model_params_file_path)
+            report = {"model": params.get("model"),
+                      "model_hash": get_file_hash(self.model_trainer_artifact.model_object_file_path),
+                      "split_id": self.data_split_artifact.split_id,
+                      **report}
+
+            write_json(file_path=config.report_file_path, data=report, replace=True)
+            os.makedirs(os.path.dirname(config.curves_file_path), exist_ok=True)
+            np.savez(config.curves_file_path, **curves)
+
+            roc_auc = report["metrics"]["roc_auc"]
+            interval = (report.get("confidence_intervals") or {}).get("metrics", {}).get("roc_auc")
+            logging.info(f"Test ROC-AUC {roc_auc:.4f}" +
+                         (f" ({config.confidence_level:.0%} CI {interval['lower']:.4f} - {interval['upper']:.4f})"
+                          if interval else "") +
+                         f", PR-AUC {report['metrics']['pr_auc']:.4f} on {report['n_rows']} rows, "
+                         f"report saved at {config.report_file_path}")
+
+            model_evaluation_artifact = ModelEvaluationArtifact(report_file_path=config.report_file_path,
+                                                                curves_file_path=config.curves_file_path)
+
+            logging.info(f"Model evaluation artifact: {model_evaluation_artifact}")
+            logging.info("Exited initiate_model_evaluation method of ModelEvaluation class")
+
+            return model_evaluation_artifact
+
+        except Exception as e:
+            logging.error(f"Error in initiate_model_evaluation: {str(e)}")
+            raise BankChurnException(f"Error in initiate_model_evaluation: {str(e)}", sys) from e
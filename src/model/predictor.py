@@ -0,0 +1,280 @@
+import sys
+import math
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional
+from pandas import DataFrame
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.entities.config_entity import (DataPreprocessingConfig,
+                                             ModelTrainerConfig)
+
+from src.core.utils.helpers import load_object
+from src.model.trainer import predict_scores
+
+
+
+
+class ChurnPredictor:
+    """
+    Class Name :   ChurnPredictor
+    Description :   Loads the fitted preprocessor and the trained model once and scores raw customer records.
+
+                    For linear models with a logistic output (LogisticRegression, SGDClassifier with log_loss)
+                    preprocessing and scoring are compiled into one linear function of the raw columns:
+
+                      - encoded columns   : one weight table per column, indexed by the category code (label
+                                            encoding weight * code, one-hot weights), last entry for unknown
+                                            or missing values
+                      - numerical columns : weight / scale, the centering folded into the intercept, missing
+                                            values contribute the weight of the fitted mean
+
+                    A batch is then scored with one table gather per encoded column and one multiply-add per
+                    numerical column, without building the feature matrix, and a single record with a few dict
+                    lookups in pure Python. Other models go through SchemaPreprocessor.transform and the model.
+
+    Output      :   Churn probabilities (or decision scores for models without probabilities)
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, preprocessor_object_file_path: Optional[str] = None,
+                 model_object_file_path: Optional[str] = None):
+        """
+        :param preprocessor_object_file_path: Fitted SchemaPreprocessor, defaults to the preprocessing stage output.
+        :param model_object_file_path: Trained model, defaults to the model trainer stage output.
+        """
+        try:
+            self.preprocessor_object_file_path = preprocessor_object_file_path or DataPreprocessingConfig().preprocessor_object_file_path
+            self.model_object_file_path = model_object_file_path or ModelTrainerConfig().model_object_file_path
+
+            self.preprocessor = load_object(file_path=self.preprocessor_object_file_path)
+            self.model = load_object(file_path=self.model_object_file_path)
+
+            n_features = len(self.preprocessor.feature_names_out)
+            if getattr(self.model, "n_features_in_", n_features) != n_features:
+                raise ValueError(f"The model expects {self.model.n_features_in_} features, "
+                                 f"the preprocessor produces {n_features}")
+
+            self.input_columns = self.preprocessor.input_columns
+            self._compile()
+            logging.info(f"Loaded {type(self.model).__name__} for prediction "
+                         f"({'compiled' if self.is_compiled else 'generic'} inference path)")
+
+        except Exception as e:
+            raise BankChurnException(f"Error initializing ChurnPredictor: {str(e)}", sys) from e
+
+
+    @property
+    def is_compiled(self) -> bool:
+        return self._intercept is not None
+
+
+    def _is_logistic_model(self) -> bool:
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+        if not isinstance(self.model, (LogisticRegression, SGDClassifier)):
+            return False
+        if isinstance(self.model, SGDClassifier) and self.model.loss != "log_loss":
+            return False
+        return getattr(self.model, "coef_", np.zeros((0, 0))).shape[0] == 1 and list(self.model.classes_) == [0, 1]
+
+
+    def _compile(self) -> None:
+        """
+        Fold the preprocessor into the weights of a logistic model (see the class description).
+        Category lookups of the single record path (value -> code) are prepared for every model.
+        """
+        preprocessor = self.preprocessor
+        encoded_columns = preprocessor.label_columns + preprocessor.onehot_columns
+
+        # value -> code; 3 == 3.0 == True hash alike, so ints, floats and booleans find numerical categories
+        self._code_lookups = {column: {category: code for code, category in enumerate(preprocessor.vocabularies[column])}
+                              for column in encoded_columns}
+        self._intercept = None
+
+        if not self._is_logistic_model():
+            return
+
+        coef = self.model.coef_.ravel().astype(np.float64)
+        intercept = float(self.model.intercept_[0])
+        self._feature_weights, self._feature_intercept = coef, intercept
+
+        # Weight tables: entry `code` for known categories, last entry for unknown/missing values (code -1)
+        self._tables = {}
+        for i, column in enumerate(preprocessor.label_columns):
+            n_categories = len(preprocessor.vocabularies[column])
+            self._tables[column] = np.append(coef[i] * np.arange(n_categories), -coef[i])
+
+        offset = len(preprocessor.label_columns)
+        for column in preprocessor.onehot_columns:
+            n_categories = len(preprocessor.vocabularies[column])
+            self._tables[column] = np.append(coef[offset:offset + n_categories], 0.0)
+            offset += n_categories
+
+        numerical_coef = coef[offset:]
+        scales = preprocessor.scales.astype(np.float64)
+        centers = preprocessor.centers.astype(np.float64)
+        self._numerical_weights = numerical_coef / scales
+        self._missing_contributions = self._numerical_weights * preprocessor.means.astype(np.float64)
+        self._intercept = intercept - float(np.sum(self._numerical_weights * centers))
+
+        # Single record path: value -> weight for every encoded column
+        self._weight_lookups = {column: {category: float(self._tables[column][code])
+                                         for category, code in self._code_lookups[column].items()}
+                                for column in encoded_columns}
+        self._unknown_weights = {column: float(self._tables[column][-1]) for column in encoded_columns}
+        self._numerical_items = list(zip(preprocessor.numerical_columns, self._numerical_weights.tolist(),
+                                         self._missing_contributions.tolist()))
+
+
+    def _add_numerical(self, scores: np.ndarray, i: int, values: np.ndarray) -> None:
+        # Contribution of the i-th numerical column, NaN (missing) values contribute the fitted mean
+        contributions = values * self._numerical_weights[i]
+        missing_values = np.isnan(values)
+        if missing_values.any():
+            contributions[missing_values] = self._missing_contributions[i]
+        scores += contributions
+
+
+    @staticmethod
+    def _sigmoid(scores: np.ndarray) -> np.ndarray:
+        # tanh form: no overflow for large negative scores
+        return 0.5 * (1.0 + np.tanh(0.5 * scores))
+
+
+    def predict_proba(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Churn probability of every row of a DataFrame of raw records (the preprocessor input columns).
+
+        :param dataframe: Raw records, extra columns are ignored.
+        :return: float64 vector of probabilities (decision scores for models without probabilities).
+        """
+        try:
+            missing_columns = [column for column in self.input_columns if column not in dataframe.columns]
+            if missing_columns:
+                raise ValueError(f"Columns missing for prediction: {missing_columns}")
+
+            if not self.is_compiled:
+                return predict_scores(self.model, self.preprocessor.transform(dataframe))
+
+            scores = np.full(len(dataframe), self._intercept, dtype=np.float64)
+            for column, table in self._tables.items():
+                # Code -1 (unknown or missing) reads the last entry of the table
+                scores += table[self.preprocessor._codes(dataframe[column], self.preprocessor.vocabularies[column])]
+
+            for i, column in enumerate(self.preprocessor.numerical_columns):
+                self._add_numerical(scores, i, dataframe[column].to_numpy(dtype=np.float64, na_value=np.nan))
+
+            return self._sigmoid(scores)
+
+        except Exception as e:
+            raise BankChurnException(f"Error in ChurnPredictor.predict_proba: {str(e)}", sys) from e
+
+
+    def predict(self, dataframe: DataFrame, threshold: float = 0.5) -> np.ndarray:
+        """
+        Churn label (1 = churn) of every row: probability at or above `threshold`.
+        """
+        return (self.predict_proba(dataframe) >= threshold).astype(np.int8)
+
+
+    def predict_proba_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        Churn probabilities of already preprocessed feature vectors (e.g. from the CustomerFeatureCache).
+
+        :param features: float32 matrix with the columns of `preprocessor.feature_names_out`.
+        """
+        try:
+            features = np.asarray(features, dtype=np.float32)
+            if features.ndim != 2 or features.shape[1] != len(self.preprocessor.feature_names_out):
+                raise ValueError(f"Expected {len(self.preprocessor.feature_names_out)} feature columns, got {features.shape}")
+
+            if not self.is_compiled:
+                return predict_scores(self.model, features)
+            return self._sigmoid(features @ self._feature_weights + self._feature_intercept)
+
+        except Exception as e:
+            raise BankChurnException(f"Error in ChurnPredictor.predict_proba_features: {str(e)}", sys) from e
+
+
+    def _record_features(self, record: dict) -> np.ndarray:
+        # Feature vector of one record, same layout as SchemaPreprocessor.transform
+        preprocessor = self.preprocessor
+        features = np.zeros((1, len(preprocessor.feature_names_out)), dtype=np.float32)
+
+        for i, column in enumerate(preprocessor.label_columns):
+            features[0, i] = self._code_lookups[column].get(record.get(column), -1)
+
+        offset = len(preprocessor.label_columns)
+        for column in preprocessor.onehot_columns:
+            code = self._code_lookups[column].get(record.get(column), -1)
+            if code >= 0:
+                features[0, offset + code] = 1.0
+            offset += len(preprocessor.vocabularies[column])
+
+        for i, column in enumerate(preprocessor.numerical_columns):
+            value = record.get(column)
+            value = preprocessor.means[i] if value is None or value != value else value
+            features[0, offset + i] = (value - preprocessor.centers[i]) / preprocessor.scales[i]
+
+        return features
+
+
+    def predict_one(self, record: dict) -> float:
+        """
+        Churn probability of a single raw record (dict of column -> value), without pandas.
+        Unknown categories and missing values are handled like in the batch path.
+        """
+        try:
+            if not self.is_compiled:
+                return float(predict_scores(self.model, self._record_features(record))[0])
+
+            score = self._intercept
+            for column, weights in self._weight_lookups.items():
+                score += weights.get(record.get(column), self._unknown_weights[column])
+            for column, weight, missing_contribution in self._numerical_items:
+                value = record.get(column)
+                score += missing_contribution if value is None or value != value else value * weight
+
+            # Same tanh form as the batch path
+            return 0.5 * (1.0 + math.tanh(0.5 * score))
+
+        except Exception as e:
+            raise BankChurnException(f"Error in ChurnPredictor.predict_one: {str(e)}", sys) from e
+
+
+    def predict_records(self, records: Iterable[dict]) -> np.ndarray:
+        """
+        Churn probabilities of a list of raw records (dicts), scored as one batch.
+        The compiled path reads the columns straight from the dicts: building a DataFrame costs more than
+        scoring the small batches of the scoring server.
+        """
+        try:
+            records: List[dict] = list(records)
+            if not records:
+                return np.empty(0, dtype=np.float64)
+            if not self.is_compiled:
+                return self.predict_proba(pd.DataFrame.from_records(records, columns=self.input_columns))
+            if len(records) == 1:
+                return np.array([self.predict_one(records[0])])
+
+            n_records = len(records)
+            scores = np.full(n_records, self._intercept, dtype=np.float64)
+            for column, weights in self._weight_lookups.items():
+                unknown_weight = self._unknown_weights[column]
+                scores += np.fromiter((weights.get(record.get(column), unknown_weight) for record in records),
+                                      dtype=np.float64, count=n_records)
+
+            for i, column in enumerate(self.preprocessor.numerical_columns):
+                values = np.fromiter((np.nan if value is None else value
+                                      for value in (record.get(column) for record in records)),
+                                     dtype=np.float64, count=n_records)
+                self._add_numerical(scores, i, values)
+
+            return self._sigmoid(scores)
+
+        except Exception as e:
+            raise BankChurnException(f"Error in ChurnPredictor.predict_records: {str(e)}", sys) from e
@@ -0,0 +1,372 @@
+import os
+import sys
+import math
+import time
+import multiprocessing
+import tempfile
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Tuple
+from sqlalchemy import (BigInteger, Column, DateTime, Float, MetaData, SmallInteger,
+                        String, Table, delete, insert, select, text)
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.configs.mysql_connection import HotelBookingData
+from src.core.entities.config_entity import BulkScoringConfig
+from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
+                                               ModelTrainerArtifact,
+                                               BulkScoringArtifact)
+
+from src.core.utils.helpers import read_yaml, read_json, write_json, get_file_hash
+from src.core.constants.common import DATABASE_NAME, DATASET_NAME, SCHEMA_FILE_PATH
+from src.core.constants.model import FEATURE_CACHE_KEY_COLUMN, MODEL_SERVING_THRESHOLD
+
+
+WRITE_METHODS = ("insert", "load_data")
+
+# Predictor of a scoring process, loaded once by _init_scoring_worker
+_predictor = None
+
+
+
+
+def get_predictions_table(table_name: str, key_column: str, database_name: Optional[str] = None) -> Table:
+    """
+    Predictions table: one row per customer and scoring run, keyed by (run_id, key column).
+    """
+    return Table(table_name, MetaData(),
+                 Column("run_id", String(32), primary_key=True),
+                 Column(key_column, BigInteger, primary_key=True, autoincrement=False),
+                 Column(FEATURE_CACHE_KEY_COLUMN, String(32), index=True),
+                 Column("churn_probability", Float),
+                 Column("churn", SmallInteger),
+                 Column("scored_at", DateTime),
+                 schema=database_name or DATABASE_NAME)
+
+
+def _init_scoring_worker(preprocessor_object_file_path: str, model_object_file_path: str) -> None:
+    """
+    Load the predictor once per scoring process. Workers start from a fresh interpreter and open their own
+    connections.
+    """
+    global _predictor
+    from src.model.predictor import ChurnPredictor
+
+    _predictor = ChurnPredictor(preprocessor_object_file_path=preprocessor_object_file_path,
+                                model_object_file_path=model_object_file_path)
+
+
+def _write_load_data(connection, table: Table, predictions: pd.DataFrame) -> None:
+    # LOAD DATA LOCAL INFILE needs local_infile enabled on the server and in MYSQL_ENGINE_URL
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as csv_file:
+        predictions.to_csv(csv_file, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S")
+    try:
+        connection.execute(text(f"LOAD DATA LOCAL INFILE :file_path INTO TABLE {table.schema}.{table.name} "
+                                f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                                f"({', '.join(predictions.columns)})"),
+                           {"file_path": csv_file.name})
+    finally:
+        os.remove(csv_file.name)
+
+
+def _score_partition(dataset_name: str, partition_column: str, partition_range: Tuple[Any, Any, bool],
+                     table_name: str, run_id: str, scored_at: datetime, threshold: float,
+                     write_method: str, insert_batch_rows: int) -> dict:
+    """
+    Read one key range of the source table, score it and write its predictions (runs in a scoring process).
+    Every partition is read and written over the process' own connections, so reading, scoring and writing
+    of different partitions overlap across the pool.
+    """
+    timings = {}
+    table = get_predictions_table(table_name, partition_column)
+
+    start = time.perf_counter()
+    hotel_booking_data = HotelBookingData()
+    customers = hotel_booking_data.export_partition(dataset_name, partition_column=partition_column,
+                                                    partition_range=partition_range)
+    timings["read_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    probabilities = _predictor.predict_proba(customers)
+    predictions = pd.DataFrame({"run_id": run_id,
+                                partition_column: customers[partition_column].to_numpy(dtype=np.int64),
+                                FEATURE_CACHE_KEY_COLUMN: customers[FEATURE_CACHE_KEY_COLUMN].astype(str).to_numpy(),
+                                "churn_probability": probabilities,
+                                "churn": (probabilities >= threshold).astype(np.int8),
+                                "scored_at": scored_at})
+    timings["score_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with hotel_booking_data.mysql_connect.connect() as connection:
+        if write_method == "load_data" and connection.dialect.name == "mysql":
+            _write_load_data(connection, table, predictions)
+        else:
+            # SQLAlchemy sends executemany inserts as multi-row INSERT ... VALUES statements (insertmanyvalues)
+            records = predictions.to_dict("records")
+            connection = connection.execution_options(insertmanyvalues_page_size=insert_batch_rows)
+            for batch_start in range(0, len(records), insert_batch_rows):
+                connection.execute(insert(table), records[batch_start:batch_start + insert_batch_rows])
+        connection.commit()
+    timings["write_seconds"] = time.perf_counter() - start
+
+    return {"rows": len(predictions),
+            "churned": int(predictions["churn"].sum()),
+            "probability_sum": float(probabilities.sum()),
+            **timings}
+
+
+
+
+class BulkScoring:
+    """
+    Class Name :   BulkScoring
+    Description :   Scores the whole customer table with the fitted preprocessor and the trained model and
+                    writes the predictions back to MySQL.
+
+                    The table is split into key ranges of about `chunk_rows` customers on the partition column
+                    of the schema. Every range is a task of a process pool: the worker reads it over its own
+                    pooled connection, scores it with one vectorized ChurnPredictor call and writes it with
+                    multi-row INSERTs (or LOAD DATA LOCAL INFILE), so neither the table nor its predictions
+                    are ever held by one process. At most `2 * max_workers` ranges are in flight.
+
+                    Each run writes its rows under a new run_id into the predictions table; the rows of a
+                    failed run are deleted, and after a successful run only the latest `keep_runs` runs are kept.
+
+    Output      :   Predictions table rows and a scoring report
+    On Failure  :   Write an exception log and then raise an exception
+    """
+
+    def __init__(self, data_preprocessing_artifact: DataPreprocessingArtifact,
+                 model_trainer_artifact: ModelTrainerArtifact,
+                 bulk_scoring_config: Optional[BulkScoringConfig] = None):
+        try:
+            logging.info("")
+            logging.info("- - - Started Bulk Scoring Stage: - - -")
+            logging.info("- "*50)
+
+            self.data_preprocessing_artifact = data_preprocessing_artifact
+            self.model_trainer_artifact = model_trainer_artifact
+            self.bulk_scoring_config = bulk_scoring_config = bulk_scoring_config or BulkScoringConfig()
+
+            if bulk_scoring_config.write_method not in WRITE_METHODS:
+                raise ValueError(f"Unknown write method '{bulk_scoring_config.write_method}', expected one of {WRITE_METHODS}")
+            if bulk_scoring_config.keep_runs < 1:
+                raise ValueError("keep_runs must be at least 1")
+
+            schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+            self.partition_column = schema_config.get("partition_column") or schema_config.get("watermark_column")
+            self.watermark_column = schema_config.get("watermark_column")
+            if not self.partition_column:
+                raise ValueError("Bulk scoring needs a numeric partition_column (or watermark_column) in the schema")
+
+            self.hotel_booking_data = HotelBookingData()
+            self.table = get_predictions_table(bulk_scoring_config.predictions_table, self.partition_column)
+
+        except Exception as e:
+            logging.error(f"Error in BulkScoring initialization: {str(e)}")
+            raise BankChurnException(f"Error during BulkScoring initialization: {str(e)}", sys) from e
+
+
+    def get_source_snapshot(self) -> dict:
+        """
+        Method Name :   get_source_snapshot
+        Description :   This method summarises the source table (row count and maximum of the watermark column),
+                        an input of the stage fingerprint: the base is rescored when it changed.
+
+        Output      :   Dictionary describing the table snapshot.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            return self.hotel_booking_data.get_table_snapshot(dataset_name=DATASET_NAME,
+                                                              watermark_column=self.watermark_column)
+        except Exception as e:
+            logging.error(f"Error in get_source_snapshot: {str(e)}")
+            raise BankChurnException(f"Error in get_source_snapshot: {str(e)}", sys) from e
+
+
+    def get_partition_ranges(self, row_count: int) -> list:
+        """
+        Method Name :   get_partition_ranges
+        Description :   This method splits the key range of the partition column into ranges of about
+                        `chunk_rows` customers (evenly spaced keys such as RowNumber give even ranges).
+
+        Output      :   List of (lower, upper, include_upper) key ranges.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            n_partitions = max(1, math.ceil(row_count / self.bulk_scoring_config.chunk_rows))
+            return self.hotel_booking_data.get_partition_ranges(dataset_name=DATASET_NAME,
+                                                                partition_column=self.partition_column,
+                                                                n_partitions=n_partitions)
+        except Exception as e:
+            logging.error(f"Error in get_partition_ranges: {str(e)}")
+            raise BankChurnException(f"Error in get_partition_ranges: {str(e)}", sys) from e
+
+
+    def delete_run(self, run_id: str) -> None:
+        """
+        Method Name :   delete_run
+        Description :   This method deletes the predictions written by a scoring run.
+        """
+        with self.hotel_booking_data.mysql_connect.connect() as connection:
+            connection.execute(delete(self.table).where(self.table.c.run_id == run_id))
+            connection.commit()
+
+
+    def delete_previous_runs(self, run_id: str) -> list:
+        """
+        Method Name :   delete_previous_runs
+        Description :   This method deletes the predictions of the runs older than the latest `keep_runs` runs
+                        (run ids start with the scoring time, so they sort chronologically), so the table does
+                        not grow by the whole customer base on every run.
+
+        Output      :   List of the deleted run ids.
+        """
+        with self.hotel_booking_data.mysql_connect.connect() as connection:
+            run_ids = connection.execute(select(self.table.c.run_id).distinct()
+                                         .where(self.table.c.run_id != run_id)
+                                         .order_by(self.table.c.run_id.desc())).scalars().all()
+            deleted_run_ids = run_ids[max(0, self.bulk_scoring_config.keep_runs - 1):]
+            if deleted_run_ids:
+                connection.execute(delete(self.table).where(self.table.c.run_id.in_(deleted_run_ids)))
+                connection.commit()
+
+        return deleted_run_ids
+
+
+    def score_partitions(self, partition_ranges: list, run_id: str, scored_at: datetime) -> dict:
+        """
+        Method Name :   score_partitions
+        Description :   This method scores the key ranges on the process pool (in this process with one worker)
+                        and sums up the rows and timings of the tasks.
+
+        Output      :   Dictionary of totals (rows, churned, probability_sum, read/score/write seconds).
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.bulk_scoring_config
+            initargs = (self.data_preprocessing_artifact.preprocessor_object_file_path,
+                        self.model_trainer_artifact.model_object_file_path)
+            task_args = (DATASET_NAME, self.partition_column)
+            task_kwargs = dict(table_name=self.table.name, run_id=run_id, scored_at=scored_at, threshold=MODEL_SERVING_THRESHOLD,
+                               write_method=config.write_method, insert_batch_rows=config.insert_batch_rows)
+
+            totals = {"rows": 0, "churned": 0, "probability_sum": 0.0,
+                      "read_seconds": 0.0, "score_seconds": 0.0, "write_seconds": 0.0}
+
+            def add(result: dict) -> None:
+                for name in totals:
+                    totals[name] += result[name]
+                logging.info(f"Scored {totals['rows']} customers")
+
+            max_workers = max(1, min(config.max_workers, len(partition_ranges)))
+            if max_workers == 1:
+                _init_scoring_worker(*initargs)
+                for partition_range in partition_ranges:
+                    add(_score_partition(*task_args, partition_range, **task_kwargs))
+                return totals
+
+            # Fresh workers from a fork server: the pipeline runs other stages on threads meanwhile,
+            # forking would copy their threads and locks
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_scoring_worker, initargs=initargs,
+                                     mp_context=multiprocessing.get_context(start_method)) as executor:
+                pending = deque()
+                for partition_range in partition_ranges:
+                    pending.append(executor.submit(_score_partition, *task_args, partition_range, **task_kwargs))
+
+                    # Bounded number of ranges in flight, results are collected in key order
+                    if len(pending) >= 2 * max_workers:
+                        add(pending.popleft().result())
+
+                while pending:
+                    add(pending.popleft().result())
+
+            return totals
+
+        except Exception as e:
+            logging.error(f"Error in score_partitions: {str(e)}")
+            raise BankChurnException(f"Error in score_partitions: {str(e)}", sys) from e
+
+
+    def initiate_bulk_scoring(self) -> BulkScoringArtifact:
+        """
+        Method Name :   initiate_bulk_scoring
+        Description :   This method rescores the whole customer table into the predictions table
+                        and writes the scoring report.
+
+        Output      :   BulkScoringArtifact with the run id, the predictions table and the report path.
+        On Failure  :   Write an exception log, delete the rows of the run and then raise an exception
+        """
+        logging.info("Entered initiate_bulk_scoring method of BulkScoring class")
+
+        run_id = None
+        try:
+            config = self.bulk_scoring_config
+            start = time.perf_counter()
+            scored_at = datetime.now().replace(microsecond=0)
+            model_hash = get_file_hash(self.model_trainer_artifact.model_object_file_path)
+            run_id = f"{scored_at:%Y%m%d%H%M%S}-{model_hash[:8]}"
+
+            self.table.create(self.hotel_booking_data.mysql_connect.engine, checkfirst=True)
+
+            snapshot = self.get_source_snapshot()
+            partition_ranges = self.get_partition_ranges(snapshot["row_count"])
+            logging.info(f"Scoring {snapshot['row_count']} customers in {len(partition_ranges)} ranges of "
+                         f"{self.partition_column} with {config.max_workers} workers (run {run_id})")
+
+            totals = self.score_partitions(partition_ranges, run_id, scored_at)
+            seconds = time.perf_counter() - start
+
+            deleted_run_ids = self.delete_previous_runs(run_id)
+            if deleted_run_ids:
+                logging.info(f"Deleted the predictions of {len(deleted_run_ids)} previous runs "
+                             f"(keeping the latest {config.keep_runs})")
+
+            params = read_json(file_path=self.model_trainer_artifact.best_model_params_file_path)
+            report = {"run_id": run_id,
+                      "scored_at": scored_at.isoformat(),
+                      "predictions_table": f"{self.table.schema}.{self.table.name}",
+                      "source": snapshot,
+                      "model": params.get("model"),
+                      "model_hash": model_hash,
+                      "threshold": MODEL_SERVING_THRESHOLD,
+                      "write_method": config.write_method,
+                      "n_partitions": len(partition_ranges),
+                      "max_workers": config.max_workers,
+                      "rows": totals["rows"],
+                      "deleted_runs": deleted_run_ids,
+                      "churn_rate": totals["churned"] / totals["rows"] if totals["rows"] else 0.0,
+                      "mean_probability": totals["probability_sum"] / totals["rows"] if totals["rows"] else 0.0,
+                      "seconds": seconds,
+                      "rows_per_second": totals["rows"] / seconds if seconds else 0.0,
+                      # Summed over the workers
+                      "read_seconds": totals["read_seconds"],
+                      "score_seconds": totals["score_seconds"],
+                      "write_seconds": totals["write_seconds"]}
+            write_json(file_path=config.report_file_path, data=report, replace=True)
+            logging.info(f"Scored {totals['rows']} customers in {seconds:.1f}s "
+                         f"({report['rows_per_second']:,.0f} rows/s), report saved at {config.report_file_path}")
+
+            bulk_scoring_artifact = BulkScoringArtifact(run_id=run_id,
+                                                        predictions_table=report["predictions_table"],
+                                                        report_file_path=config.report_file_path)
+            logging.info(f"Bulk scoring artifact: {bulk_scoring_artifact}")
+
+            logging.info("Exited initiate_bulk_scoring method of BulkScoring class")
+            return bulk_scoring_artifact
+
+        except Exception as e:
+            logging.error(f"Error in initiate_bulk_scoring: {str(e)}")
+            if run_id is not None:
+                try:
+                    self.delete_run(run_id)
+                except Exception as cleanup_error:
+                    logging.error(f"Rows of the failed scoring run {run_id} could not be deleted: {str(cleanup_error)}")
+            raise BankChurnException(f"Error in initiate_bulk_scoring: {str(e)}", sys) from e
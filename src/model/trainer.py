@@ -0,0 +1,505 @@
+import os
+import sys
+import copy
+import math
+import time
+import importlib
+import multiprocessing
+
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.entities.config_entity import ModelTrainerConfig
+from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
+                                               DataSplitArtifact,
+                                               ModelTrainerArtifact)
+
+from src.core.utils.helpers import (read_yaml, read_json, write_json,
+                                    save_object, load_object)
+from src.core.utils.feature_store import FeatureStore
+from src.core.constants.common import MODEL_FILE_PATH
+from src.data.split import DataSplit
+
+
+
+
+def sample_value(space, rng: np.random.Generator):
+    """
+    Draw one value from a search space entry of settings/model.yaml (list, {low, high[, log|int]} or constant).
+    """
+    if isinstance(space, list):
+        return space[int(rng.integers(len(space)))]
+    if isinstance(space, dict):
+        low, high = space["low"], space["high"]
+        if space.get("int"):
+            return int(rng.integers(low, high + 1))
+        if space.get("log"):
+            return float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        return float(rng.uniform(low, high))
+    return space
+
+
+def build_model(model_class: str, params: dict):
+    """
+    Instantiate an estimator from its dotted class path (e.g. sklearn.linear_model.LogisticRegression).
+    """
+    module_name, class_name = model_class.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)(**params)
+
+
+def predict_scores(model, X: np.ndarray) -> np.ndarray:
+    """
+    Positive class score: probability when the model has predict_proba, decision function otherwise.
+    """
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)[:, 1]
+    return model.decision_function(X)
+
+
+def score_model(model, X: np.ndarray, y: np.ndarray) -> dict:
+    """
+    Classification metrics of a fitted model (threshold 0.5 for the label based ones).
+    """
+    from sklearn.metrics import (accuracy_score, average_precision_score, f1_score,
+                                 precision_score, recall_score, roc_auc_score)
+
+    scores = predict_scores(model, X)
+    predictions = model.predict(X)
+    return {"roc_auc": float(roc_auc_score(y, scores)),
+            "average_precision": float(average_precision_score(y, scores)),
+            "accuracy": float(accuracy_score(y, predictions)),
+            "precision": float(precision_score(y, predictions, zero_division=0)),
+            "recall": float(recall_score(y, predictions, zero_division=0)),
+            "f1": float(f1_score(y, predictions, zero_division=0))}
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> None:
+    # Kill the worker processes of the pool (ProcessPoolExecutor.terminate_workers from Python 3.14)
+    if hasattr(executor, "terminate_workers"):
+        executor.terminate_workers()
+        return
+    for process in list((executor._processes or {}).values()):
+        if process.is_alive():
+            process.terminate()
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _evaluate_configuration(feature_store: FeatureStore, fit_indices: np.ndarray, validation_indices: np.ndarray,
+                            model_class: str, params: dict, scoring: str) -> dict:
+    # Runs in a search worker: the feature store is memory-mapped again there (only its paths were pickled)
+    # and native thread pools are limited to one thread, the parallelism comes from the worker processes
+    from threadpoolctl import threadpool_limits
+
+    started_at = time.perf_counter()
+    with threadpool_limits(limits=1):
+        model = build_model(model_class, params)
+        model.fit(*feature_store.get_split(fit_indices))
+        score = score_model(model, *feature_store.get_split(validation_indices))[scoring]
+
+    return {"score": score, "fit_time": time.perf_counter() - started_at}
+
+
+
+
+class ModelTrainer:
+    """
+    Class Name :   ModelTrainer
+    Description :   Searches the candidate models and hyperparameters of settings/model.yaml with successive
+                    halving: configurations sampled from the search spaces are trained on a few tuning rows,
+                    the best 1/reduction_factor are kept and trained again on reduction_factor times more rows,
+                    until the full tuning set. Poor configurations are dropped after cheap fits, and every rung
+                    runs on a process pool sharing the memory-mapped feature store, so the search scales with
+                    the number of cores.
+
+                    The search stops at the wall-clock `time_budget`: configurations still queued are cancelled,
+                    the workers still fitting are terminated, and the winner is the best configuration of the highest rung reached. The winner is then
+                    refitted on all training rows and scored on the test rows.
+
+                    Incremental mode: when the feature store only grew by appended rows since the previous
+                    model was trained (same frozen preprocessor, split extended), the previous model is updated
+                    with the new training rows only, with partial_fit or a warm start as declared in
+                    settings/model.yaml, so a retrain costs time proportional to the delta. Any other change
+                    (drift, refitted preprocessor, new split, model without incremental support) runs the
+                    full search.
+
+    Output      :   model.pkl, params.json and metrics.json
+    On Failure  :   Write an exception log and then raise an exception
+    """
+
+    def __init__(self,
+                 data_preprocessing_artifact: DataPreprocessingArtifact,
+                 data_split_artifact: DataSplitArtifact,
+                 model_trainer_config: ModelTrainerConfig):
+        """
+        :param data_preprocessing_artifact: Output reference of data preprocessing artifact stage
+        :param data_split_artifact: Output reference of data split artifact stage
+        :param model_trainer_config: configuration for model trainer
+        """
+        try:
+            logging.info("")
+            logging.info("- - - Started Model Trainer Stage: - - -")
+            logging.info("- "*50)
+
+            self.data_preprocessing_artifact = data_preprocessing_artifact
+            self.data_split_artifact = data_split_artifact
+            self.model_trainer_config = model_trainer_config
+            self.feature_store = FeatureStore.from_artifact(data_preprocessing_artifact)
+
+            self._model_config = read_yaml(file_path=MODEL_FILE_PATH)
+            self.search_config = self._model_config["search"]
+            self.models = self._model_config["models"]
+
+        except Exception as e:
+            logging.error(f"Error in ModelTrainer initialization: {str(e)}")
+            raise BankChurnException(f"Error during ModelTrainer initialization: {str(e)}", sys) from e
+
+
+
+    def get_tuning_rows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Method Name :   get_tuning_rows
+        Description :   This method splits the tuning rows (all training rows when the split has no tuning set)
+                        into fit rows and validation rows, the validation rows being those of `validation_fold`.
+
+        Output      :   Tuple of feature store row indices (fit_indices, validation_indices).
+        """
+        train_indices = np.asarray(DataSplit.load_indices(self.data_split_artifact, "train"))
+        tune_indices = np.asarray(DataSplit.load_indices(self.data_split_artifact, "tune"))
+        folds = np.load(self.data_split_artifact.folds_file_path)
+
+        in_tuning = np.isin(train_indices, tune_indices) if len(tune_indices) else np.ones(len(train_indices), dtype=bool)
+        in_validation = folds == self.search_config.get("validation_fold", 0)
+
+        return train_indices[in_tuning & ~in_validation], train_indices[in_tuning & in_validation]
+
+
+
+    def sample_configurations(self, rng: np.random.Generator) -> List[dict]:
+        """
+        Method Name :   sample_configurations
+        Description :   This method samples `n_configurations` configurations, cycling over the candidate
+                        models so each model gets the same share (also when the budget cuts the first rung).
+
+        Output      :   List of configurations {"id", "model", "class", "params"}.
+        """
+        model_names = list(self.models)
+        configurations = []
+        for configuration_id in range(self.search_config["n_configurations"]):
+            model_name = model_names[configuration_id % len(model_names)]
+            model_spec = self.models[model_name]
+            params = dict(model_spec.get("params") or {})
+            params.update({name: sample_value(space, rng) for name, space in (model_spec.get("search_space") or {}).items()})
+            configurations.append({"id": configuration_id, "model": model_name,
+                                   "class": model_spec["class"], "params": params})
+        return configurations
+
+
+
+    def get_rung_rows(self, n_configurations: int, max_rows: int) -> List[int]:
+        """
+        Method Name :   get_rung_rows
+        Description :   Training rows of every rung: max_rows / eta^k down to `min_rows` (eta = reduction_factor).
+                        There are as many rungs as halvings of the configurations, but no more than the row
+                        range allows, so no two rungs train on the same rows.
+        """
+        eta = self.search_config["reduction_factor"]
+        min_rows = min(self.search_config["min_rows"], max_rows)
+        n_rungs = min(1 + int(math.floor(math.log(max(n_configurations, 1), eta))),
+                      1 + int(math.ceil(math.log(max_rows / max(min_rows, 1), eta))))
+        return [max(min_rows, int(max_rows / eta ** (n_rungs - 1 - rung))) for rung in range(n_rungs)]
+
+
+
+    def successive_halving(self, configurations: List[dict], fit_indices: np.ndarray,
+                           validation_indices: np.ndarray, rng: np.random.Generator) -> dict:
+        """
+        Method Name :   successive_halving
+        Description :   This method runs the rungs of the search on a process pool within the time budget.
+                        The rows of a rung are a prefix of one shuffled order of the fit rows, so every rung
+                        trains on a superset of the rows of the previous one.
+
+        Output      :   Search result with the winner configuration, its validation score and the rung trace.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.model_trainer_config
+            eta = self.search_config["reduction_factor"]
+            scoring = self.search_config["scoring"]
+            shuffled_indices = rng.permutation(fit_indices)
+            rung_rows = self.get_rung_rows(len(configurations), len(shuffled_indices))
+
+            started_at = time.monotonic()
+            deadline = started_at + config.time_budget
+            scores, trace, budget_exhausted = {}, [], False
+            survivors = configurations
+
+            # Fresh workers from a fork server: forking the trainer would copy its threads and locks
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            executor = ProcessPoolExecutor(max_workers=max(1, min(config.max_workers, len(configurations))),
+                                           mp_context=multiprocessing.get_context(start_method))
+            try:
+                for rung, n_rows in enumerate(rung_rows):
+                    rows = shuffled_indices[:n_rows]
+                    futures = {executor.submit(_evaluate_configuration, self.feature_store, rows, validation_indices,
+                                               configuration["class"], configuration["params"], scoring): configuration
+                               for configuration in survivors}
+
+                    rung_scores, pending = {}, set(futures)
+                    while pending:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            budget_exhausted = True
+                            break
+                        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            configuration = futures[future]
+                            try:
+                                rung_scores[configuration["id"]] = future.result()["score"]
+                            except Exception as e:
+                                logging.warning(f"Configuration {configuration['id']} ({configuration['model']}) "
+                                                f"failed on {n_rows} rows: {str(e)}")
+
+                    for future in pending:
+                        future.cancel()
+
+                    trace.append({"rung": rung, "rows": int(n_rows), "configurations": len(survivors),
+                                  "completed": len(rung_scores),
+                                  "best_score": max(rung_scores.values()) if rung_scores else None,
+                                  "elapsed": round(time.monotonic() - started_at, 3)})
+                    logging.info(f"Rung {rung}: {len(rung_scores)}/{len(survivors)} configurations on {n_rows} rows, "
+                                 f"best {scoring} {trace[-1]['best_score']}")
+
+                    if rung_scores:
+                        scores = rung_scores
+                    if budget_exhausted or not rung_scores:
+                        break
+
+                    ranked = sorted(rung_scores, key=rung_scores.get, reverse=True)
+                    keep = set(ranked[:max(1, math.ceil(len(survivors) / eta))])
+                    survivors = [configuration for configuration in survivors if configuration["id"] in keep]
+
+            finally:
+                # Fits still running when the budget runs out are killed, their results would be discarded anyway
+                if budget_exhausted:
+                    _terminate_workers(executor)
+                else:
+                    executor.shutdown(wait=True, cancel_futures=True)
+
+            if not scores:
+                raise RuntimeError(f"No configuration finished within the time budget of {config.time_budget}s")
+
+            best_id = max(scores, key=scores.get)
+            if budget_exhausted:
+                logging.warning(f"Search time budget of {config.time_budget}s exhausted after {len(trace)} rungs")
+
+            return {"winner": configurations[best_id],
+                    "validation_score": scores[best_id],
+                    "rungs": trace,
+                    "budget_exhausted": budget_exhausted,
+                    "elapsed": round(time.monotonic() - started_at, 3)}
+
+        except Exception as e:
+            logging.error(f"Error in successive_halving: {str(e)}")
+            raise BankChurnException(f"Error in successive_halving: {str(e)}", sys) from e
+
+
+
+    def fit_best_model(self, winner: dict) -> Tuple[object, dict]:
+        """
+        Method Name :   fit_best_model
+        Description :   This method refits the winning configuration on all training rows and scores it on
+                        the test rows.
+
+        Output      :   Tuple of (fitted model, test metrics).
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            train_indices = DataSplit.load_indices(self.data_split_artifact, "train")
+            test_indices = DataSplit.load_indices(self.data_split_artifact, "test")
+
+            started_at = time.perf_counter()
+            model = build_model(winner["class"], winner["params"])
+            model.fit(*self.feature_store.get_split(train_indices))
+            fit_time = time.perf_counter() - started_at
+
+            metrics = score_model(model, *self.feature_store.get_split(test_indices))
+            metrics["fit_time"] = round(fit_time, 3)
+            return model, metrics
+
+        except Exception as e:
+            logging.error(f"Error in fit_best_model: {str(e)}")
+            raise BankChurnException(f"Error in fit_best_model: {str(e)}", sys) from e
+
+
+
+    def get_previous_training(self) -> Optional[dict]:
+        """
+        Method Name :   get_previous_training
+        Description :   This method returns the parameters of the previous model when it can be updated
+                        incrementally: the current feature store was appended to the exact store the model was
+                        trained on, the current split extends the split it was trained with, and its model
+                        declares an `incremental` method in settings/model.yaml.
+
+        Output      :   Previous params.json content, None when a full search is needed.
+        """
+        config = self.model_trainer_config
+        if not (config.incremental and os.path.exists(config.model_object_file_path)
+                and os.path.exists(config.best_model_params_file_path)):
+            return None
+
+        previous = read_json(file_path=config.best_model_params_file_path)
+        base = self.feature_store.manifest.get("base") or {}
+        split_manifest = read_json(file_path=self.data_split_artifact.manifest_file_path)
+
+        reasons = {"feature store was rebuilt": base.get("fingerprint") != previous.get("dataset_fingerprint")
+                                                or base.get("n_rows") != previous.get("n_rows"),
+                   "split was recomputed": split_manifest.get("base_split_id") != previous.get("split_id"),
+                   "model has no incremental method": not self.models.get(previous.get("model"), {}).get("incremental")}
+        reasons = [reason for reason, applies in reasons.items() if applies]
+        if reasons:
+            logging.info(f"Full retrain: {', '.join(reasons)}")
+            return None
+
+        return previous
+
+
+
+    def update_model(self, previous: dict) -> Optional[Tuple[object, dict]]:
+        """
+        Method Name :   update_model
+        Description :   This method updates the previous model with the training rows appended since it was
+                        trained:
+
+                          - partial_fit    : one partial_fit pass over the new rows (SGD linear models)
+                          - <parameter>    : warm start, the ensemble size parameter grows by `warm_start_share`
+                                             and the added trees/iterations are fitted on the new rows
+
+                        Warm starts need both classes among the new rows, otherwise the full search runs.
+
+        Output      :   Tuple of (updated model, update summary), None when the model cannot be updated.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.model_trainer_config
+            method = self.models[previous["model"]]["incremental"]
+
+            train_indices = np.asarray(DataSplit.load_indices(self.data_split_artifact, "train"))
+            new_indices = train_indices[train_indices >= previous["n_rows"]]
+            X_new, y_new = self.feature_store.get_split(new_indices)
+
+            # load_object is memoized: the cached model must not be modified in place
+            model = copy.deepcopy(load_object(file_path=config.model_object_file_path))
+
+            started_at = time.perf_counter()
+            update = {}
+            if not len(new_indices):
+                logging.info("No new training rows, the previous model is kept")
+            elif method == "partial_fit":
+                model.partial_fit(X_new, y_new)
+            else:
+                if len(np.unique(y_new)) < 2:
+                    logging.info("New training rows hold a single class, a warm start is not possible")
+                    return None
+                size = model.get_params()[method]
+                added = max(1, math.ceil(size * config.warm_start_share))
+                model.set_params(warm_start=True, **{method: size + added})
+                model.fit(X_new, y_new)
+                model.set_params(warm_start=False)
+                update = {method: size + added}
+
+            summary = {"method": method, "new_rows": int(len(new_indices)),
+                       "fit_time": round(time.perf_counter() - started_at, 3), "params": update}
+            logging.info(f"Updated the previous {previous['model']} with {len(new_indices)} new rows ({method})")
+            return model, summary
+
+        except Exception as e:
+            logging.error(f"Error in update_model: {str(e)}")
+            raise BankChurnException(f"Error in update_model: {str(e)}", sys) from e
+
+
+
+    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+        """
+        Method Name :   initiate_model_trainer
+        Description :   This method updates the previous model with the new rows when possible, otherwise runs
+                        the hyperparameter search and refits the winner on the training rows, then saves the
+                        model, its parameters and its metrics.
+
+        Output      :   Returns the model trainer artifact.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered initiate_model_trainer method of ModelTrainer class")
+
+        try:
+            config = self.model_trainer_config
+
+            previous = self.get_previous_training()
+            updated = self.update_model(previous) if previous else None
+
+            if updated:
+                model, update = updated
+                winner = {"model": previous["model"], "class": previous["class"],
+                          "params": {**previous["params"], **update["params"]}}
+                test_metrics = score_model(model, *self.feature_store.get_split(
+                    DataSplit.load_indices(self.data_split_artifact, "test")))
+                training = {"mode": "incremental", "updates": previous.get("updates", 0) + 1, "update": update}
+                metrics = {"validation": read_json(file_path=config.best_model_metrics_file_path).get("validation")}
+            else:
+                rng = np.random.default_rng(self.search_config.get("random_state"))
+
+                fit_indices, validation_indices = self.get_tuning_rows()
+                configurations = self.sample_configurations(rng)
+                logging.info(f"Searching {len(configurations)} configurations of {list(self.models)} on "
+                             f"{len(fit_indices)} tuning rows ({len(validation_indices)} validation rows) with "
+                             f"{config.max_workers} workers and a {config.time_budget}s budget")
+
+                search = self.successive_halving(configurations, fit_indices, validation_indices, rng)
+                winner = search["winner"]
+                logging.info(f"Best configuration: {winner['model']} {winner['params']} "
+                             f"({self.search_config['scoring']} {search['validation_score']:.4f})")
+
+                model, test_metrics = self.fit_best_model(winner)
+                training = {"mode": "full", "updates": 0}
+                metrics = {"validation": {self.search_config["scoring"]: search["validation_score"]},
+                           "search": {"scoring": self.search_config["scoring"],
+                                      "n_configurations": len(configurations),
+                                      "reduction_factor": self.search_config["reduction_factor"],
+                                      "time_budget": config.time_budget,
+                                      "budget_exhausted": search["budget_exhausted"],
+                                      "elapsed": search["elapsed"],
+                                      "max_workers": config.max_workers,
+                                      "rungs": search["rungs"]}}
+            logging.info(f"Test metrics of the {training['mode']} model: {test_metrics}")
+
+            save_object(file_path=config.model_object_file_path, obj=model)
+            write_json(file_path=config.best_model_params_file_path,
+                       data={"model": winner["model"],
+                             "class": winner["class"],
+                             "params": winner["params"],
+                             "split_id": self.data_split_artifact.split_id,
+                             "dataset_fingerprint": self.feature_store.fingerprint,
+                             "n_rows": len(self.feature_store),
+                             "preprocessor_id": self.feature_store.manifest.get("preprocessor_id"),
+                             "feature_names": self.feature_store.columns,
+                             **training},
+                       replace=True)
+            write_json(file_path=config.best_model_metrics_file_path,
+                       data={"test": test_metrics, **metrics, "training": training},
+                       replace=True)
+
+            model_trainer_artifact = ModelTrainerArtifact(model_object_file_path=config.model_object_file_path,
+                                                          best_model_params_file_path=config.best_model_params_file_path,
+                                                          best_model_metrics_file_path=config.best_model_metrics_file_path)
+
+            logging.info(f"Model trainer artifact: {model_trainer_artifact}")
+            logging.info("Exited initiate_model_trainer method of ModelTrainer class")
+
+            return model_trainer_artifact
+
+        except Exception as e:
+            logging.error(f"Error in initiate_model_trainer: {str(e)}")
+            raise BankChurnException(f"Error in initiate_model_trainer: {str(e)}", sys) from e
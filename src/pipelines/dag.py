@@ -0,0 +1,251 @@
+# DAG scheduler for the pipeline stages (artifact dataclasses are the typed edges)
+
+import sys
+import time
+import dataclasses
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, get_type_hints
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, ThreadPoolExecutor, wait)
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.entities import artifact_entity
+from src.core.constants.common import PIPELINE_MAX_WORKERS
+
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable
+    executor: str = "thread"  # "thread" (I/O bound, shares memory) or "process" (CPU bound, picklable stages only)
+    produces: Optional[type] = None
+    inputs: Dict[str, type] = field(default_factory=dict)  # parameter name -> artifact type
+    depends_on: List[str] = field(default_factory=list)
+
+
+def _is_artifact_type(type_hint: object) -> bool:
+    # Only the artifact dataclasses are edges, other annotated parameters (flags, configs) are not inputs
+    return (isinstance(type_hint, type) and dataclasses.is_dataclass(type_hint)
+            and type_hint.__module__ == artifact_entity.__name__)
+
+
+def _timed_call(func: Callable, kwargs: dict) -> tuple:
+    # Runs in the worker; wall clock timestamps are comparable across processes
+    started_at = time.time()
+    result = func(**kwargs)
+    return result, started_at, time.time()
+
+
+
+class PipelineDAG:
+    """
+    Class Name :   PipelineDAG
+    Description :   Schedules pipeline stages as a directed acyclic graph. The edges come from the type hints
+                    of the stage callables: a stage returning `DataIngestionArtifact` feeds every stage with a
+                    parameter annotated `DataIngestionArtifact`. A stage starts as soon as all of its inputs
+                    exist, so independent stages run concurrently on a thread pool (or a process pool for
+                    CPU bound stages) and the wall time is bounded by the longest dependency chain, which
+                    is reported as the critical path.
+
+    Output      :   Run report with per-stage timings and the critical path
+    On Failure  :   Raises an exception once the running stages have finished; stages not started are cancelled
+    """
+
+    EXECUTORS = ("thread", "process")
+
+    def __init__(self, max_workers: int = PIPELINE_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+
+
+    def add_stage(self, name: str, func: Callable, executor: str = "thread") -> "PipelineDAG":
+        """
+        Register a stage. Its parameters annotated with an artifact dataclass of
+        src.core.entities.artifact_entity become its inputs and its return annotation, when it is one,
+        the artifact it produces. Other annotations are ignored.
+
+        :param name: Unique stage name.
+        :param func: Stage callable (e.g. a bound DataPipeline.start_* method).
+        :param executor: "thread" or "process".
+        :return: The DAG, so calls can be chained.
+        """
+        try:
+            if name in self.stages:
+                raise ValueError(f"Stage '{name}' is already registered")
+            if executor not in self.EXECUTORS:
+                raise ValueError(f"Unknown executor '{executor}' for stage '{name}', expected one of {self.EXECUTORS}")
+
+            type_hints = get_type_hints(func)
+            produces = type_hints.pop("return", None)
+            self.stages[name] = Stage(name=name, func=func, executor=executor,
+                                      produces=produces if _is_artifact_type(produces) else None,
+                                      inputs={parameter: type_hint for parameter, type_hint in type_hints.items()
+                                              if _is_artifact_type(type_hint)})
+            return self
+
+        except Exception as e:
+            raise BankChurnException(f"Error adding stage {name}: {str(e)}", sys) from e
+
+
+    def build(self) -> List[str]:
+        """
+        Resolve the typed edges and return the stages in topological order.
+
+        Raises when an input type has no producer, is produced by several stages or the graph has a cycle.
+        """
+        try:
+            producers = {}
+            for stage in self.stages.values():
+                if stage.produces is None:
+                    continue
+                if stage.produces in producers:
+                    raise ValueError(f"{stage.produces.__name__} is produced by both '{producers[stage.produces]}' "
+                                     f"and '{stage.name}'")
+                producers[stage.produces] = stage.name
+
+            for stage in self.stages.values():
+                missing = [f"{parameter}: {artifact_type.__name__}" for parameter, artifact_type in stage.inputs.items()
+                           if artifact_type not in producers]
+                if missing:
+                    raise ValueError(f"No stage produces the inputs of '{stage.name}' ({', '.join(missing)})")
+                stage.depends_on = [producers[artifact_type] for artifact_type in stage.inputs.values()]
+
+            # Kahn's algorithm, keeping the registration order among ready stages
+            in_degree = {name: len(set(stage.depends_on)) for name, stage in self.stages.items()}
+            order = []
+            ready = [name for name, degree in in_degree.items() if degree == 0]
+            while ready:
+                name = ready.pop(0)
+                order.append(name)
+                for other in self.stages.values():
+                    if name in other.depends_on:
+                        in_degree[other.name] -= 1
+                        if in_degree[other.name] == 0:
+                            ready.append(other.name)
+
+            if len(order) != len(self.stages):
+                raise ValueError(f"Dependency cycle between stages {sorted(set(self.stages) - set(order))}")
+
+            return order
+
+        except Exception as e:
+            raise BankChurnException(f"Error building the pipeline DAG: {str(e)}", sys) from e
+
+
+    def get_critical_path(self, order: List[str], durations: Dict[str, float]) -> tuple:
+        """
+        Longest chain of dependent stages, weighted by the stage durations.
+
+        :return: Tuple of (stage names along the path, summed duration in seconds).
+        """
+        finish, previous = {}, {}
+        for name in order:
+            dependencies = self.stages[name].depends_on
+            previous[name] = max(dependencies, key=lambda dependency: finish[dependency]) if dependencies else None
+            finish[name] = durations.get(name, 0.0) + (finish[previous[name]] if previous[name] else 0.0)
+
+        if not finish:
+            return [], 0.0
+
+        path, name = [], max(finish, key=finish.get)
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+
+        return path[::-1], finish[path[0]]
+
+
+    def run(self) -> dict:
+        """
+        Execute the stages, each as soon as its inputs are available.
+
+        :return: Run report with wall_time, total_stage_time, parallel_speedup, critical_path,
+                 critical_path_time and per-stage timings. The produced artifacts are under "artifacts".
+        """
+        try:
+            order = self.build()
+            executors: Dict[str, Executor] = {}
+            running: Dict[Future, str] = {}
+            waiting = {name: set(self.stages[name].depends_on) for name in order}
+            artifacts, timings, errors = {}, {}, {}
+
+            started_at = time.time()
+            logging.info(f"Running pipeline DAG: {' -> '.join(order)} with up to {self.max_workers} concurrent stages")
+
+            try:
+                while waiting or running:
+                    # Submit every stage whose inputs are all available
+                    for name in [name for name in order if name in waiting and not waiting[name]]:
+                        if errors:
+                            break
+                        stage = self.stages[name]
+                        if stage.executor not in executors:
+                            pool = ProcessPoolExecutor if stage.executor == "process" else ThreadPoolExecutor
+                            executors[stage.executor] = pool(max_workers=self.max_workers)
+
+                        kwargs = {parameter: artifacts[artifact_type] for parameter, artifact_type in stage.inputs.items()}
+                        running[executors[stage.executor].submit(_timed_call, stage.func, kwargs)] = name
+                        del waiting[name]
+                        logging.info(f"Submitted stage '{name}' to the {stage.executor} pool")
+
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        try:
+                            artifact, stage_started_at, stage_finished_at = future.result()
+                        except Exception as e:
+                            logging.error(f"Stage '{name}' failed: {str(e)}")
+                            errors[name] = e
+                            continue
+
+                        if self.stages[name].produces is not None:
+                            artifacts[self.stages[name].produces] = artifact
+                        timings[name] = {"executor": self.stages[name].executor,
+                                         "depends_on": self.stages[name].depends_on,
+                                         "start": round(stage_started_at - started_at, 4),
+                                         "end": round(stage_finished_at - started_at, 4),
+                                         "duration": round(stage_finished_at - stage_started_at, 4)}
+                        logging.info(f"Stage '{name}' finished in {timings[name]['duration']:.3f}s")
+
+                        for dependencies in waiting.values():
+                            dependencies.discard(name)
+
+            finally:
+                for executor in executors.values():
+                    executor.shutdown(wait=True, cancel_futures=True)
+
+            if errors:
+                name, error = next(iter(errors.items()))
+                skipped = sorted(waiting)
+                raise RuntimeError(f"Stage '{name}' failed: {str(error)}"
+                                   + (f" (not run: {', '.join(skipped)})" if skipped else "")) from error
+
+            wall_time = time.time() - started_at
+            durations = {name: timing["duration"] for name, timing in timings.items()}
+            critical_path, critical_path_time = self.get_critical_path(order, durations)
+            total_stage_time = sum(durations.values())
+
+            report = {"wall_time": round(wall_time, 4),
+                      "total_stage_time": round(total_stage_time, 4),
+                      "parallel_speedup": round(total_stage_time / wall_time, 2) if wall_time else 0.0,
+                      "critical_path": critical_path,
+                      "critical_path_time": round(critical_path_time, 4),
+                      "stages": {name: timings[name] for name in order},
+                      "artifacts": {self.stages[name].name: artifacts.get(self.stages[name].produces) for name in order}}
+
+            logging.info(f"Pipeline DAG finished in {wall_time:.3f}s (stages {total_stage_time:.3f}s, "
+                         f"speedup {report['parallel_speedup']}x)")
+            logging.info(f"Critical path ({critical_path_time:.3f}s): {' -> '.join(critical_path)}")
+
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in pipeline DAG run: {str(e)}")
+            raise BankChurnException(f"Error in pipeline DAG run: {str(e)}", sys) from e
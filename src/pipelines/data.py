@@ -5,10 +5,31 @@ import sys
 from src.core.logger import logging
 from src.core.exception import BankChurnException
 
-from src.core.entities.config_entity import DataIngestionConfig
-from src.core.entities.artifact_entity import DataIngestionArtifact
+from src.core.entities.config_entity import (DataIngestionConfig,
+                                             DataValidationConfig,
+                                             DataPreprocessingConfig,
+                                             DataSplitConfig)
+from src.core.entities.artifact_entity import (DataIngestionArtifact,
+                                               DataValidationArtifact,
+                                               DataPreprocessingArtifact,
+                                               DataSplitArtifact)
 
-from src.data.ingestion import DataIngestion
+from src.core.utils.helpers import get_file_hash
+from src.core.constants.common import SCHEMA_FILE_PATH
+from src.pipelines.stage_cache import (StageCache, get_code_version,
+                                       get_dataclass_fingerprint)
+
+# Stage modules (pandas, numpy, SQLAlchemy, ...) are imported inside the start_* methods,
+# so a run only loads the dependencies of the stages it actually executes
+
+# Source files of every stage, part of the stage fingerprint (code version)
+INGESTION_MODULES = ["src.data.ingestion", "src.configs.mysql_connection",
+                     "src.core.utils.helpers", "src.core.utils.formats"]
+VALIDATION_MODULES = ["src.data.validation", "src.mlops.drift",
+                      "src.core.utils.helpers", "src.core.utils.formats"]
+PREPROCESSING_MODULES = ["src.data.preprocessing", "src.core.utils.feature_store",
+                         "src.core.utils.helpers", "src.core.utils.formats"]
+SPLIT_MODULES = ["src.data.split", "src.core.utils.feature_store", "src.core.utils.helpers"]
 
 
 
@@ -17,18 +38,26 @@ class DataPipeline:
     """
     class name: DataPipeline
     Description: this class is used to create a pipeline for data scripts (src/data/<scripts>).
+                 Every stage is skipped when the fingerprint of its inputs matches the one recorded
+                 next to its artifact, unless `force` is True.
     """
 
-    def __init__(self):
+    def __init__(self, force: bool = False):
 
         logging.info("* "*50)
         logging.info("- - - - - Started DataPipeline - - - - -")
         logging.info("* "*50)
-        
+
+        self.force = force
         self.data_ingestion_config = DataIngestionConfig()
-        # self.data_validation_config = DataValidationConfig()
-        # self.data_preprocessing_config = DataPreprocessingConfig()
-        # self.data_split_config = DataSplitConfig()
+        self.data_validation_config = DataValidationConfig()
+        self.data_preprocessing_config = DataPreprocessingConfig()
+        self.data_split_config = DataSplitConfig()
+
+        self.data_ingestion_cache = StageCache("data_ingestion", self.data_ingestion_config.fingerprint_file_path, force=force)
+        self.data_validation_cache = StageCache("data_validation", self.data_validation_config.fingerprint_file_path, force=force)
+        self.data_preprocessing_cache = StageCache("data_preprocessing", self.data_preprocessing_config.fingerprint_file_path, force=force)
+        self.data_split_cache = StageCache("data_split", self.data_split_config.fingerprint_file_path, force=force)
 
 
     def start_data_ingestion(self) -> DataIngestionArtifact:
@@ -39,9 +68,17 @@ class DataPipeline:
             logging.info("_"*100)
             logging.info("")
             logging.info("! ! ! Entered start_data_ingestion method of DataPipeline Class:")
-            
+
+            from src.data.ingestion import DataIngestion
+
             data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config)
-            data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+            inputs = {"source": data_ingestion.get_source_snapshot(),
+                      "schema": get_file_hash(SCHEMA_FILE_PATH),
+                      "code": get_code_version(INGESTION_MODULES),
+                      "config": get_dataclass_fingerprint(self.data_ingestion_config)}
+
+            data_ingestion_artifact = self.data_ingestion_cache.run(inputs, DataIngestionArtifact,
+                                                                    data_ingestion.initiate_data_ingestion)
             logging.info("- "*50)
             logging.info("- - - Data Ingested Successfully! - - -")
 
@@ -50,8 +87,123 @@ class DataPipeline:
             logging.info("_"*100)
 
             return data_ingestion_artifact
-        
+
         except Exception as e:
             logging.error(f"Error in start_data_ingestion: {str(e)}")
             raise BankChurnException(f"Error in start_data_ingestion: {str(e)}",sys) from e
-     
\ No newline at end of file
+
+
+    def start_data_validation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
+        """
+        This method of DataPipeline class is responsible for starting data validation component
+        """
+        try:
+            logging.info("_"*100)
+            logging.info("")
+            logging.info("! ! ! Entered start_data_validation method of DataPipeline Class:")
+
+            from src.data.validation import DataValidation
+
+            inputs = {"upstream": {"data_ingestion": self.data_ingestion_cache.read_fingerprint()},
+                      "artifact": get_dataclass_fingerprint(data_ingestion_artifact),
+                      "schema": get_file_hash(SCHEMA_FILE_PATH),
+                      "code": get_code_version(VALIDATION_MODULES),
+                      "config": get_dataclass_fingerprint(self.data_validation_config)}
+
+            def initiate_data_validation() -> DataValidationArtifact:
+                data_validation = DataValidation(data_ingestion_artifact=data_ingestion_artifact,
+                                                 data_validation_config=self.data_validation_config)
+                return data_validation.initiate_data_validation()
+
+            data_validation_artifact = self.data_validation_cache.run(inputs, DataValidationArtifact,
+                                                                      initiate_data_validation)
+            logging.info("- "*50)
+            logging.info("- - - Data Validated Successfully! - - -")
+
+            logging.info("")
+            logging.info("! ! ! Exited the start_data_validation method of DataPipeline class:")
+            logging.info("_"*100)
+
+            return data_validation_artifact
+
+        except Exception as e:
+            logging.error(f"Error in start_data_validation: {str(e)}")
+            raise BankChurnException(f"Error in start_data_validation: {str(e)}",sys) from e
+
+
+    def start_data_preprocessing(self, data_ingestion_artifact: DataIngestionArtifact) -> DataPreprocessingArtifact:
+        """
+        This method of DataPipeline class is responsible for starting data preprocessing component.
+        It only needs the ingested data, so the scheduler runs it concurrently with data validation.
+        """
+        try:
+            logging.info("_"*100)
+            logging.info("")
+            logging.info("! ! ! Entered start_data_preprocessing method of DataPipeline Class:")
+
+            from src.data.preprocessing import DataPreprocessing
+
+            inputs = {"upstream": {"data_ingestion": self.data_ingestion_cache.read_fingerprint()},
+                      "artifact": get_dataclass_fingerprint(data_ingestion_artifact),
+                      "schema": get_file_hash(SCHEMA_FILE_PATH),
+                      "code": get_code_version(PREPROCESSING_MODULES),
+                      "config": get_dataclass_fingerprint(self.data_preprocessing_config)}
+
+            def initiate_data_preprocessing() -> DataPreprocessingArtifact:
+                data_preprocessing = DataPreprocessing(data_ingestion_artifact=data_ingestion_artifact,
+                                                       data_preprocessing_config=self.data_preprocessing_config)
+                return data_preprocessing.initiate_data_preprocessing()
+
+            data_preprocessing_artifact = self.data_preprocessing_cache.run(inputs, DataPreprocessingArtifact,
+                                                                            initiate_data_preprocessing)
+            logging.info("- "*50)
+            logging.info("- - - Data Preprocessed Successfully! - - -")
+
+            logging.info("")
+            logging.info("! ! ! Exited the start_data_preprocessing method of DataPipeline class:")
+            logging.info("_"*100)
+
+            return data_preprocessing_artifact
+
+        except Exception as e:
+            logging.error(f"Error in start_data_preprocessing: {str(e)}")
+            raise BankChurnException(f"Error in start_data_preprocessing: {str(e)}",sys) from e
+
+
+    def start_data_split(self, data_preprocessing_artifact: DataPreprocessingArtifact) -> DataSplitArtifact:
+        """
+        This method of DataPipeline class is responsible for starting data split component.
+        The split id in the artifact changes only with the dataset fingerprint or the split parameters.
+        """
+        try:
+            logging.info("_"*100)
+            logging.info("")
+            logging.info("! ! ! Entered start_data_split method of DataPipeline Class:")
+
+            from src.data.split import DataSplit
+            from src.core.utils.feature_store import FeatureStore
+
+            inputs = {"upstream": {"data_preprocessing": self.data_preprocessing_cache.read_fingerprint()},
+                      "dataset": FeatureStore.from_artifact(data_preprocessing_artifact).fingerprint,
+                      "artifact": get_dataclass_fingerprint(data_preprocessing_artifact),
+                      "code": get_code_version(SPLIT_MODULES),
+                      "config": get_dataclass_fingerprint(self.data_split_config)}
+
+            def initiate_data_split() -> DataSplitArtifact:
+                data_split = DataSplit(data_preprocessing_artifact=data_preprocessing_artifact,
+                                       data_split_config=self.data_split_config)
+                return data_split.initiate_data_split()
+
+            data_split_artifact = self.data_split_cache.run(inputs, DataSplitArtifact, initiate_data_split)
+            logging.info("- "*50)
+            logging.info("- - - Data Split Completed! - - -")
+
+            logging.info("")
+            logging.info("! ! ! Exited the start_data_split method of DataPipeline class:")
+            logging.info("_"*100)
+
+            return data_split_artifact
+
+        except Exception as e:
+            logging.error(f"Error in start_data_split: {str(e)}")
+            raise BankChurnException(f"Error in start_data_split: {str(e)}",sys) from e
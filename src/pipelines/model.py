@@ -0,0 +1,181 @@
+# pipeline for src/model/ folder scripts
+
+import sys
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+
+from src.core.entities.config_entity import ModelTrainerConfig, ModelEvaluationConfig, BulkScoringConfig
+from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
+                                               DataSplitArtifact,
+                                               ModelTrainerArtifact,
+                                               ModelEvaluationArtifact,
+                                               BulkScoringArtifact)
+
+from src.core.utils.helpers import get_file_hash
+from src.core.constants.common import MODEL_FILE_PATH
+from src.pipelines.stage_cache import (StageCache, get_code_version,
+                                       get_dataclass_fingerprint)
+
+# Stage modules (scikit-learn, ...) are imported inside the start_* methods, like in the data pipeline
+
+# Source files of every stage, part of the stage fingerprint (code version)
+TRAINER_MODULES = ["src.model.trainer", "src.data.split", "src.core.utils.feature_store",
+                   "src.core.utils.helpers"]
+EVALUATION_MODULES = ["src.model.evaluation", "src.model.trainer", "src.data.split",
+                      "src.core.utils.feature_store"]
+SCORING_MODULES = ["src.model.scoring", "src.model.predictor", "src.data.preprocessing",
+                   "src.configs.mysql_connection"]
+
+
+
+# Constructing a ModelPipeline
+class ModelPipeline:
+    """
+    class name: ModelPipeline
+    Description: this class is used to create a pipeline for model scripts (src/model/<scripts>).
+                 Every stage is skipped when the fingerprint of its inputs matches the one recorded
+                 next to its artifact, unless `force` is True.
+    """
+
+    def __init__(self, force: bool = False):
+
+        logging.info("* "*50)
+        logging.info("- - - - - Started ModelPipeline - - - - -")
+        logging.info("* "*50)
+
+        self.force = force
+        self.model_trainer_config = ModelTrainerConfig()
+        self.model_evaluation_config = ModelEvaluationConfig()
+        self.bulk_scoring_config = BulkScoringConfig()
+
+        self.model_trainer_cache = StageCache("model_trainer", self.model_trainer_config.fingerprint_file_path, force=force)
+        self.model_evaluation_cache = StageCache("model_evaluation", self.model_evaluation_config.fingerprint_file_path, force=force)
+        self.bulk_scoring_cache = StageCache("bulk_scoring", self.bulk_scoring_config.fingerprint_file_path, force=force)
+
+
+    def start_model_trainer(self,
+                            data_preprocessing_artifact: DataPreprocessingArtifact,
+                            data_split_artifact: DataSplitArtifact) -> ModelTrainerArtifact:
+        """
+        This method of ModelPipeline class is responsible for starting model trainer component.
+        The search only reruns when the split (dataset and split parameters), settings/model.yaml,
+        the trainer code or its configuration changed.
+        """
+        try:
+            logging.info("_"*100)
+            logging.info("")
+            logging.info("! ! ! Entered start_model_trainer method of ModelPipeline Class:")
+
+            from src.model.trainer import ModelTrainer
+
+            inputs = {"split": data_split_artifact.split_id,
+                      "artifact": get_dataclass_fingerprint(data_preprocessing_artifact),
+                      "models": get_file_hash(MODEL_FILE_PATH),
+                      "code": get_code_version(TRAINER_MODULES),
+                      "config": get_dataclass_fingerprint(self.model_trainer_config)}
+
+            def initiate_model_trainer() -> ModelTrainerArtifact:
+                model_trainer = ModelTrainer(data_preprocessing_artifact=data_preprocessing_artifact,
+                                             data_split_artifact=data_split_artifact,
+                                             model_trainer_config=self.model_trainer_config)
+                return model_trainer.initiate_model_trainer()
+
+            model_trainer_artifact = self.model_trainer_cache.run(inputs, ModelTrainerArtifact, initiate_model_trainer)
+            logging.info("- "*50)
+            logging.info("- - - Model Trained Successfully! - - -")
+
+            logging.info("")
+            logging.info("! ! ! Exited the start_model_trainer method of ModelPipeline class:")
+            logging.info("_"*100)
+
+            return model_trainer_artifact
+
+        except Exception as e:
+            logging.error(f"Error in start_model_trainer: {str(e)}")
+            raise BankChurnException(f"Error in start_model_trainer: {str(e)}",sys) from e
+
+
+    def start_model_evaluation(self,
+                               data_preprocessing_artifact: DataPreprocessingArtifact,
+                               data_split_artifact: DataSplitArtifact,
+                               model_trainer_artifact: ModelTrainerArtifact) -> ModelEvaluationArtifact:
+        """
+        This method of ModelPipeline class is responsible for starting model evaluation component.
+        The evaluation only reruns when the model, the split, the evaluation code or its configuration changed.
+        """
+        try:
+            logging.info("_"*100)
+            logging.info("")
+            logging.info("! ! ! Entered start_model_evaluation method of ModelPipeline Class:")
+
+            from src.model.evaluation import ModelEvaluation
+
+            inputs = {"split": data_split_artifact.split_id,
+                      "artifact": get_dataclass_fingerprint(data_preprocessing_artifact),
+                      "model": get_file_hash(model_trainer_artifact.model_object_file_path),
+                      "code": get_code_version(EVALUATION_MODULES),
+                      "config": get_dataclass_fingerprint(self.model_evaluation_config)}
+
+            def initiate_model_evaluation() -> ModelEvaluationArtifact:
+                model_evaluation = ModelEvaluation(data_preprocessing_artifact=data_preprocessing_artifact,
+                                                   data_split_artifact=data_split_artifact,
+                                                   model_trainer_artifact=model_trainer_artifact,
+                                                   model_evaluation_config=self.model_evaluation_config)
+                return model_evaluation.initiate_model_evaluation()
+
+            model_evaluation_artifact = self.model_evaluation_cache.run(inputs, ModelEvaluationArtifact,
+                                                                        initiate_model_evaluation)
+            logging.info("- "*50)
+            logging.info("- - - Model Evaluated Successfully! - - -")
+
+            logging.info("")
+            logging.info("! ! ! Exited the start_model_evaluation method of ModelPipeline class:")
+            logging.info("_"*100)
+
+            return model_evaluation_artifact
+
+        except Exception as e:
+            logging.error(f"Error in start_model_evaluation: {str(e)}")
+            raise BankChurnException(f"Error in start_model_evaluation: {str(e)}",sys) from e
+
+
+    def start_bulk_scoring(self,
+                           data_preprocessing_artifact: DataPreprocessingArtifact,
+                           model_trainer_artifact: ModelTrainerArtifact) -> BulkScoringArtifact:
+        """
+        This method of ModelPipeline class is responsible for starting bulk scoring component.
+        The customer base is only rescored when the model, the preprocessor, the source table,
+        the scoring code or its configuration changed.
+        """
+        try:
+            logging.info("_"*100)
+            logging.info("")
+            logging.info("! ! ! Entered start_bulk_scoring method of ModelPipeline Class:")
+
+            from src.model.scoring import BulkScoring
+
+            bulk_scoring = BulkScoring(data_preprocessing_artifact=data_preprocessing_artifact,
+                                       model_trainer_artifact=model_trainer_artifact,
+                                       bulk_scoring_config=self.bulk_scoring_config)
+
+            inputs = {"source": bulk_scoring.get_source_snapshot(),
+                      "model": get_file_hash(model_trainer_artifact.model_object_file_path),
+                      "preprocessor": get_file_hash(data_preprocessing_artifact.preprocessor_object_file_path),
+                      "code": get_code_version(SCORING_MODULES),
+                      "config": get_dataclass_fingerprint(self.bulk_scoring_config)}
+
+            bulk_scoring_artifact = self.bulk_scoring_cache.run(inputs, BulkScoringArtifact,
+                                                                bulk_scoring.initiate_bulk_scoring)
+            logging.info("- "*50)
+            logging.info("- - - Bulk Scoring Completed! - - -")
+
+            logging.info("")
+            logging.info("! ! ! Exited the start_bulk_scoring method of ModelPipeline class:")
+            logging.info("_"*100)
+
+            return bulk_scoring_artifact
+
+        except Exception as e:
+            logging.error(f"Error in start_bulk_scoring: {str(e)}")
+            raise BankChurnException(f"Error in start_bulk_scoring: {str(e)}",sys) from e
@@ -3,39 +3,66 @@ import sys
 from src.core.logger import logging
 from src.core.exception import BankChurnException
 
+from src.core.utils.helpers import write_json
+from src.core.entities.config_entity import PipelineConfig
+
+from src.pipelines.dag import PipelineDAG
 from src.pipelines.data import DataPipeline
+from src.pipelines.model import ModelPipeline
 
 
 
-def run() -> None:
+def build_pipeline_dag(data_pipeline: DataPipeline, model_pipeline: ModelPipeline,
+                       pipeline_config: PipelineConfig) -> PipelineDAG:
+    """
+    This method of run.py script registers the pipeline stages. The order of the stages follows from the
+    artifact types they take and return, stages that do not depend on each other run concurrently.
     """
-    This method of run.py script is responsible for running the entire pipeline
+    dag = PipelineDAG(max_workers=pipeline_config.max_workers)
+
+    # data pipeline
+    dag.add_stage("data_ingestion", data_pipeline.start_data_ingestion)
+    dag.add_stage("data_validation", data_pipeline.start_data_validation)
+    dag.add_stage("data_preprocessing", data_pipeline.start_data_preprocessing)
+    dag.add_stage("data_split", data_pipeline.start_data_split)
+
+    # model pipeline (the trainer runs its search on its own process pool)
+    dag.add_stage("model_trainer", model_pipeline.start_model_trainer)
+    dag.add_stage("model_evaluation", model_pipeline.start_model_evaluation)
+    # dag.add_stage("model_validation", model_pipeline.start_model_validation)
+    dag.add_stage("bulk_scoring", model_pipeline.start_bulk_scoring)
+
+    return dag
+
+
+def run(force: bool = False) -> dict:
+    """
+    This method of run.py script is responsible for running the entire pipeline.
+    Stages whose inputs did not change since the last run are skipped, unless `force` is True.
+    The per-stage timings and the critical path are written to the pipeline run report.
     """
     try:
-        data_pipeline = DataPipeline()
-        # model_pipeline = ModelPipeline()
+        pipeline_config = PipelineConfig()
+        data_pipeline = DataPipeline(force=force)
+        model_pipeline = ModelPipeline(force=force)
         logging.info("_"*100)
         logging.info("")
         logging.info("$ Entered run method of run.py script:")
-        
-        # start the data pipeline
-        data_ingestion_artifact = data_pipeline.start_data_ingestion()
-        # data_validation_artifact = data_pipeline.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
-        # data_preprocessing_artifact = data_pipeline.start_data_preprocessing(data_ingestion_artifact=data_ingestion_artifact, 
-        #                                                                      data_validation_artifact=data_validation_artifact)
-        # data_split_artifact = data_pipeline.start_data_split(data_preprocessing_artifact=data_preprocessing_artifact)
-        
-        # # start the model pipeline
-        # model_trainer_artifact = model_pipeline.start_model_trainer(data_preprocessing_artifact=data_preprocessing_artifact, 
-        #                                                             data_split_artifact=data_split_artifact)
-        # model_evaluation_artifact = model_pipeline.start_model_evaluation(data_split_artifact=data_split_artifact,
-        #                                                                   model_trainer_artifact=model_trainer_artifact)
-        # model_validation_artifact = model_pipeline.start_model_validation(model_evaluation_artifact=model_evaluation_artifact)
-        
+
+        dag = build_pipeline_dag(data_pipeline, model_pipeline, pipeline_config)
+        report = dag.run()
+
+        write_json(file_path=pipeline_config.run_report_file_path,
+                   data={key: value for key, value in report.items() if key != "artifacts"},
+                   replace=True)
+        logging.info(f"Pipeline run report saved at: {pipeline_config.run_report_file_path}")
+
         logging.info("")
         logging.info("$ Exited run method of run.py script:")
         logging.info("_"*100)
-    
+
+        return report
+
     except Exception as e:
         logging.error(f"Error in run method: {str(e)}")
-        raise BankChurnException(f"Error in run() method: {str(e)}",sys) from e
\ No newline at end of file
+        raise BankChurnException(f"Error in run() method: {str(e)}",sys) from e
@@ -0,0 +1,166 @@
+# Content-addressed stage caching for the pipelines (skip a stage when its inputs did not change)
+
+import os
+import sys
+import json
+import hashlib
+import dataclasses
+import importlib.util
+
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Type
+
+from src.core.logger import logging
+from src.core.exception import BankChurnException
+from src.core.utils.cache import file_fingerprint
+from src.core.utils.helpers import read_json, write_json, get_file_hash
+
+
+
+def get_code_version(module_names: Iterable[str]) -> str:
+    """
+    Hash the source files of the given modules, so editing the code of a stage invalidates its cache
+    (a commit touching unrelated files does not). The modules are located, not imported.
+
+    Parameters:
+    module_names (iterable): Dotted module names, e.g. "src.data.ingestion".
+
+    Returns:
+    str: The hex digest over the module sources.
+    """
+    sha256 = hashlib.sha256()
+    for module_name in sorted(module_names):
+        sha256.update(module_name.encode())
+        sha256.update(get_file_hash(importlib.util.find_spec(module_name).origin).encode())
+
+    return sha256.hexdigest()
+
+
+def get_dataclass_fingerprint(dataclass_obj: Any) -> dict:
+    """
+    JSON serializable view of a config or artifact dataclass, used as a stage input.
+    """
+    return json.loads(json.dumps(dataclasses.asdict(dataclass_obj), default=str))
+
+
+
+class StageCache:
+    """
+    Class Name :   StageCache
+    Description :   Records a fingerprint of a stage's inputs (source snapshot, settings files, code version,
+                    config, upstream fingerprints) next to the stage's artifact. The stage is skipped and its
+                    recorded artifact returned when the fingerprint matches and the artifact's output files
+                    are unchanged since they were written. `force=True` always reruns the stage.
+
+    Output      :   The recorded or freshly created artifact
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, stage_name: str, fingerprint_file_path: str, force: bool = False):
+        self.stage_name = stage_name
+        self.fingerprint_file_path = fingerprint_file_path
+        self.force = force
+
+
+    @staticmethod
+    def get_fingerprint(inputs: dict) -> str:
+        """
+        Hash the stage inputs (a JSON serializable dict) independently of key order.
+        """
+        payload = json.dumps(inputs, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+    @staticmethod
+    def _get_output_paths(artifact: Any) -> list:
+        # Every `*_path` field of the artifact dataclass is an output of the stage
+        return [value for field, value in dataclasses.asdict(artifact).items()
+                if field.endswith("_path") and isinstance(value, str)]
+
+
+    @staticmethod
+    def _get_outputs_state(output_paths: list) -> list:
+        # Path, modification time and size of every output file (part files for directories)
+        return json.loads(json.dumps([file_fingerprint(path) if os.path.exists(path) else None
+                                      for path in output_paths]))
+
+
+    def read_fingerprint(self) -> Optional[str]:
+        """
+        Fingerprint of the last completed run of the stage, or None. Downstream stages use it as an input.
+        """
+        if not os.path.exists(self.fingerprint_file_path):
+            return None
+        return read_json(file_path=self.fingerprint_file_path).get("fingerprint")
+
+
+    def load(self, fingerprint: str, artifact_class: Type) -> Optional[Any]:
+        """
+        Return the recorded artifact when the stage can be skipped, otherwise None.
+
+        :param fingerprint: Fingerprint of the current stage inputs.
+        :param artifact_class: Artifact dataclass of the stage.
+        :return: Artifact instance or None.
+        """
+        try:
+            if self.force or not os.path.exists(self.fingerprint_file_path):
+                return None
+
+            record = read_json(file_path=self.fingerprint_file_path)
+            if record.get("fingerprint") != fingerprint:
+                logging.info(f"{self.stage_name}: inputs changed since the last run")
+                return None
+
+            artifact = artifact_class(**record["artifact"])
+            if self._get_outputs_state(self._get_output_paths(artifact)) != record.get("outputs"):
+                logging.info(f"{self.stage_name}: artifact files are missing or were modified")
+                return None
+
+            return artifact
+
+        except Exception as e:
+            # A corrupt record only costs a rerun
+            logging.warning(f"{self.stage_name}: ignoring unreadable fingerprint record: {str(e)}")
+            return None
+
+
+    def save(self, fingerprint: str, inputs: dict, artifact: Any) -> None:
+        """
+        Record the fingerprint, inputs, artifact and output file state after a successful run.
+        """
+        try:
+            write_json(file_path=self.fingerprint_file_path,
+                       data={"stage": self.stage_name,
+                             "fingerprint": fingerprint,
+                             "created_at": datetime.now().isoformat(timespec="seconds"),
+                             "inputs": inputs,
+                             "artifact": dataclasses.asdict(artifact),
+                             "outputs": self._get_outputs_state(self._get_output_paths(artifact))},
+                       replace=True)
+
+        except Exception as e:
+            raise BankChurnException(f"Error saving fingerprint of {self.stage_name}: {str(e)}", sys) from e
+
+
+    def run(self, inputs: dict, artifact_class: Type, initiate: Callable[[], Any]) -> Any:
+        """
+        Run `initiate` unless a previous run with the same inputs left an unchanged artifact.
+
+        :param inputs: JSON serializable stage inputs.
+        :param artifact_class: Artifact dataclass returned by `initiate`.
+        :param initiate: Callable running the stage.
+        :return: The stage artifact.
+        """
+        fingerprint = self.get_fingerprint(inputs)
+
+        artifact = self.load(fingerprint, artifact_class)
+        if artifact is not None:
+            logging.info(f"{self.stage_name}: inputs unchanged (fingerprint {fingerprint[:12]}), skipping the stage")
+            return artifact
+
+        if self.force:
+            logging.info(f"{self.stage_name}: forced rerun")
+
+        artifact = initiate()
+        self.save(fingerprint, inputs, artifact)
+        return artifact
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+
+import src.configs.mysql_connection as mysql_connection
+from src.configs.mysql_connection import HotelBookingData, MySQLConnect
+
+
+@pytest.fixture
+def hotel_booking_data(tmp_path, monkeypatch):
+    # SQLite stand-in for MySQL: the projects_db schema is an attached database
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE '{tmp_path / 'projects_db.db'}' AS projects_db")
+
+    # Keys in shuffled insertion order, with a gap
+    row_numbers = [key for key in range(1, 1002) if not 300 <= key < 400]
+    rows = pd.DataFrame({"RowNumber": row_numbers[::-1], "Surname": "na"})
+    rows["Balance"] = rows["RowNumber"] * 1.5
+    with engine.begin() as connection:
+        rows.to_sql("bank_churn", connection, schema="projects_db", index=False)
+
+    monkeypatch.setattr(mysql_connection, "MYSQL_ENGINE_URL", "sqlite://")
+    monkeypatch.setattr(MySQLConnect, "engine", engine)
+    monkeypatch.setattr(MySQLConnect, "pool_stats", None)
+    yield HotelBookingData()
+    engine.dispose()
+
+
+def test_partitions_are_sized_from_the_chunk_size(hotel_booking_data):
+    partition_ranges = hotel_booking_data.get_partition_ranges("bank_churn", "RowNumber", n_partitions=2,
+                                                               chunk_size=100)
+
+    assert len(partition_ranges) == 10
+    assert partition_ranges[0][0] == 1 and partition_ranges[-1][1] == 1001
+    assert [include_upper for _, _, include_upper in partition_ranges] == [False] * 9 + [True]
+    assert all(upper == next_lower for (_, upper, _), (next_lower, _, _) in zip(partition_ranges, partition_ranges[1:]))
+
+
+def test_partitioned_export_returns_every_row_once_in_key_order(hotel_booking_data):
+    partitions = list(hotel_booking_data.export_data_in_partitions("bank_churn", "RowNumber", n_partitions=2,
+                                                                   max_workers=3, chunk_size=100,
+                                                                   watermark_column="RowNumber"))
+    dataframe = pd.concat(partitions, ignore_index=True)
+
+    assert len(partitions) == 10
+    assert max(len(partition) for partition in partitions) <= 100 + 1  # the last range includes its upper key
+    assert len(dataframe) == 901
+    assert dataframe["RowNumber"].is_monotonic_increasing and dataframe["RowNumber"].is_unique
+    assert dataframe["Surname"].isna().all()
+
+
+def test_incremental_partitioned_export_only_returns_new_rows(hotel_booking_data):
+    partitions = list(hotel_booking_data.export_data_in_partitions("bank_churn", "RowNumber", n_partitions=1,
+                                                                   max_workers=2, chunk_size=250,
+                                                                   watermark_column="RowNumber",
+                                                                   watermark_value=500))
+
+    assert len(partitions) == 3
+    assert pd.concat(partitions)["RowNumber"].tolist() == list(range(501, 1002))
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from src.core.utils.cache import memoize
+
+
+def test_cached_dataframe_is_returned_as_an_independent_copy():
+    calls = []
+
+    @memoize
+    def load(name):
+        calls.append(name)
+        return pd.DataFrame({"a": [1, 2, 3]})
+
+    copy_on_write = pd.get_option("mode.copy_on_write")
+    first = load("x")
+    first.loc[0, "a"] = 100
+    second = load("x")
+
+    assert calls == ["x"]
+    assert second["a"].tolist() == [1, 2, 3]
+    assert pd.get_option("mode.copy_on_write") == copy_on_write
@@ -0,0 +1,20 @@
+from src.core.entities.artifact_entity import DataIngestionArtifact, DataValidationArtifact
+from src.pipelines.dag import PipelineDAG
+
+
+def ingest(force: bool = False) -> DataIngestionArtifact:
+    ...
+
+
+def validate(data_ingestion_artifact: DataIngestionArtifact, threshold: float = 0.5) -> DataValidationArtifact:
+    ...
+
+
+def test_only_artifact_annotations_become_edges():
+    # The stages are only registered, not run
+    dag = PipelineDAG(max_workers=1).add_stage("validate", validate).add_stage("ingest", ingest)
+
+    assert dag.build() == ["ingest", "validate"]
+    assert dag.stages["ingest"].inputs == {}
+    assert dag.stages["validate"].inputs == {"data_ingestion_artifact": DataIngestionArtifact}
+    assert dag.stages["validate"].depends_on == ["ingest"]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from src.mlops.feature_cache import CustomerFeatureCache
+
+
+class FakePreprocessor:
+    feature_names_out = ["balance", "age"]
+    input_columns = ["Balance", "Age"]
+
+    def transform(self, dataframe):
+        return dataframe[["Balance", "Age"]].to_numpy(dtype=np.float32)
+
+
+def fake_fetch_rows(keys):
+    # Customer "3" is unknown, customer "1" has two rows (the last one wins)
+    known = [key for key in keys if key != "3"]
+    rows = pd.DataFrame({"CustomerId": [int(key) for key in known],
+                         "Balance": [10.0 * int(key) for key in known],
+                         "Age": [float(key) for key in known]})
+    if "1" in keys:
+        rows = pd.concat([pd.DataFrame({"CustomerId": [1], "Balance": [-1.0], "Age": [-1.0]}), rows])
+    return rows
+
+
+def test_batch_larger_than_the_capacity_is_filled_from_the_fetched_rows():
+    cache = CustomerFeatureCache(FakePreprocessor(), capacity=5, fetch_rows=fake_fetch_rows)
+    keys = [str(key) for key in range(8)] + ["1"]
+
+    features, found = cache.get_features(keys)
+
+    assert found.tolist() == [key != "3" for key in keys]
+    assert features[found].tolist() == [[10.0 * int(key), float(key)] for key in keys if key != "3"]
+    assert not features[3].any()
+    assert len(cache) == 5
+
+
+def test_cached_keys_are_not_fetched_again():
+    fetched = []
+
+    def fetch_rows(keys):
+        fetched.append(list(keys))
+        return fake_fetch_rows(keys)
+
+    cache = CustomerFeatureCache(FakePreprocessor(), capacity=5, fetch_rows=fetch_rows)
+    cache.get_features(["4", "5"])
+    features, found = cache.get_features(["4", "5", "6"])
+
+    assert fetched == [["4", "5"], ["6"]]
+    assert found.all()
+    assert features[:, 0].tolist() == [40.0, 50.0, 60.0]
+    assert cache.stats["hits"] == 2
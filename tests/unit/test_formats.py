@@ -0,0 +1,16 @@
+import pandas as pd
+import pytest
+
+from src.core.utils.helpers import read_data_tail, save_data
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet", "feather"])
+def test_read_data_tail_returns_the_last_appended_rows(tmp_path, extension):
+    file_path = str(tmp_path / f"data.{extension}")
+    for i in range(4):
+        save_data(pd.DataFrame({"a": range(10 * i, 10 * i + 10), "b": "x"}), file_path, append=i > 0)
+
+    for n_rows in (0, 5, 15, 100):
+        tail = read_data_tail(file_path, n_rows=n_rows, columns=["a"])
+        assert list(tail.columns) == ["a"]
+        assert tail["a"].tolist() == list(range(40))[max(0, 40 - n_rows):40]
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from src.core.utils.helpers import read_data, save_data
+from src.data.ingestion import DataIngestion
+
+
+def make_chunk(geography, has_cr_card, age):
+    return pd.DataFrame({"Geography": geography, "Gender": ["Male"] * len(geography),
+                         "HasCrCard": has_cr_card, "Age": age})
+
+
+def test_chunks_with_unexpected_values_stay_readable(tmp_path):
+    data_ingestion = DataIngestion()
+    file_path = str(tmp_path / "data.parquet")
+    chunks = [make_chunk(["France", "Spain"], [1, 0], [30, 40]),
+              make_chunk(["Italy", "Germany"], ["Yes", "maybe"], [50, 60.5]),
+              make_chunk(["Spain", None], [0, 2], [70, 80])]
+
+    for i, chunk in enumerate(chunks):
+        chunk = data_ingestion.coerce_schema_dtypes(chunk)
+        assert isinstance(chunk["Geography"].dtype, pd.CategoricalDtype)
+        save_data(chunk, file_path, append=i > 0)
+
+    dataframe = read_data(file_path)
+
+    assert len(dataframe) == 6
+    assert dataframe["Geography"].tolist()[:5] == ["France", "Spain", "Italy", "Germany", "Spain"]
+    # Raw values the schema dtype cannot hold are kept for validation
+    assert dataframe["HasCrCard"].tolist() == ["true", "false", "Yes", "maybe", "0", "2"]
+    assert dataframe["Age"].tolist() == [30, 40, 50, 60.5, 70, 80]
+
+
+def test_boolean_flags_outside_the_known_values_are_kept():
+    data_ingestion = DataIngestion()
+
+    coerced = data_ingestion.coerce_schema_dtypes(make_chunk(["France"] * 3, ["Yes", "No", None], [1, 2, 3]))
+    assert coerced["HasCrCard"].tolist() == [True, False, pd.NA]
+
+    for flags in (["Yes", "No", "maybe"], [0, 2, 1]):
+        coerced = data_ingestion.coerce_schema_dtypes(make_chunk(["France"] * 3, flags, [1, 2, 3]))
+        assert coerced["HasCrCard"].tolist() == flags
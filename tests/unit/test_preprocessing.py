@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import SchemaPreprocessor
+
+
+SCHEMA_CONFIG = {
+    "features": {"Gender": {"type": "category", "categories": ["Female", "Male"]},
+                 "Geography": {"type": "category", "categories": ["France", "Germany", "Spain"]},
+                 "Age": {"type": "integer"},
+                 "Exited": {"type": "boolean"}},
+    "transformation": {"label_encoding": ["Gender"], "onehot_encoding": ["Geography"], "scaling": ["Age"]},
+}
+
+
+def test_transform_writes_into_non_contiguous_output_arrays():
+    dataframe = pd.DataFrame({"Gender": ["Male", "Female", "Male", None, "Female"],
+                              "Geography": ["Spain", "France", "Italy", "Germany", "Spain"],
+                              "Age": [30, 41, 52, None, 25],
+                              "Exited": [0, 1, 0, 1, 0]})
+    preprocessor = SchemaPreprocessor(SCHEMA_CONFIG, target_column="Exited", block_rows=2).fit(dataframe)
+    expected = preprocessor.transform(dataframe)
+    shape = expected.shape
+
+    fortran_out = np.full(shape, np.nan, dtype=np.float32, order="F")
+    strided_out = np.full((shape[0], 2 * shape[1]), np.nan, dtype=np.float32)[:, ::2]
+
+    for out in (fortran_out, strided_out):
+        assert preprocessor.transform(dataframe, out=out) is out
+        np.testing.assert_array_equal(out, expected)
+
+    assert expected[:, 1:4].tolist() == [[0, 0, 1], [1, 0, 0], [0, 0, 0], [0, 1, 0], [0, 0, 1]]
@@ -0,0 +1,97 @@
+import json
+import asyncio
+
+import pytest
+
+from src.mlops.serving import MicroBatcher, ScoringServer, coerce_record
+
+
+class FakeScorer:
+    """Records the batches it scores; a record with "fail" raises."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, records):
+        self.batches.append(len(records))
+        if any(record.get("fail") for record in records):
+            raise ValueError("cannot score /srv/models/model.pkl")
+        return [record["x"] / 10 for record in records]
+
+
+class FakePreprocessor:
+    numerical_columns = ["Balance"]
+
+
+class FakePredictor:
+    preprocessor = FakePreprocessor()
+    input_columns = ["Geography", "Balance"]
+    model = None
+    is_compiled = True
+
+    def predict_records(self, records):
+        return [0.9 if record["Balance"] > 0 else 0.1 for record in records]
+
+
+def run_concurrently(batcher, records):
+    async def main():
+        return await asyncio.gather(*(batcher.submit(record) for record in records), return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_full_batch_is_scored_without_waiting_for_the_timer():
+    scorer = FakeScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_us=10_000_000)
+
+    results = run_concurrently(batcher, [{"x": i} for i in range(8)])
+
+    assert results == [i / 10 for i in range(8)]
+    assert scorer.batches == [4, 4]
+
+
+def test_timer_flushes_a_partial_batch():
+    scorer = FakeScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=100, max_wait_us=1_000)
+
+    results = run_concurrently(batcher, [{"x": i} for i in range(3)])
+
+    assert results == [0.0, 0.1, 0.2]
+    assert scorer.batches == [3]
+    assert batcher.stats["mean_batch_size"] == 3
+
+
+def test_failing_record_only_fails_its_own_request():
+    scorer = FakeScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=8, max_wait_us=1_000)
+    records = [{"x": i} for i in range(8)]
+    records[5]["fail"] = True
+
+    results = run_concurrently(batcher, records)
+
+    assert isinstance(results[5], ValueError)
+    assert [result for i, result in enumerate(results) if i != 5] == [i / 10 for i in range(8) if i != 5]
+    assert batcher.stats["batch_failures"] == 1
+
+
+def test_coerce_record_converts_numeric_strings_and_rejects_the_rest():
+    assert coerce_record({"Balance": "12.5", "Geography": "Spain"}, ["Balance"], ["Geography"]) == \
+        {"Balance": 12.5, "Geography": "Spain"}
+    assert coerce_record({"Balance": None}, ["Balance"], ["Geography"]) == {"Balance": None}
+
+    for record in ({"Balance": "lots"}, {"Balance": [1]}, {"Balance": float("inf")}, {"Geography": {"a": 1}}):
+        with pytest.raises(ValueError):
+            coerce_record(record, ["Balance"], ["Geography"])
+
+
+def test_bad_record_gets_400_and_the_others_are_scored():
+    server = ScoringServer(FakePredictor(), max_wait_us=1_000)
+    bodies = [json.dumps({"Geography": "France", "Balance": 10 * i}).encode() for i in range(7)]
+    bodies.append(json.dumps({"Geography": "France", "Balance": "lots"}).encode())
+
+    async def main():
+        return await asyncio.gather(*(server.handle_request("POST", "/predict", body) for body in bodies))
+    responses = asyncio.run(main())
+
+    assert [status for status, _ in responses] == [200] * 7 + [400]
+    assert "Balance" in responses[-1][1]["error"]
+    assert responses[1][1] == {"churn_probability": 0.9, "churn": 1}